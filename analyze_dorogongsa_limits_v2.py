@@ -1,6 +1,11 @@
 import os
 import sys
-import pandas as pd
+from bid_cache import list_workbooks
+from bid_pool import load_tenders, parse_jobs
+from bid_quarantine import quarantined, quarantine
+from bid_model import Tender, yega_percent, price_limit
+from bid_sketch import Moments
+import numpy as np
 import warnings
 from collections import defaultdict
 
@@ -10,13 +15,13 @@ sys.stdout.reconfigure(encoding='utf-8')
 
 BASE_DIR = r"E:\인프라수주팀\트레이닝\24년이후 입찰결과"
 
-def analyze_bids(base_dir):
+def analyze_bids(base_dir, jobs=1):
     results = []
     company_stats = defaultdict(lambda: {
         'total_bids': 0, 
         'wins': 0, # 만점 하한선 1위 횟수
         'avg_diff_from_limit': 0.0, # 하한선과의 평균 차이 (%)
-        'diffs': [],
+        'gap': Moments(), # 하한선 대비 차이 누적 (개수/평균)
         'aggresive_count': 0, # 공격적 저가 (하한선 미만 타격으로 감점) 횟수
         'conservative_count': 0 # 보수적 투찰 (하한선 대비 너무 높음) 횟수
     })
@@ -24,143 +29,74 @@ def analyze_bids(base_dir):
     scanned_count = 0
     dorogongsa_count = 0
     
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            file_lower = file.lower()
-            if not file.startswith('~') and (file_lower.endswith('.xlsb') or file_lower.endswith('.xlsx') or file_lower.endswith('.xls')):
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, base_dir)
-                scanned_count += 1
+    paths = list_workbooks(base_dir)
+    tenders = load_tenders(paths, jobs)
+    for file_path, record in tenders:
+        rel_path = os.path.relpath(file_path, base_dir)
+        scanned_count += 1
+        
+        if record is None: continue
+        # 이 스크립트에서 분석하다 실패했던 파일은 바뀔 때까지 건너뜀
+        if quarantined(file_path, ('analyze_dorogongsa_limits',)): continue
+        
+        try:
+            # 한국도로공사 검사
+            client_name = str(record['info']['발주처'] or "").replace(" ", "")
+            if "한국도로공사" not in client_name: continue
+            dorogongsa_count += 1
+            print(f"✅ 도로공사 건 분석 중 ({dorogongsa_count}): [ {rel_path} ]")
+            
+            columns = record['columns']
+            if -1 in [columns['company'], columns['yega_ratio'], columns['price_score'], columns['deduct_score']]: continue
+            
+            tender = Tender.from_record(record)
+            # 하한선: 가격점수 만점 + 단가감점 0 인 투찰 중 가장 낮은 예가대비 (bid_model 공통 계산)
+            limit_row, limit_yega = price_limit(tender)
+            
+            if limit_row is not None:
+                valid = ~np.isnan(tender.price_score) & ~np.isnan(tender.yega_ratio)
+                # 업체명 (입찰결과 DB 에 아직 없는 업체는 원본 표기를 정규화한 이름)
+                companies = [tender.company(row) for row in np.flatnonzero(valid)]
+                price = tender.price_score[valid]
+                yega = yega_percent(tender)[valid]
+                max_price_score = price.max()
+                winner = tender.company(limit_row)
+                
+                results.append({
+                    'file': rel_path,
+                    'limit_yega': limit_yega,
+                    'winner': winner
+                })
                 
-                try:
-                    if file_lower.endswith('.xlsb'):
-                        df = pd.read_excel(file_path, engine='pyxlsb', header=None)
-                    else:
-                        df = pd.read_excel(file_path, header=None)
-                    
-                    # 1. 한국도로공사 건 검사
-                    is_dorogongsa = False
-                    try:
-                        c5_val = str(df.iloc[4, 2]).replace(" ", "")
-                        if "한국도로공사" in c5_val:
-                            is_dorogongsa = True
-                        else:
-                            for i in range(min(15, len(df))):
-                                for j in range(min(5, len(df.columns))):
-                                    cell_val = str(df.iloc[i, j]).replace(" ", "")
-                                    if "한국도로공사" in cell_val:
-                                        is_dorogongsa = True
-                                        break
-                                if is_dorogongsa: break
-                    except IndexError:
-                        pass
-                            
-                    if not is_dorogongsa:
-                        continue
-                        
-                    dorogongsa_count += 1
-                    print(f"✅ 도로공사 건 분석 중 ({dorogongsa_count}): [ {rel_path} ]")
-                    
-                    # 2. 헤더 행 찾기
-                    header_row_idx = -1
-                    for idx, row in df.iterrows():
-                        if str(row[0]).replace(" ", "") == "순위" and str(row[1]).replace(" ", "") == "회사명":
-                            header_row_idx = idx
-                            break
-                            
-                    if header_row_idx == -1: continue
-                        
-                    headers = [str(x).replace("\n", "").replace(" ", "") for x in df.iloc[header_row_idx].values]
-                    
-                    def find_col(keywords):
-                        for kw in keywords:
-                            for c_idx, h in enumerate(headers):
-                                if kw in h: return c_idx
-                        return -1
-                        
-                    idx_company = find_col(['회사명'])
-                    idx_yega = find_col(['예가대비'])
-                    idx_price_score = find_col(['가격점수'])
-                    idx_deduct_score = find_col(['단가감점'])
-                    
-                    if -1 in [idx_company, idx_yega, idx_price_score, idx_deduct_score]: continue
-                        
-                    data_df = df.iloc[header_row_idx+1:]
-                    
-                    # 데이터 추출
-                    valid_bids = []
-                    for _, row in data_df.iterrows():
-                        try:
-                            price_score_raw = str(row[idx_price_score]).strip()
-                            deduct_score_raw = str(row[idx_deduct_score]).strip()
-                            yega_raw = str(row[idx_yega]).strip()
-                            company = str(row[idx_company]).strip()
-                            
-                            if pd.isna(row[idx_price_score]) or pd.isna(row[idx_yega]) or price_score_raw == 'nan':
-                                continue
-                                
-                            try: p_score = float(price_score_raw)
-                            except: continue
-                            
-                            try: d_score = float(deduct_score_raw) if deduct_score_raw not in ['nan', '-'] else 0.0
-                            except: d_score = 0.0
-                            
-                            yega_val = float(yega_raw.replace("%", ""))
-                            if yega_val < 2.0: yega_val *= 100
-                                
-                            valid_bids.append({
-                                'company': company,
-                                'price_score': p_score,
-                                'deduct_score': d_score,
-                                'yega_ratio': yega_val
-                            })
-                        except: pass
-                            
-                    if not valid_bids: continue
-                        
-                    max_price_score = max([b['price_score'] for b in valid_bids])
-                    perfect_bids = [b for b in valid_bids if b['price_score'] == max_price_score and b['deduct_score'] == 0.0]
-                    
-                    if perfect_bids:
-                        min_yega_bid = min(perfect_bids, key=lambda x: x['yega_ratio'])
-                        limit_yega = min_yega_bid['yega_ratio']
-                        winner_company = min_yega_bid['company']
-                        
-                        results.append({
-                            'file': rel_path,
-                            'limit_yega': limit_yega,
-                            'winner': winner_company
-                        })
-                        
-                        # [핵심] 경쟁사 성향 분석 (해당 공구 기준)
-                        for b in valid_bids:
-                            comp = b['company']
-                            company_stats[comp]['total_bids'] += 1
-                            
-                            # 해당 업체의 투찰율 - 하한선 차이 
-                            # (양수: 안전하게 씀, 0: 하한선 적중, 음수: 한도 초과 공격적/감점)
-                            diff = b['yega_ratio'] - limit_yega
-                            company_stats[comp]['diffs'].append(diff)
-                            
-                            if comp == winner_company:
-                                company_stats[comp]['wins'] += 1
-                                
-                            # 공격적 투찰 판별 (가격점수 만점 실패, 보통 하한선 미달로 인한 0.001점 등 감점)
-                            if b['price_score'] < max_price_score and b['yega_ratio'] < limit_yega:
-                                company_stats[comp]['aggresive_count'] += 1
-                            
-                            # 보수적 투찰 판별 (안전하게 만점은 받았지만 금액이 하한선 대비 0.5% 이상 높음)
-                            if b['price_score'] == max_price_score and diff > 0.5:
-                                company_stats[comp]['conservative_count'] += 1
+                # [핵심] 경쟁사 성향 분석 (해당 공구 기준)
+                # 해당 업체의 투찰율 - 하한선 차이 
+                # (양수: 안전하게 씀, 0: 하한선 적중, 음수: 한도 초과 공격적/감점)
+                diffs = yega - limit_yega
+                # 공격적 투찰 판별 (가격점수 만점 실패, 보통 하한선 미달로 인한 0.001점 등 감점)
+                aggressive = (price < max_price_score) & (yega < limit_yega)
+                # 보수적 투찰 판별 (안전하게 만점은 받았지만 금액이 하한선 대비 0.5% 이상 높음)
+                conservative = (price == max_price_score) & (diffs > 0.5)
+                
+                for i, company in enumerate(companies):
+                    stats = company_stats[company]
+                    stats['total_bids'] += 1
+                    stats['gap'].add(float(diffs[i]))
+                    if company == winner:
+                        stats['wins'] += 1
+                    if aggressive[i]:
+                        stats['aggresive_count'] += 1
+                    if conservative[i]:
+                        stats['conservative_count'] += 1
 
-                except Exception as e:
-                    print(f"  -> 에러: {e}")
-                    
+        except Exception as e:
+            print(f"  -> 에러: {e}")
+            quarantine(file_path, 'analyze_dorogongsa_limits', e)
+            
     # 성향 통계 계산 및 정렬
-    for comp in company_stats:
-        diffs = company_stats[comp]['diffs']
-        if diffs:
-            company_stats[comp]['avg_diff_from_limit'] = sum(diffs) / len(diffs)
+    # 하한선과의 평균 차이는 위에서 실제로 센 투찰(같은 Tender 배열의 diffs)만으로 계산
+    for stats in company_stats.values():
+        if stats['gap'].count:
+            stats['avg_diff_from_limit'] = stats['gap'].mean()
             
     # 전체 하한선 분석 요약
     if results:
@@ -204,4 +140,5 @@ def analyze_bids(base_dir):
             print(f" {i+1}. {comp} : 평균 갭 {sign}{avg_gap:.3f}% (총 {stat['total_bids']}회 참여)")
 
 if __name__ == "__main__":
-    analyze_bids(BASE_DIR)
+    jobs, _ = parse_jobs()
+    analyze_bids(BASE_DIR, jobs)
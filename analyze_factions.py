@@ -1,131 +1,142 @@
 import os
 import glob
 import pandas as pd
-import numpy as np
-
-FACTIONS = {
-    '경남기업': '우리(주황)', '극동건설': '우리(주황)', '남광토건': '우리(주황)',
-    '삼환기업': '우리(주황)', '쌍용건설': '우리(주황)', '에이치엘디앤아이한라': '우리(주황)', '호반산업': '우리(주황)',
-    '계룡건설산업': '개(그린)', '동양건설산업': '개(그린)', '디엘이앤씨': '개(그린)',
-    '케이씨씨건설': '개(그린)', '케이알산업': '개(그린)', '코오롱글로벌': '개(그린)',
-    '태영건설': '개(그린)', '현대건설': '개(그린)',
-    '금호건설': '원숭이(하늘)', '대우건설': '원숭이(하늘)', '동부건설': '원숭이(하늘)',
-    '두산건설': '원숭이(하늘)', '롯데건설': '원숭이(하늘)', '비에스한양': '원숭이(하늘)',
-    '한양': '원숭이(하늘)', '에이치제이중공업': '원숭이(하늘)', '지에스건설': '원숭이(하늘)',
-    '대보건설': '무소속(흰색)', '디엘건설': '무소속(흰색)', '에이치디씨현대산업개발': '무소속(흰색)', '한화': '무소속(흰색)',
-}
-
-folder = r"E:\인프라수주팀\트레이닝\24년이후 입찰결과"
-all_files = glob.glob(os.path.join(folder, "**", "*.xlsb"), recursive=True) + glob.glob(os.path.join(folder, "**", "*.xlsx"), recursive=True)
-files = [f for f in all_files if not os.path.basename(f).startswith('~$')]
-
-all_data = []
-winners_data = []
-
-for f in files:
-    try:
-        df = pd.read_excel(f, sheet_name="입찰결과", header=None, engine='pyxlsb' if f.endswith('xlsb') else 'openpyxl')
-        
-        # 1. 승자 찾기 ("N"열 우선순위가 "1"인 회사, N열 = 인덱스 13, 회사 = 인덱스 1)
+from bid_pool import load_tenders, parse_jobs
+from bid_faction import faction_of, tag_bids
+from bid_model import to_ratio
+from bid_manifest import parse_incremental, select_targets, update_manifest, save_manifest, stale_files
+from bid_index import record_entry
+from bid_sketch import SketchStore
+from bid_store import write_table, read_table, table_exists, date_partition
+
+FOLDER = r"E:\인프라수주팀\트레이닝\24년이후 입찰결과"
+
+def merge_delta(name, new_df, stale):
+    """증분 실행: 저장소의 기존 테이블에서 바뀐 파일(절대 경로)의 행만 빼고 새로 파싱한 행을 합침"""
+    if not table_exists(name):
+        return new_df
+    old_df = read_table(name, categorical=False)
+    if 'Path' in old_df.columns:
+        old_df = old_df[~old_df['Path'].isin(stale)]
+    else:
+        # Path 열이 없던 예전 테이블은 파일명으로만 구분 가능
+        old_df = old_df[~old_df['File'].isin({os.path.basename(p) for p in stale})]
+    return pd.concat([old_df, new_df], ignore_index=True)
+
+def faction_key(company_id, client, year):
+    """스케치 묶음 키: 세력 업체면 (세력, 세력 업체명), 아니면 제외"""
+    comp, faction = faction_of(company_id)
+    return (faction, comp) if comp else None
+
+def main(jobs=1, incremental=False):
+    all_files = glob.glob(os.path.join(FOLDER, "**", "*.xlsb"), recursive=True) + glob.glob(os.path.join(FOLDER, "**", "*.xlsx"), recursive=True)
+    files = [f for f in all_files if not os.path.basename(f).startswith('~$')]
+    targets, manifest, changes = select_targets('analyze_factions', files, incremental, FOLDER)
+    results = load_tenders(targets, jobs)
+
+    all_data = []
+    winners_data = []
+
+    for f, record in results:
+        if record is None: continue
+        file_name = os.path.basename(f)
+        file_path = os.path.abspath(f)
+        # 입찰 연/월 (저장소 파티션)
+        year, month = date_partition(record_entry(f, record)['date'])
+
+        # 순위표 회사명 열을 한 번 훑어서 행마다 (정규화 업체명, 세력 업체명, 세력)
+        tags = tag_bids(record['bids'])
+
+        # 1. 승자 찾기 (우선순위가 1인 회사)
         winner_comp = None
         winner_faction = None
-        
-        for i, row in df.iterrows():
-            row_vals = row.values
-            if len(row_vals) > 13:
-                try:
-                    col_n = str(row_vals[13]).strip().replace('.0', '')
-                    if col_n == '1' or col_n == '1순위':
-                        raw_comp_name = str(row_vals[1]).strip()
-                        # 세력 매칭 확인
-                        for key, faction in FACTIONS.items():
-                            if key in raw_comp_name.replace(' ', ''):
-                                winner_comp = key
-                                winner_faction = faction
-                                break
-                        
-                        # 세력에 속하지 않더라도 원본 이름 추출
-                        if not winner_comp and len(raw_comp_name) >= 2:
-                            winner_comp = raw_comp_name
-                            # 이름 정리 (주식회사 등 제거)
-                            winner_comp = winner_comp.replace('주식회사', '').replace('(주)', '').replace('㈜', '').strip()
-                            winner_faction = '기타(세력외)'
-                            
-                        if winner_comp:
-                            winners_data.append({
-                                'File': os.path.basename(f),
-                                'WinnerCompany': winner_comp,
-                                'WinnerFaction': winner_faction if winner_faction else '기타(세력외)'
-                            })
-                            break
-                except Exception:
-                    pass
+
+        for bid, (company_name, matched_comp, matched_faction) in zip(record['bids'], tags):
+            if bid['priority'] != 1: continue
+            raw_comp_name = bid['company']
+            # 세력 매칭 확인
+            winner_comp, winner_faction = matched_comp, matched_faction
+
+            # 세력에 속하지 않더라도 업체명 추출 (주식회사 등을 뗀 정규화 이름)
+            if not winner_comp and len(raw_comp_name) >= 2:
+                winner_comp = company_name
+                winner_faction = '기타(세력외)'
+
+            if winner_comp:
+                winners_data.append({
+                    'File': file_name,
+                    'Path': file_path,
+                    'Year': year,
+                    'Month': month,
+                    'WinnerCompany': winner_comp,
+                    'WinnerFaction': winner_faction if winner_faction else '기타(세력외)'
+                })
+                break
 
         if not winner_comp:
              winners_data.append({
-                'File': os.path.basename(f),
+                'File': file_name,
+                'Path': file_path,
+                'Year': year,
+                'Month': month,
                 'WinnerCompany': '미상/확인불가',
                 'WinnerFaction': '기타(세력외)'
             })
 
 
-        # 2. 모든 투찰 데이터 파싱
-        for _, row in df.iterrows():
-            row_vals = row.values
-            for cell in row_vals:
-                if pd.isna(cell): continue
-                cell_str = str(cell).replace(' ', '')
-                matched_comp = None
-                matched_faction = None
-                for key, faction in FACTIONS.items():
-                    if key in cell_str:
-                        matched_comp = key
-                        matched_faction = faction
-                        break
-                        
-                if matched_comp:
-                    ratio = None
-                    bid = None
-                    for c in row_vals:
-                        if pd.isna(c): continue
-                        try:
-                            # Parse floats defensively
-                            c_str = str(c).replace(',', '').replace('%', '').strip()
-                            val = float(c_str)
-                            if 0.75 <= val <= 0.99:
-                                ratio = val
-                            elif 75.0 <= val <= 99.0:
-                                ratio = val / 100.0
-                            elif val > 100000000:
-                                bid = val
-                        except ValueError:
-                            pass
-                            
-                    all_data.append({
-                        'File': os.path.basename(f),
-                        'Company': matched_comp,
-                        'Faction': matched_faction,
-                        'BidAmount': bid,
-                        'Ratio': ratio
-                    })
-                    break 
-    except Exception as e:
-        print(f"Skipping {f} (Error: {e})")
-
-res_df = pd.DataFrame(all_data)
-# Filter valid ratios
-res_df = res_df.dropna(subset=['Ratio'])
-res_df.to_csv(r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_analysis.csv", index=False, encoding='utf-8-sig')
-
-winners_df = pd.DataFrame(winners_data)
-winners_df.to_csv(r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_winners.csv", index=False, encoding='utf-8-sig')
-
-print(f"Processed {len(res_df)} rows of data from {res_df['File'].nunique()} unique valid files.")
-print(f"Winners extracted for {len(winners_df)} files.")
-
-# Also calculate summary
-if not res_df.empty:
-    summary = res_df.groupby(['Faction', 'Company'])['Ratio'].agg(['mean', 'count', 'min', 'max']).reset_index()
-    summary = summary.sort_values(by=['Faction', 'mean'])
-    summary.to_csv(r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_summary.csv", index=False, encoding='utf-8-sig')
-    print("Summary created.")
+        # 2. 모든 투찰 데이터 파싱 (순위표의 회사명 기준)
+        for bid, (_, matched_comp, matched_faction) in zip(record['bids'], tags):
+            if not matched_comp: continue
+
+            ratio = to_ratio(bid['base_ratio'])
+            if ratio is None:
+                ratio = to_ratio(bid['yega_ratio'])
+            bid_amount = bid['amount'] if bid['amount'] is not None and bid['amount'] > 100000000 else None
+
+            all_data.append({
+                'File': file_name,
+                'Path': file_path,
+                'Year': year,
+                'Month': month,
+                'Company': matched_comp,
+                'Faction': matched_faction,
+                'BidAmount': bid_amount,
+                'Ratio': ratio
+            })
+
+    res_df = pd.DataFrame(all_data, columns=['File', 'Path', 'Year', 'Month', 'Company', 'Faction', 'BidAmount', 'Ratio'])
+    # Filter valid ratios
+    res_df = res_df.dropna(subset=['Ratio'])
+    winners_df = pd.DataFrame(winners_data, columns=['File', 'Path', 'Year', 'Month', 'WinnerCompany', 'WinnerFaction'])
+    if incremental:
+        stale = stale_files(changes)
+        res_df = merge_delta('analysis', res_df, stale)
+        winners_df = merge_delta('winners', winners_df, stale)
+
+    write_table('analysis', res_df)
+    write_table('winners', winners_df)
+
+    # 세력/업체별 투찰율 요약은 원본 행 대신 누적 스케치(업체 x 발주처 x 연도 칸)를 합쳐서 계산
+    # (새 파일만 참여업체 수만큼 갱신, 바뀌거나 지워진 파일이 있는 연도만 다시 합산)
+    sketches = SketchStore('analyze_factions')
+    sketches.update(results, removed=changes['removed'] if incremental else (), current=None if incremental else files)
+    summary = sketches.frame(faction_key, 'ratio', names=('Faction', 'Company'))
+    sketches.save()
+    # 저장소에 반영된 뒤에만 매니페스트 갱신 (중간에 실패하면 다음 증분 실행에서 다시 처리)
+    # 매니페스트는 --incremental 실행에서만 만들고 갱신 (전체 실행은 아카이브 해시를 만들지 않음)
+    if incremental:
+        save_manifest('analyze_factions', update_manifest(manifest, results, changes))
+
+    print(f"Processed {len(res_df)} rows of data from {res_df['Path'].nunique()} unique valid files.")
+    print(f"Winners extracted for {len(winners_df)} files.")
+
+    # Also calculate summary
+    if not summary.empty:
+        summary = summary[['Faction', 'Company', 'mean', 'count', 'min', 'max']].sort_values(by=['Faction', 'mean'])
+        write_table('summary', summary)
+        print("Summary created.")
+
+if __name__ == "__main__":
+    jobs, rest = parse_jobs()
+    incremental, _ = parse_incremental(rest)
+    main(jobs, incremental)
@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from bid_cache import list_workbooks
+from bid_db import connect, db_token, sync
+from bid_dedup import dedup_paths
+from bid_faction import faction_of
+from bid_index import method_of, parse_filters, period_end
+from bid_model import to_ratio
+from bid_query import company_ids
+from bid_store import table_dir
+
+# 전체 입찰결과 아카이브(2014년~) 분석용 열 저장소
+# 창고 DB(bid_db)의 투찰/입찰 요약을 입찰연도/방식 폴더(Year=2019/Method=종심/...)로 나눈 Parquet 로 내보내고
+# 조회 시 연도/방식 조건은 폴더 단위로 건너뛰고(파티션 프루닝), 발주처/입찰일/업체 조건은 Parquet
+# 행 그룹 통계로 읽기 전에 걸러냄 (파일 안에서 발주처 순으로 정렬해 두므로 발주처 조건이 잘 걸림)
+# 내보내기는 내용이 바뀐 연도 폴더만 다시 씀 (DB 가 새로 만들어져 업체 ID 가 바뀌었으면 전체를 다시 씀)
+ARCHIVE_DIRS = [
+    r"V:\인프라수주팀\인프라자료실\01.입찰결과",
+    r"E:\인프라수주팀\트레이닝\24년이후 입찰결과",
+]
+BIDS_TABLE = 'archive_bids'
+TENDERS_TABLE = 'archive_tenders'
+STATE_FILE = '_state.json'   # '_' 로 시작하는 파일은 Parquet 데이터셋에서 제외됨
+ROW_GROUP_SIZE = 65536
+
+PARTITIONING = ds.partitioning(pa.schema([('Year', pa.int16()), ('Method', pa.string())]), flavor='hive')
+UNKNOWN_METHOD = '기타'
+
+TENDER_SQL = """
+SELECT f.tender_id AS TenderId, f.file AS File, f.client AS Client, f.method AS MethodLabel, f.bid_date AS BidDate,
+       f.base_amount AS BaseAmount, f.bidder_count AS BidderCount, f.winner_company_id AS WinnerCompanyId,
+       c.name AS WinnerCompany, f.winner_amount AS WinnerAmount, f.winner_base_ratio AS WinnerBaseRatio,
+       f.max_price_score AS MaxPriceScore, f.limit_yega AS LimitYega
+FROM tender_facts f LEFT JOIN companies c ON c.id = f.winner_company_id
+"""
+BID_SQL = """
+SELECT f.tender_id AS TenderId, f.file AS File, f.client AS Client, f.method AS MethodLabel, f.bid_date AS BidDate,
+       b.rank AS Rank, b.company_id AS CompanyId, c.name AS Company, b.amount AS Amount,
+       b.yega_ratio AS YegaRatio, b.base_ratio AS BaseRatio, b.price_score AS PriceScore,
+       b.deduct_score AS DeductScore, b.priority AS Priority, f.limit_yega AS LimitYega
+FROM bids b JOIN tender_facts f ON f.tender_id = b.tender_id JOIN companies c ON c.id = b.company_id
+"""
+
+
+def _year_clause(year):
+    if year == 0:
+        return "f.bid_date IS NULL", []
+    return "f.bid_date >= ? AND f.bid_date < ?", [f"{year}-", f"{year + 1}-"]
+
+
+def year_signatures(conn):
+    """연도 -> 그 연도 입찰 파일들(경로/크기/수정시각)의 해시 (날짜 모름은 0년)"""
+    hashes = {}
+    for row in conn.execute("SELECT bid_date, path, size, mtime_ns FROM tenders ORDER BY path"):
+        year = int(row['bid_date'][:4]) if row['bid_date'] else 0
+        hashes.setdefault(year, hashlib.sha1()).update(f"{row['path']}|{row['size']}|{row['mtime_ns']}\n".encode('utf-8'))
+    return {year: h.hexdigest() for year, h in hashes.items()}
+
+
+def _frame(conn, sql, year):
+    clause, params = _year_clause(year)
+    df = pd.read_sql_query(sql + " WHERE " + clause, conn, params=params)
+    df['Year'] = year
+    df['Month'] = [int(d[5:7]) if d else 0 for d in df['BidDate']]
+    df['Method'] = [method_of(file, label) or UNKNOWN_METHOD for file, label in zip(df['File'], df['MethodLabel'])]
+    return df.drop(columns=['MethodLabel']).sort_values(['Method', 'Client', 'BidDate', 'TenderId'], kind='stable')
+
+
+def _write_year(name, df, year, store_dir):
+    target = table_dir(name, store_dir)
+    shutil.rmtree(os.path.join(target, f"Year={year}"), ignore_errors=True)
+    if df.empty:
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.set_column(table.column_names.index('Year'), 'Year', table['Year'].cast(pa.int16()))
+    table = table.set_column(table.column_names.index('Month'), 'Month', table['Month'].cast(pa.int8()))
+    ds.write_dataset(table, target, format='parquet', partitioning=PARTITIONING,
+                     basename_template=f"part-{year}-{{i}}.parquet", existing_data_behavior='overwrite_or_ignore',
+                     max_rows_per_group=ROW_GROUP_SIZE, min_rows_per_group=min(ROW_GROUP_SIZE, len(df)))
+
+
+def export(conn, store_dir=None):
+    """창고 DB -> 아카이브 Parquet (지난 내보내기 이후 바뀐 연도만 다시 씀)"""
+    state_file = os.path.join(table_dir(TENDERS_TABLE, store_dir), STATE_FILE)
+    token = db_token(conn)
+    try:
+        with open(state_file, 'r', encoding='utf-8') as fh:
+            saved = json.load(fh)
+    except (OSError, ValueError):
+        saved = {}
+    if saved.get('token') == token:
+        state = {int(year): sig for year, sig in saved['years'].items()}
+    else:
+        state = {}
+        for name in (TENDERS_TABLE, BIDS_TABLE):
+            shutil.rmtree(table_dir(name, store_dir), ignore_errors=True)
+    current = year_signatures(conn)
+    changed = sorted(year for year in set(state) | set(current) if state.get(year) != current.get(year))
+    for year in changed:
+        _write_year(TENDERS_TABLE, _frame(conn, TENDER_SQL, year), year, store_dir)
+        _write_year(BIDS_TABLE, _frame(conn, BID_SQL, year), year, store_dir)
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    with open(state_file, 'w', encoding='utf-8') as fh:
+        json.dump({'token': token, 'years': current}, fh)
+    print(f"아카이브 내보내기: {len(changed)}개 연도 갱신 (전체 {len(current)}개 연도)")
+    return changed
+
+
+def build(base_dirs=None, jobs=1, store_dir=None):
+    """아카이브 폴더 전체를 DB 와 맞추고(중복 파일은 최신 리비전만) Parquet 로 내보냄"""
+    conn = connect()
+    paths = {}
+    for base_dir in base_dirs or ARCHIVE_DIRS:
+        paths[base_dir] = list_workbooks(base_dir)
+    kept, duplicates = dedup_paths([p for group in paths.values() for p in group], jobs)
+    kept = set(kept)
+    for base_dir, group in paths.items():
+        sync(conn, [p for p in group if p in kept], jobs, base_dir)
+    with conn:
+        conn.executemany("DELETE FROM tenders WHERE path = ?", [(os.path.abspath(p),) for p in duplicates])
+    changed = export(conn, store_dir)
+    conn.close()
+    return changed
+
+
+def _values(name, column, keys, store_dir=None):
+    """아카이브 입찰 요약 열의 값 중 keys 일부(공백/대소문자 무시)가 들어간 값 목록"""
+    keys = [str(key).replace(" ", "").upper() for key in keys]
+    dataset = ds.dataset(table_dir(name, store_dir), format='parquet', partitioning=PARTITIONING)
+    values = dataset.to_table(columns=[column]).column(column).unique().to_pylist()
+    return [v for v in values if v is not None and any(key in v.replace(" ", "").upper() for key in keys)]
+
+
+def _isin(field, values):
+    # 맞는 값이 하나도 없으면 빈 결과 (빈 목록은 열 타입을 알 수 없어 isin 에 넘길 수 없음)
+    return ds.field(field).isin(values) if values else ds.scalar(False)
+
+
+def scan(name=BIDS_TABLE, columns=None, since=None, until=None, clients=None, methods=None, companies=None, store_dir=None):
+    """아카이브 테이블 조회 -> DataFrame
+
+    since/until 은 'YYYY-MM-DD' ('YYYY', 'YYYY-MM' 도 가능), methods 는 방식(종심/종평/간이종심/기타), clients/companies 는 이름 일부
+    날짜를 모르는 입찰(Year=0)은 날짜 조건을 통과시킴 (bid_query 와 동일)
+    """
+    dataset = ds.dataset(table_dir(name, store_dir), format='parquet', partitioning=PARTITIONING)
+    conds = []
+    if since:
+        conds.append((ds.field('Year') == 0) | ((ds.field('Year') >= int(since[:4])) & (ds.field('BidDate') >= since)))
+    if until:
+        until = period_end(until)
+        conds.append((ds.field('Year') == 0) | ((ds.field('Year') <= int(until[:4])) & (ds.field('BidDate') <= until)))
+    if methods:
+        conds.append(_isin('Method', list(methods)))
+    if clients:
+        conds.append(_isin('Client', _values(TENDERS_TABLE, 'Client', clients, store_dir)))
+    if companies:
+        field = 'CompanyId' if name == BIDS_TABLE else 'WinnerCompanyId'
+        conn = connect()
+        conds.append(_isin(field, company_ids(conn, companies)))
+        conn.close()
+    expr = None
+    for cond in conds:
+        expr = cond if expr is None else expr & cond
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+def limit_trend(**filters):
+    """연도/방식별 입찰 수, 평균 하한선(예가대비 %), 평균 1순위 기초대비"""
+    df = scan(TENDERS_TABLE, columns=['Year', 'Method', 'LimitYega', 'WinnerBaseRatio'], **filters)
+    return (df.groupby(['Year', 'Method'])
+              .agg(Tenders=('LimitYega', 'size'), LimitYega=('LimitYega', 'mean'), WinnerBaseRatio=('WinnerBaseRatio', 'mean'))
+              .reset_index())
+
+
+def faction_trend(**filters):
+    """연도/세력별 투찰 수, 평균 기초대비, 1순위 수와 점유율"""
+    bids = scan(BIDS_TABLE, columns=['Year', 'CompanyId', 'BaseRatio', 'YegaRatio', 'Priority'], **filters)
+    factions = {cid: faction_of(int(cid))[1] for cid in bids['CompanyId'].unique()}
+    bids['Faction'] = bids['CompanyId'].map(factions)
+    bids = bids.dropna(subset=['Faction'])
+    bids['Ratio'] = [to_ratio(b) if to_ratio(b) is not None else to_ratio(y) for b, y in zip(bids['BaseRatio'], bids['YegaRatio'])]
+    bids['Win'] = bids['Priority'] == 1
+    trend = (bids.groupby(['Year', 'Faction'])
+                 .agg(Bids=('Ratio', 'size'), Ratio=('Ratio', 'mean'), Wins=('Win', 'sum'))
+                 .reset_index())
+    tenders = scan(TENDERS_TABLE, columns=['Year'], **filters).groupby('Year').size()
+    trend['WinShare'] = trend['Wins'] / trend['Year'].map(tenders)
+    return trend
+
+
+if __name__ == "__main__":
+    import time
+    from bid_pool import parse_jobs
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    jobs, rest = parse_jobs()
+    filters, rest = parse_filters(rest)
+    parser = argparse.ArgumentParser(description="전체 입찰결과 아카이브 분석")
+    parser.add_argument('command', choices=['build', 'trend'])
+    parser.add_argument('folders', nargs='*', help="build: 아카이브 폴더 (기본 ARCHIVE_DIRS)")
+    args = parser.parse_args(rest)
+
+    if args.command == 'build':
+        build(args.folders or None, jobs)
+        sys.exit(0)
+
+    started = time.perf_counter()
+    limits = limit_trend(**filters)
+    factions = faction_trend(**filters)
+    elapsed = time.perf_counter() - started
+    pd.set_option('display.width', 200)
+    print("연도별 하한선 / 1순위 기초대비")
+    print(limits.to_string(index=False))
+    print("\n연도별 세력 투찰율 / 1순위 점유율")
+    print(factions.to_string(index=False))
+    print(f"\n({elapsed * 1000:.0f} ms)")
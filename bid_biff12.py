@@ -0,0 +1,324 @@
+import sys
+import time
+import struct
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# .xlsb(BIFF12) 시트 레코드를 zip 에서 바로 읽는 경량 리더
+# pyxlsb 는 시트 파트 전체를 임시 파일로 풀고 셀마다 Cell 객체를 만들지만,
+# 여기서는 필요한 행까지만 스트리밍으로 풀고 값만 리스트에 넣음 (순위표가 끝나면 나머지는 읽지 않음)
+
+# 레코드 ID (바이트 그대로 리틀엔디언으로 읽은 값, pyxlsb 와 동일한 표기)
+ROW = 0x0000
+BLANK = 0x0001
+NUM = 0x0002          # RK 숫자
+BOOLERR = 0x0003
+BOOL = 0x0004
+FLOAT = 0x0005
+INLINE_STRING = 0x0006
+STRING = 0x0007       # 공유 문자열 인덱스
+FORMULA_STRING = 0x0008
+FORMULA_FLOAT = 0x0009
+FORMULA_BOOL = 0x000A
+FORMULA_BOOLERR = 0x000B
+SST_ITEM = 0x0013
+SHEETDATA = 0x0191
+SHEETDATA_END = 0x0192
+SHEET = 0x019C
+
+CHUNK_SIZE = 64 * 1024
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_u32 = struct.Struct('<I')
+_f64 = struct.Struct('<d')
+
+
+class Biff12Error(Exception):
+    pass
+
+
+class _RecordStream:
+    """zip 파트를 청크 단위로 풀면서 (레코드 ID, payload) 를 차례로 반환"""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.buf = b''
+        self.pos = 0
+
+    def _fill(self, need):
+        while len(self.buf) - self.pos < need:
+            chunk = self.fh.read(CHUNK_SIZE)
+            if not chunk:
+                return False
+            self.buf = self.buf[self.pos:] + chunk
+            self.pos = 0
+        return True
+
+    def __iter__(self):
+        while True:
+            # 헤더: ID 1~4 바이트 + 길이 1~4 바이트 (둘 다 최상위 비트가 계속 표시)
+            self._fill(8)
+            buf = self.buf
+            pos = self.pos
+            end = len(buf)
+            if pos >= end:
+                return
+            rec_id = 0
+            for shift in (0, 8, 16, 24):
+                if pos >= end:
+                    raise Biff12Error("잘린 레코드 헤더")
+                b = buf[pos]
+                pos += 1
+                rec_id |= b << shift
+                if not b & 0x80:
+                    break
+            size = 0
+            for shift in (0, 7, 14, 21):
+                if pos >= end:
+                    raise Biff12Error("잘린 레코드 헤더")
+                b = buf[pos]
+                pos += 1
+                size |= (b & 0x7F) << shift
+                if not b & 0x80:
+                    break
+            self.pos = pos
+            if not self._fill(size):
+                raise Biff12Error("잘린 레코드")
+            payload = self.buf[self.pos:self.pos + size]
+            self.pos += size
+            yield rec_id, payload
+
+
+def _wide_string(data, offset=0):
+    """XLWideString: 글자 수(uint32) + UTF-16LE -> (문자열, 다음 offset)"""
+    count = _u32.unpack_from(data, offset)[0]
+    start = offset + 4
+    end = start + count * 2
+    return data[start:end].decode('utf-16-le', errors='replace'), end
+
+
+def _rk(raw):
+    if raw & 0x02:
+        value = (raw - 0x100000000 if raw & 0x80000000 else raw) >> 2
+    else:
+        value = _f64.unpack(b'\x00\x00\x00\x00' + _u32.pack(raw & 0xFFFFFFFC))[0]
+    if raw & 0x01:
+        value /= 100
+    return float(value)
+
+
+class Biff12Book:
+    """xlsb 파일 핸들: 시트 목록/공유 문자열은 처음 한 번만 읽음
+
+    with Biff12Book(path) as book:
+        for r_idx, values in book.rows('입찰결과', max_col=24): ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.zf = zipfile.ZipFile(path)
+        self._sheets = None   # [(이름, 파트 경로)]
+        self._strings = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.zf.close()
+
+    def _records(self, part):
+        with self.zf.open(part) as fh:
+            yield from _RecordStream(fh)
+
+    @property
+    def sheets(self):
+        if self._sheets is None:
+            rels = {}
+            root = ET.fromstring(self.zf.read('xl/_rels/workbook.bin.rels'))
+            for rel in root.iter(REL_NS + 'Relationship'):
+                target = rel.get('Target')
+                if target.startswith('/'):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join('xl', target))
+                rels[rel.get('Id')] = target
+            self._sheets = []
+            for rec_id, data in self._records('xl/workbook.bin'):
+                if rec_id == SHEET:
+                    rel_id, offset = _wide_string(data, 8)
+                    name, _ = _wide_string(data, offset)
+                    self._sheets.append((name, rels.get(rel_id)))
+        return [name for name, _ in self._sheets]
+
+    @property
+    def strings(self):
+        if self._strings is None:
+            self._strings = []
+            if 'xl/sharedStrings.bin' in self.zf.namelist():
+                for rec_id, data in self._records('xl/sharedStrings.bin'):
+                    if rec_id == SST_ITEM:
+                        # 첫 바이트는 서식 플래그, 서식(rich text) 정보는 문자열 뒤에 있으므로 무시
+                        self._strings.append(_wide_string(data, 1)[0])
+        return self._strings
+
+    def rows(self, sheet, max_col=None, start=0, stop=None):
+        """시트의 (행번호, 값 목록) 이터레이터 (pyxlsb sparse 모드와 같이 ROW 레코드가 없는 행은 건너뜀)
+
+        max_col 을 주면 그 길이로 맞추고, 없으면 실제 값이 있는 마지막 열까지
+        """
+        names = self.sheets
+        if sheet not in names:
+            raise KeyError(f"시트 없음: {sheet}")
+        part = self._sheets[names.index(sheet)][1]
+        strings = self.strings
+        width = max_col or 0
+        r_idx = None
+        values = None
+        in_data = False
+        for rec_id, data in self._records(part):
+            if not in_data:
+                in_data = rec_id == SHEETDATA
+                continue
+            if rec_id == ROW:
+                if values is not None and r_idx >= start:
+                    yield r_idx, values
+                r_idx = _u32.unpack_from(data)[0]
+                if stop is not None and r_idx >= stop:
+                    return
+                values = [None] * width
+                continue
+            if rec_id == SHEETDATA_END:
+                break
+            if rec_id > FORMULA_BOOLERR or values is None:
+                continue
+
+            col = _u32.unpack_from(data)[0]
+            if col >= len(values):
+                if max_col is not None:
+                    continue
+                values.extend([None] * (col + 1 - len(values)))
+
+            if rec_id == STRING:
+                value = strings[_u32.unpack_from(data, 8)[0]]
+            elif rec_id == FLOAT or rec_id == FORMULA_FLOAT:
+                value = _f64.unpack_from(data, 8)[0]
+            elif rec_id == NUM:
+                value = _rk(_u32.unpack_from(data, 8)[0])
+            elif rec_id == INLINE_STRING or rec_id == FORMULA_STRING:
+                value = _wide_string(data, 8)[0]
+            elif rec_id == BOOL or rec_id == FORMULA_BOOL:
+                value = data[8] != 0
+            else:
+                value = None  # 빈칸/오류 셀
+            if value != '':
+                values[col] = value
+
+        if values is not None and r_idx >= start:
+            yield r_idx, values
+
+
+def ranking_arrays(rows, columns):
+    """순위표 행 목록 -> 열별 타입 배열 (빈칸은 정수 -1, 실수 NaN)
+
+    columns: bid_cache.map_ranking_columns 결과 (필드 -> 열 번호)
+    """
+    from bid_cache import to_float, to_int
+
+    n = len(rows)
+    arrays = {
+        'rank': np.full(n, -1, dtype=np.int16),
+        'company': [],
+        'amount': np.full(n, -1, dtype=np.int64),
+        'yega_ratio': np.full(n, np.nan, dtype=np.float64),
+        'base_ratio': np.full(n, np.nan, dtype=np.float64),
+        'price_score': np.full(n, np.nan, dtype=np.float64),
+        'deduct_score': np.full(n, np.nan, dtype=np.float64),
+        'priority': np.full(n, -1, dtype=np.int16),
+    }
+
+    def cell(row, field):
+        c_idx = columns.get(field, -1)
+        return row[c_idx] if 0 <= c_idx < len(row) else None
+
+    for i, row in enumerate(rows):
+        rank = to_int(row[0])
+        if rank is not None:
+            arrays['rank'][i] = rank
+        company = cell(row, 'company')
+        arrays['company'].append(str(company).strip() if company is not None else "")
+        amount = to_float(cell(row, 'amount'))
+        if amount is not None:
+            arrays['amount'][i] = int(round(amount))
+        for field in ('yega_ratio', 'base_ratio', 'price_score', 'deduct_score'):
+            val = to_float(cell(row, field))
+            if val is not None:
+                arrays[field][i] = val
+        priority = to_int(cell(row, 'priority'))
+        if priority is not None:
+            arrays['priority'][i] = priority
+    return arrays
+
+
+def extract_ranking(path, full=False):
+    """xlsb 입찰결과 시트의 순위표를 타입 배열로 바로 추출 (pandas 미사용, 순위표가 없으면 None)
+
+    full=True 면 순위표 끝에서 멈추지 않고 시트 끝까지 읽음 (benchmark 에서 pandas 와 같은 범위로 비교용)
+    """
+    from bid_cache import MAX_COLUMN, read_ranking_block, map_ranking_columns
+    from bid_workbook import pick_main_sheet
+
+    with Biff12Book(path) as book:
+        sheet = pick_main_sheet(book.sheets)
+        rows = book.rows(sheet, max_col=MAX_COLUMN)
+        top_rows, header, body = read_ranking_block(list(rows) if full else rows)
+    if header is None:
+        return None
+    return ranking_arrays(body, map_ranking_columns(header))
+
+
+def _pandas_ranking(path):
+    """비교용: 기존 pd.read_excel 경로 (시트 전체 DataFrame 후 순위표 추출, 순위표가 없으면 None)"""
+    import pandas as pd
+    from bid_cache import MAX_COLUMN, read_ranking_block, map_ranking_columns
+    from bid_workbook import pick_main_sheet
+
+    with pd.ExcelFile(path, engine='pyxlsb') as xls:
+        df = xls.parse(pick_main_sheet(xls.sheet_names), header=None)
+    rows = ((r_idx, [None if (not isinstance(v, str) and pd.isna(v)) else v for v in row[:MAX_COLUMN]])
+            for r_idx, row in enumerate(df.itertuples(index=False)))
+    top_rows, header, body = read_ranking_block(rows)
+    if header is None:
+        return None
+    return ranking_arrays(body, map_ranking_columns(header))
+
+
+def benchmark(path, repeat=5):
+    """pd.read_excel 과 biff12 를 같은 범위(시트 전체)로 비교하고, 순위표 끝에서 멈추는 실제 경로도 함께 표시"""
+    cases = (
+        ('pd.read_excel', _pandas_ranking),
+        ('biff12 (전체)', lambda p: extract_ranking(p, full=True)),
+        ('biff12 (순위표)', extract_ranking),
+    )
+    for label, func in cases:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            arrays = func(path)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        found = f"투찰 {len(arrays['rank'])}건" if arrays is not None else "순위표 없음"
+        print(f"{label:>14}: {best * 1000:8.2f} ms  ({found})")
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    if len(sys.argv) < 2:
+        print("Usage: python bid_biff12.py <입찰결과.xlsb> [반복횟수]")
+        sys.exit(1)
+    benchmark(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 5)
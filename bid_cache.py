@@ -0,0 +1,417 @@
+import os
+import re
+import pickle
+import hashlib
+import pandas as pd
+
+from bid_workbook import Workbook
+from bid_schema import revision_of, get_schema, learn_schema
+
+# 입찰결과 엑셀 파싱 결과를 디스크에 캐시해두고 모든 분석 스크립트가 같이 사용
+# 캐시 키: 파일 경로 + 크기 + 수정시각 (파일이 바뀌면 자동으로 다시 파싱)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.bid_cache')
+CACHE_VERSION = 3
+
+EXCEL_EXTS = ('.xlsb', '.xlsx', '.xls')
+
+# 스트리밍 리더 범위: 헤더 라벨(V열 결정방식/공고번호)까지 읽고, 헤더 영역은 앞쪽 행만 보관
+MAX_COLUMN = 24
+HEADER_SCAN_ROWS = 50
+
+# 헤더(발주정보/낙찰예정정보) 영역의 라벨 -> 필드명 매핑 (라벨 오른쪽 첫 값이 데이터)
+HEADER_FIELDS = {
+    '공사명': ['공사명'],
+    '발주처': ['발주처', '발주기관'],
+    '낙찰자결정방법': ['낙찰자결정방법', '입찰방법'],
+    '입찰일': ['입찰일', '개찰일', '투찰일'],
+    '공고번호': ['공고번호'],
+    '결정방식': ['낙찰우선순위'],
+    '기초금액': ['기초금액'],
+    '예정가격': ['예정가격'],
+    '균형가격': ['균형가격'],
+}
+NUMERIC_FIELDS = ['기초금액', '예정가격', '균형가격']
+
+# 순위표 헤더 키워드 (앞에 있는 키워드, 앞에 있는 열 우선)
+RANKING_COLUMNS = {
+    'company': ['회사명'],
+    'amount': ['입찰금액'],
+    'yega_ratio': ['예가대비'],
+    'base_ratio': ['기초대비', '투찰율'],
+    'price_score': ['가격점수'],
+    'deduct_score': ['단가감점'],
+    'priority': ['우선순위'],
+}
+
+
+def clean_label(val):
+    if val is None or (not isinstance(val, str) and pd.isna(val)):
+        return ""
+    return str(val).replace("\n", "").replace(" ", "")
+
+
+def to_float(val):
+    """숫자/문자 셀 값을 float 로 변환 (빈칸, '-', 문자열은 None)"""
+    if val is None:
+        return None
+    if isinstance(val, str):
+        val = val.replace(",", "").replace("%", "").strip()
+        if val in ("", "-", "nan"):
+            return None
+    try:
+        num = float(val)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(num):
+        return None
+    return num
+
+
+def to_int(val):
+    """순위/우선순위 셀 값을 int 로 변환 ('1', 1.0, '1순위' 모두 1)"""
+    num = to_float(val)
+    if num is not None:
+        return int(num) if float(num).is_integer() else None
+    if isinstance(val, str):
+        match = re.match(r'\s*(\d+)', val)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def format_excel_date(excel_date):
+    if excel_date is None or (not isinstance(excel_date, str) and pd.isna(excel_date)) or str(excel_date).strip() == "":
+        return ""
+    try:
+        dt = pd.to_datetime('1899-12-30') + pd.to_timedelta(float(excel_date), unit='D')
+        if dt.hour == 0 and dt.minute == 0:
+            return dt.strftime('%Y/%m/%d')
+        else:
+            return dt.strftime('%Y/%m/%d %H:%M')
+    except (ValueError, TypeError, OverflowError):
+        return str(excel_date)
+
+
+def parse_bid_date(val):
+    """입찰일 셀 값(엑셀 일련번호/datetime/문자열)을 (연도, 'YYYY-MM-DD') 로 변환"""
+    if val is None:
+        return None
+    if isinstance(val, str):
+        match = re.search(r'(\d{4})\s*[-/년.]\s*(\d{1,2})\s*[-/월.]\s*(\d{1,2})', val)
+        if match:
+            year, month, day = match.groups()
+            return year, f"{year}-{int(month):02d}-{int(day):02d}"
+        return None
+    if hasattr(val, 'strftime'):
+        return str(val.year), val.strftime('%Y-%m-%d')
+    num = to_float(val)
+    if num is None or num <= 0:
+        return None
+    try:
+        dt = pd.to_datetime('1899-12-30') + pd.to_timedelta(num, unit='D')
+    except (ValueError, OverflowError):
+        return None
+    return str(dt.year), dt.strftime('%Y-%m-%d')
+
+
+def is_blank(val):
+    return val is None or clean_label(val) == ""
+
+
+def read_ranking_block(rows, max_header_rows=HEADER_SCAN_ROWS):
+    """행 이터레이터를 앞에서부터 읽으며 '순위' 헤더를 찾고, 순위표가 끝나면(순위 빈칸) 바로 중단
+
+    반환: (헤더 위쪽 행 목록, 순위 헤더 행, 순위표 행 목록)
+    """
+    top_rows = []
+    header = None
+    body = []
+    last_r = -1
+    for r_idx, row in rows:
+        if header is None:
+            if r_idx < max_header_rows:
+                # 고정 좌표(I4 등)로 읽을 수 있도록 빠진 빈 행을 채워서 보관 (헤더 행번호 = len(top_rows))
+                while len(top_rows) < r_idx:
+                    top_rows.append([None] * len(row))
+            if clean_label(row[0]) == "순위":
+                header = row
+            elif r_idx < max_header_rows:
+                top_rows.append(row)
+            last_r = r_idx
+            continue
+
+        rank = None if is_blank(row[0]) else to_int(row[0])
+        if body and (r_idx != last_r + 1 or rank is None):
+            break
+        last_r = r_idx
+        if rank is not None:
+            body.append(row)
+    return top_rows, header, body
+
+
+def map_ranking_columns(header_row):
+    headers = [clean_label(x) for x in header_row]
+    columns = {}
+    for field, keywords in RANKING_COLUMNS.items():
+        columns[field] = -1
+        for kw in keywords:
+            for c_idx, h in enumerate(headers):
+                if kw in h:
+                    columns[field] = c_idx
+                    break
+            if columns[field] != -1:
+                break
+    return columns
+
+
+def extract_header_info(rows, positions=None):
+    """순위표 위쪽 영역에서 라벨 오른쪽 값을 읽어 헤더 정보 구성 (앞쪽 키워드 우선)
+
+    positions 에 dict 를 넘기면 찾은 필드의 [행, 라벨 열, 값 열] 좌표를 채움 (리비전 학습용)
+    """
+    found = {}
+    for r_idx, row in enumerate(rows):
+        for c_idx, cell in enumerate(row):
+            if not isinstance(cell, str):
+                continue
+            label = clean_label(cell)
+            if not label:
+                continue
+            for field, keywords in HEADER_FIELDS.items():
+                for k_idx, kw in enumerate(keywords):
+                    if not label.startswith(kw):
+                        continue
+                    if field in found and found[field][0] <= k_idx:
+                        break
+                    for v_idx in range(c_idx + 1, min(c_idx + 4, len(row))):
+                        val = row[v_idx]
+                        if val is not None and clean_label(val) != "":
+                            found[field] = (k_idx, val.strip() if isinstance(val, str) else val, [r_idx, c_idx, v_idx])
+                            break
+                    break
+
+    if positions is not None:
+        positions.update({field: found[field][2] for field in found})
+    info = {field: found[field][1] if field in found else None for field in HEADER_FIELDS}
+    for field in NUMERIC_FIELDS:
+        info[field] = to_float(info[field])
+    return info
+
+
+def read_schema_fields(schema, top_rows, header):
+    """등록된 리비전 좌표로 헤더 값/순위표 열을 바로 읽음 (라벨이 좌표와 안 맞으면 None)"""
+    if header is None or schema['header_row'] != len(top_rows):
+        return None
+    headers = [clean_label(x) for x in header]
+    for field, c_idx in schema['columns'].items():
+        if c_idx == -1:
+            continue
+        if c_idx >= len(headers) or not any(kw in headers[c_idx] for kw in RANKING_COLUMNS[field]):
+            return None
+
+    info = {field: None for field in HEADER_FIELDS}
+    for field, (r_idx, label_c, value_c) in schema['fields'].items():
+        row = top_rows[r_idx] if r_idx < len(top_rows) else []
+        if max(label_c, value_c) >= len(row) or not clean_label(row[label_c]).startswith(tuple(HEADER_FIELDS[field])):
+            return None
+        val = row[value_c]
+        if not is_blank(val):
+            info[field] = val.strip() if isinstance(val, str) else val
+    for field in NUMERIC_FIELDS:
+        info[field] = to_float(info[field])
+    return info, dict(schema['columns'])
+
+
+def extract_bids(rows, columns):
+    bids = []
+
+    def cell(row, field):
+        c_idx = columns.get(field, -1)
+        if c_idx == -1 or c_idx >= len(row):
+            return None
+        return row[c_idx]
+
+    for row in rows:
+        if not row:
+            continue
+        rank = to_int(row[0]) if not isinstance(row[0], str) or row[0].strip().isdigit() else None
+        if rank is None:
+            continue
+        company = cell(row, 'company')
+        if company is None or clean_label(company) in ("", "nan"):
+            continue
+        bids.append({
+            'rank': rank,
+            'company': str(company).strip(),
+            'amount': to_float(cell(row, 'amount')),
+            'yega_ratio': to_float(cell(row, 'yega_ratio')),
+            'base_ratio': to_float(cell(row, 'base_ratio')),
+            'price_score': to_float(cell(row, 'price_score')),
+            'deduct_score': to_float(cell(row, 'deduct_score')),
+            'priority': to_int(cell(row, 'priority')),
+        })
+    return bids
+
+
+def find_closing_date(rows, max_rows=HEADER_SCAN_ROWS):
+    """기초정보 시트의 입찰마감 일시 (R1 우선, 없으면 '입찰마감' 라벨 오른쪽)"""
+    for r_idx, row in rows:
+        if r_idx >= max_rows:
+            break
+        if r_idx == 0 and len(row) > 17 and not is_blank(row[17]):
+            return row[17]
+        for c_idx, cell in enumerate(row):
+            if clean_label(cell) == "입찰마감" and c_idx + 1 < len(row) and not is_blank(row[c_idx + 1]):
+                return row[c_idx + 1]
+    return None
+
+
+def read_workbook(path):
+    """워크북을 한 번만 열어 입찰결과 시트의 순위표와 기초정보 시트 앞부분만 읽음"""
+    with Workbook(path) as wb:
+        sheet = wb.main_sheet()
+        block = read_ranking_block(wb.rows(sheet, max_col=MAX_COLUMN))
+        closing_date = None
+        if '기초정보' in wb.sheet_names:
+            closing_date = find_closing_date(wb.rows('기초정보', max_col=MAX_COLUMN, stop=HEADER_SCAN_ROWS))
+    return sheet, block, closing_date
+
+
+def parse_tender(path, read_from=None):
+    """입찰결과 워크북 하나를 정규화된 레코드(헤더 정보 + 순위표)로 변환
+
+    read_from 을 주면 그 파일(로컬 미러 사본 등)을 읽고, 레코드의 경로/파일명은 path 기준
+    """
+    try:
+        sheet, (top_rows, header, body), closing_date = read_workbook(read_from or path)
+    except Exception as e:
+        e.bid_stage = 'decode'   # 격리 기록용 실패 단계 (bid_quarantine)
+        raise
+
+    # 알려진 리비전은 고정 좌표로 바로 읽고, 처음 보는 리비전만 키워드 검색 후 좌표 학습
+    revision = revision_of(path)
+    schema = get_schema(revision)
+    fixed = read_schema_fields(schema, top_rows, header) if schema else None
+    if fixed is not None:
+        info, columns = fixed
+        # 좌표를 배운 첫 파일에서 못 찾은 필드(값이 빈칸이었던 균형가격 등)는 키워드 검색으로 채우고 찾은 좌표를 더 배움
+        missing = [field for field in HEADER_FIELDS if field not in schema['fields']]
+        unmapped = [field for field, c_idx in columns.items() if c_idx == -1]
+        if missing or unmapped:
+            positions = {}
+            scanned = extract_header_info(top_rows, positions)
+            mapped = map_ranking_columns(header)
+            for field in missing:
+                info[field] = scanned[field]
+            for field in unmapped:
+                columns[field] = mapped[field]
+            fields = {field: positions[field] for field in missing if field in positions}
+            found = {field: mapped[field] for field in unmapped if mapped[field] != -1}
+            if fields or found:
+                learn_schema(revision, dict(schema, fields={**schema['fields'], **fields}, columns={**schema['columns'], **found}))
+    else:
+        positions = {}
+        info = extract_header_info(top_rows, positions)
+        columns = {field: -1 for field in RANKING_COLUMNS}
+        if header is not None:
+            columns = map_ranking_columns(header)
+            if revision and schema is None:
+                learn_schema(revision, {'header_row': len(top_rows), 'fields': positions, 'columns': columns})
+    info['입찰마감'] = closing_date
+
+    headers = []
+    bids = []
+    if header is not None:
+        headers = [clean_label(x) for x in header]
+        bids = extract_bids(body, columns)
+
+    return {
+        'path': os.path.abspath(path),
+        'file': os.path.basename(path),
+        'sheet': sheet,
+        'revision': revision,
+        'info': info,
+        'headers': headers,
+        'columns': columns,
+        'bids': bids,
+    }
+
+
+def cache_key(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def cache_file(path):
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, digest[:2], digest + '.pkl')
+
+
+def read_cached(path, key=None):
+    key = key or cache_key(path)
+    cf = cache_file(path)
+    if not os.path.exists(cf):
+        return None
+    try:
+        with open(cf, 'rb') as fh:
+            entry = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if entry.get('version') != CACHE_VERSION or entry.get('key') != key:
+        return None
+    return entry['record']
+
+
+def write_cached(path, record, key=None):
+    key = key or cache_key(path)
+    cf = cache_file(path)
+    os.makedirs(os.path.dirname(cf), exist_ok=True)
+    tmp = cf + '.tmp'
+    with open(tmp, 'wb') as fh:
+        pickle.dump({'version': CACHE_VERSION, 'key': key, 'record': record}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cf)
+
+
+def load_tender(path, use_cache=True, read_from=None):
+    """캐시된 레코드가 있으면 바로 반환, 없거나 파일이 바뀌었으면 파싱 후 저장"""
+    key = cache_key(path)
+    if use_cache:
+        record = read_cached(path, key)
+        if record is not None:
+            return record
+    record = parse_tender(path, read_from)
+    try:
+        write_cached(path, record, key)
+    except OSError as e:
+        print(f"캐시 저장 실패 ({os.path.basename(path)}): {e}")
+    return record
+
+
+def is_workbook(file_name, exts=EXCEL_EXTS):
+    return file_name.lower().endswith(exts) and not file_name.startswith('~')
+
+
+def list_workbooks(base_dir, exts=EXCEL_EXTS):
+    paths = []
+    for root, dirs, files in os.walk(base_dir):
+        for file in files:
+            if is_workbook(file, exts):
+                paths.append(os.path.join(root, file))
+    return paths
+
+
+def iter_tenders(paths, use_cache=True):
+    """워크북 경로 목록을 순서대로 (path, record) 로 반환 (실패 파일은 격리 후 건너뜀, 격리된 파일은 열지 않음)"""
+    from bid_quarantine import PARSE_STAGES, quarantined, quarantine, release, stage_of
+
+    for path in paths:
+        if quarantined(path):
+            continue
+        try:
+            record = load_tender(path, use_cache)
+        except Exception as e:
+            print(f"Skipping {os.path.basename(path)} (Error: {e})")
+            quarantine(path, stage_of(e), e)
+            continue
+        release(path, PARSE_STAGES)
+        yield path, record
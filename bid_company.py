@@ -0,0 +1,204 @@
+import re
+import hashlib
+from functools import lru_cache
+
+# 업체 차원: 업체명 표기("주식회사 대우건설", "대보건설(주)", "★ 동부건설 주식회사")를 정규화한 이름마다
+# 고정 정수 ID 를 부여하고 원본 표기는 별칭으로 저장 (입찰결과 DB 의 companies / company_aliases 테이블)
+# 분석 스크립트는 문자열을 매번 다듬는 대신 ID 로 묶고 비교함
+# 영문/약칭/옛 이름 표기는 CANONICAL_COMPANIES 로 대표 이름에 묶음 (적재할 때 한 번만 풀고 ID 로 저장)
+BADGES = ('★',)
+LEGAL_FORMS = ('주식회사', '(주)', '㈜')
+
+# 대표 업체명(한글 표기, 세력표 키와 같은 이름) -> 다른 표기 (정규화 후 대소문자 무시하고 정확히 같을 때만)
+# 표가 바뀌면(ALIAS_SIGNATURE) 입찰결과 DB 와 중복 지문 캐시를 다시 만듦 (이미 저장된 업체 ID/정규화 이름이 달라지므로)
+CANONICAL_COMPANIES = {
+    '에이치디씨현대산업개발': ['HDC현대산업개발', 'HDC', '에이치디씨', '현대산업개발'],
+    # 대림산업(2021년 분할 전 법인)은 별개 업체로 둠 (분할 전 실적/세력/중복 지문이 DL이앤씨로 합쳐지지 않도록)
+    '디엘이앤씨': ['DL이앤씨', 'DLE&C', '디엘이엔씨'],
+    '디엘건설': ['DL건설'],
+    '지에스건설': ['GS건설'],
+    '에이치제이중공업': ['HJ중공업', '한진중공업'],
+    '에이치엘디앤아이한라': ['HL디앤아이한라', '한라'],
+    '케이씨씨건설': ['KCC건설'],
+    '케이알산업': ['KR산업'],
+    '비에스한양': ['BS한양'],
+    '에스케이에코플랜트': ['SK에코플랜트', 'SK건설'],
+    '포스코이앤씨': ['POSCO이앤씨', '포스코건설'],
+    '한화': ['한화건설', '한화건설부문', '한화(건설부문)'],
+}
+
+_STRIP = re.compile('|'.join(re.escape(mark) for mark in BADGES + LEGAL_FORMS) + r'|\s+')
+
+
+def _normalize(raw):
+    return _STRIP.sub('', "" if raw is None else str(raw))
+
+
+ALIASES = {_normalize(variant).upper(): name
+           for name, variants in CANONICAL_COMPANIES.items() for variant in [name] + variants}
+ALIAS_SIGNATURE = hashlib.sha1(repr(sorted(ALIASES.items())).encode('utf-8')).hexdigest()
+
+
+def canonical_name(raw):
+    """업체명 정규화: 표시용 기호/법인 형태/공백 제거 후 별칭이면 대표 이름
+
+    "★ 동부건설 주식회사" -> "동부건설", "HDC현대산업개발(주)" -> "에이치디씨현대산업개발"
+    """
+    name = _normalize(raw)
+    return ALIASES.get(name.upper(), name)
+
+
+class CompanyDimension:
+    """업체명 <-> 고정 ID
+
+    conn 을 주면 그 연결의 트랜잭션 안에서 쓰고, 없으면 처음 필요할 때 db_file(기본: 입찰결과 DB)을
+    자동 커밋 연결로 엶. memory=True 면 DB 없이 프로세스 안에서만 유지
+    """
+
+    def __init__(self, conn=None, db_file=None, memory=False):
+        self.conn = conn
+        self.db_file = db_file
+        self.memory = memory
+        self.loaded = False
+        self.alias_ids = {}   # 원본 표기 -> ID
+        self.ids = {}         # 정규화 이름 -> ID
+        self.names = {}       # ID -> 정규화 이름
+
+    def _db(self):
+        if self.conn is None and not self.memory:
+            from bid_db import connect, DB_FILE
+            self.conn = connect(self.db_file or DB_FILE)
+            self.conn.isolation_level = None
+        if self.conn is not None and not self.loaded:
+            self.loaded = True
+            for company_id, name in self.conn.execute("SELECT id, name FROM companies"):
+                self.ids[name] = company_id
+                self.names[company_id] = name
+            for alias, company_id in self.conn.execute("SELECT alias, company_id FROM company_aliases"):
+                self.alias_ids[alias] = company_id
+        return self.conn
+
+    def __len__(self):
+        self._db()
+        return len(self.names)
+
+    def id_of(self, raw):
+        """원본 표기 -> 업체 ID (처음 보는 업체/표기면 등록)"""
+        raw = "" if raw is None else str(raw).strip()
+        company_id = self.alias_ids.get(raw)
+        if company_id is not None:
+            return company_id
+        conn = self._db()
+        company_id = self.alias_ids.get(raw)
+        if company_id is not None:
+            return company_id
+
+        name = canonical_name(raw)
+        company_id = self.ids.get(name)
+        if company_id is None:
+            if conn is not None:
+                conn.execute("INSERT OR IGNORE INTO companies(name) VALUES (?)", (name,))
+                company_id = conn.execute("SELECT id FROM companies WHERE name = ?", (name,)).fetchone()[0]
+            else:
+                company_id = len(self.names) + 1
+            self.ids[name] = company_id
+            self.names[company_id] = name
+        if conn is not None:
+            conn.execute("INSERT OR IGNORE INTO company_aliases(alias, company_id) VALUES (?, ?)", (raw, company_id))
+        self.alias_ids[raw] = company_id
+        return company_id
+
+    def name_of(self, company_id):
+        if company_id not in self.names:
+            # 다른 연결/프로세스가 나중에 등록한 업체
+            conn = self._db()
+            row = conn.execute("SELECT name FROM companies WHERE id = ?", (company_id,)).fetchone() if conn else None
+            if row is None:
+                raise KeyError(company_id)
+            self.ids[row[0]] = company_id
+            self.names[company_id] = row[0]
+        return self.names[company_id]
+
+    def resolve(self, name):
+        """업체명/별칭 -> 이미 등록된 업체 ID (처음 보는 업체면 등록하지 않고 None, DB 에 쓰지 않음)
+
+        조회/보고서 쪽은 id_of 대신 이것(또는 require)을 씀: id_of 는 적재(bid_db.register_companies) 전용
+        """
+        conn = self._db()
+        raw = "" if name is None else str(name).strip()
+        company_id = self.alias_ids.get(raw)
+        if company_id is None:
+            company_id = self.ids.get(canonical_name(raw))
+        if company_id is None and conn is not None:
+            # 다른 연결/프로세스(sync)가 나중에 등록한 업체
+            row = conn.execute("SELECT id FROM companies WHERE name = ?", (canonical_name(raw),)).fetchone()
+            if row is not None:
+                company_id = row[0]
+                self.ids[canonical_name(raw)] = company_id
+                self.names[company_id] = canonical_name(raw)
+        return company_id
+
+    def require(self, name):
+        """resolve 와 같지만 등록되지 않은 업체면 KeyError (업체명 오타가 빈 업체로 조회되지 않도록)"""
+        company_id = self.resolve(name)
+        if company_id is None:
+            raise KeyError(f"입찰결과 DB 에 없는 업체: {name} (업체명 확인 또는 bid_db.py 로 먼저 적재)")
+        return company_id
+
+    def token(self):
+        """업체 ID 를 발급한 DB 의 생성 토큰 (memory=True 면 None)"""
+        conn = self._db()
+        if conn is None:
+            return None
+        from bid_db import db_token
+        return db_token(conn)
+
+    def aliases(self, company_id):
+        self._db()
+        return sorted(alias for alias, cid in self.alias_ids.items() if cid == company_id)
+
+
+class CompanyIndex:
+    """업체 ID -> 값 사전을 정규화 이름으로 찾는 색인 (같은 업체 우선, 없으면 이름 부분 일치)
+
+    부분 일치: 키 이름이 찾는 이름에 들어 있거나 찾는 이름이 키 이름에 들어 있으면 (1글자 키 제외)
+    여러 개면 사전 순서가 앞선 키. 키 이름/키 이름의 모든 부분 문자열을 미리 해시로 만들어 두므로
+    찾는 비용은 사전 크기가 아니라 찾는 이름 길이에만 비례하고, 찾은 결과는 LRU 로 기억
+    """
+
+    def __init__(self, entries, companies=None, memo_size=4096):
+        self.companies = COMPANIES if companies is None else companies
+        self.entries = entries
+        self.values = list(entries.values())
+        self.exact = {}       # 키 이름 -> 첫 키 순서
+        self.substrings = {}  # 키 이름의 부분 문자열 -> 그 부분을 가진 첫 키 순서
+        for order, key_id in enumerate(entries):
+            name = self.companies.name_of(key_id)
+            if len(name) <= 1:
+                continue
+            self.exact.setdefault(name, order)
+            for i in range(len(name)):
+                for j in range(i + 1, len(name) + 1):
+                    self.substrings.setdefault(name[i:j], order)
+        self.lookup = lru_cache(maxsize=memo_size)(self._lookup)
+
+    def _lookup(self, company_id):
+        if company_id is None:
+            return None
+        target = self.companies.name_of(company_id)
+        if not target:
+            return None
+        if company_id in self.entries:
+            return self.entries[company_id]
+        # 찾는 이름이 키 이름 안에 있는 경우 + 키 이름이 찾는 이름 안에 있는 경우 중 앞선 키
+        best = self.substrings.get(target)
+        for i in range(len(target)):
+            for j in range(i + 2, len(target) + 1):
+                order = self.exact.get(target[i:j])
+                if order is not None and (best is None or order < best):
+                    best = order
+        return None if best is None else self.values[best]
+
+
+# 스크립트 공용 업체 차원 (입찰결과 DB 에 저장되므로 실행이 달라도 같은 ID)
+COMPANIES = CompanyDimension()
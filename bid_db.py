@@ -0,0 +1,245 @@
+import os
+import sys
+import json
+import uuid
+import sqlite3
+
+from bid_cache import CACHE_DIR, list_workbooks
+from bid_index import record_entry
+from bid_company import ALIAS_SIGNATURE, CompanyDimension
+from bid_model import Tender, tender_facts
+
+# 파싱된 입찰결과를 모아두는 로컬 SQLite 창고 (tenders / bids / companies / company_aliases)
+# tender_facts 는 입찰 건마다 한 행으로 미리 계산한 요약 (참여업체 수, 1순위, 하한선 등 + 헤더 값)
+# 스크립트는 폴더를 다시 훑는 대신 bid_query 로 바로 조회하고, 새 파일만 sync() 로 추가
+# WAL 모드라 감시 프로세스(bid_watch)가 쓰는 동안에도 보고서 스크립트가 읽을 수 있음
+DB_FILE = os.path.join(CACHE_DIR, 'bids.db')
+DB_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,         -- token: DB 를 만들 때마다 새로 발급 / aliases: 업체 별칭표 서명
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tenders (
+    id              INTEGER PRIMARY KEY,
+    path            TEXT NOT NULL UNIQUE,
+    file            TEXT NOT NULL,
+    size            INTEGER,
+    mtime_ns        INTEGER,
+    revision        TEXT,
+    title           TEXT,       -- 공사명
+    notice_no       TEXT,       -- 공고번호
+    client          TEXT,       -- 발주처
+    method          TEXT,       -- 낙찰자결정방법
+    decision        TEXT,       -- 결정방식
+    bid_date        TEXT,       -- 입찰일 'YYYY-MM-DD' (없으면 입찰마감/파일명 날짜)
+    base_amount     REAL,       -- 기초금액
+    estimated_price REAL,       -- 예정가격
+    balance_price   REAL,       -- 균형가격
+    has_ranking     INTEGER NOT NULL,
+    columns         TEXT NOT NULL   -- 순위표 열 매핑 (JSON)
+);
+CREATE TABLE IF NOT EXISTS companies (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE       -- 정규화한 업체명 (bid_company.canonical_name)
+);
+CREATE TABLE IF NOT EXISTS company_aliases (
+    alias      TEXT PRIMARY KEY,    -- 순위표에 적힌 원본 표기
+    company_id INTEGER NOT NULL REFERENCES companies(id)
+);
+CREATE TABLE IF NOT EXISTS bids (
+    tender_id    INTEGER NOT NULL REFERENCES tenders(id) ON DELETE CASCADE,
+    row          INTEGER NOT NULL,   -- 순위표 안의 행 순서
+    rank         INTEGER,
+    company_id   INTEGER NOT NULL REFERENCES companies(id),
+    amount       REAL,
+    yega_ratio   REAL,
+    base_ratio   REAL,
+    price_score  REAL,
+    deduct_score REAL,
+    priority     INTEGER,
+    PRIMARY KEY (tender_id, row)
+);
+CREATE TABLE IF NOT EXISTS tender_facts (
+    tender_id         INTEGER PRIMARY KEY REFERENCES tenders(id) ON DELETE CASCADE,
+    path              TEXT NOT NULL,
+    file              TEXT NOT NULL,
+    title             TEXT,
+    client            TEXT,
+    method            TEXT,
+    decision          TEXT,
+    bid_date          TEXT,
+    base_amount       REAL,
+    estimated_price   REAL,
+    balance_price     REAL,
+    bidder_count      INTEGER NOT NULL,  -- 참여업체 수 (회사명 열이 없으면 0)
+    winner_company_id INTEGER,           -- 우선순위 1 업체
+    winner_amount     INTEGER,
+    winner_base_ratio REAL,              -- 1순위 투찰율 (기초대비)
+    max_price_score   REAL,
+    limit_yega        REAL,              -- 하한선: 가격점수 만점 + 감점 0 중 최저 예가대비(%)
+    limit_company_id  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_bids_company ON bids(company_id, tender_id);
+CREATE INDEX IF NOT EXISTS idx_tenders_date ON tenders(bid_date);
+CREATE INDEX IF NOT EXISTS idx_tenders_client ON tenders(client);
+CREATE INDEX IF NOT EXISTS idx_tenders_method ON tenders(method);
+CREATE INDEX IF NOT EXISTS idx_facts_path ON tender_facts(path);
+CREATE INDEX IF NOT EXISTS idx_facts_date ON tender_facts(bid_date);
+"""
+
+
+def connect(db_file=DB_FILE):
+    """창고 DB 연결 (처음이면 테이블 생성, 버전이나 업체 별칭표가 다르면 비우고 다시 만듦)"""
+    os.makedirs(os.path.dirname(db_file), exist_ok=True)
+    conn = sqlite3.connect(db_file, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != DB_VERSION or _meta(conn, 'aliases') != ALIAS_SIGNATURE:
+        with conn:
+            for table in ('tender_facts', 'bids', 'company_aliases', 'companies', 'tenders', 'meta'):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(SCHEMA)
+            conn.executemany("INSERT INTO meta(key, value) VALUES (?, ?)",
+                             [('token', uuid.uuid4().hex), ('aliases', ALIAS_SIGNATURE)])
+            conn.execute(f"PRAGMA user_version={DB_VERSION}")
+    return conn
+
+
+def _meta(conn, key):
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def db_token(conn):
+    """DB 를 새로 만들 때마다 바뀌는 값: 업체 ID 를 DB 밖에 저장하는 캐시(스케치, 아카이브)가 ID 재발급을 알아채는 용도"""
+    return _meta(conn, 'token')
+
+
+def _text(val):
+    return None if val is None else (str(val).strip() or None)
+
+
+def _number(val):
+    try:
+        return None if val is None else float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def register_companies(record, companies):
+    """레코드 순위표의 업체 표기를 업체 차원에 등록하고 행마다 업체 ID 반환 (적재 전용, 조회 쪽은 resolve)"""
+    return [companies.id_of(bid['company']) for bid in record['bids']]
+
+
+def store_record(conn, record, stat=None, companies=None):
+    """파싱 레코드 하나를 저장 (같은 경로가 있으면 교체), 트랜잭션은 호출하는 쪽에서 관리
+
+    업체는 정규화한 업체 ID 로 저장하고 원본 표기는 별칭 테이블에 남김
+    """
+    if companies is None:
+        companies = CompanyDimension(conn)
+    path = record['path']
+    if stat is None:
+        try:
+            st = os.stat(path)
+            stat = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stat = (None, None)
+    info = record['info']
+    conn.execute("DELETE FROM tenders WHERE path = ?", (path,))
+    tender_id = conn.execute(
+        "INSERT INTO tenders(path, file, size, mtime_ns, revision, title, notice_no, client, method, decision,"
+        " bid_date, base_amount, estimated_price, balance_price, has_ranking, columns)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (path, record['file'], stat[0], stat[1], record.get('revision'),
+         _text(info.get('공사명')), _text(info.get('공고번호')), _text(info.get('발주처')),
+         _text(info.get('낙찰자결정방법')), _text(info.get('결정방식')), record_entry(path, record)['date'],
+         _number(info.get('기초금액')), _number(info.get('예정가격')), _number(info.get('균형가격')),
+         1 if record['headers'] else 0, json.dumps(record['columns'])),
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO bids(tender_id, row, rank, company_id, amount, yega_ratio, base_ratio, price_score, deduct_score, priority)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(tender_id, i, bid['rank'], company_id, bid['amount'], bid['yega_ratio'],
+          bid['base_ratio'], bid['price_score'], bid['deduct_score'], bid['priority'])
+         for i, (bid, company_id) in enumerate(zip(record['bids'], register_companies(record, companies)))],
+    )
+
+    # 입찰 건 요약(사실 테이블)도 같이 갱신
+    facts = tender_facts(Tender.from_record(record, companies), record['columns']['company'] != -1)
+    header = conn.execute(
+        "SELECT path, file, title, client, method, decision, bid_date, base_amount, estimated_price, balance_price"
+        " FROM tenders WHERE id = ?", (tender_id,)).fetchone()
+    row = dict(header, tender_id=tender_id, **facts)
+    conn.execute(f"INSERT INTO tender_facts({', '.join(row)}) VALUES ({', '.join('?' * len(row))})", list(row.values()))
+    return tender_id
+
+
+def sync(conn, paths, jobs=1, base_dir=None):
+    """paths 중 DB 에 없거나 크기/수정시각이 바뀐 파일만 파싱해서 저장
+
+    base_dir 을 주면 그 폴더 아래에서 지워진 파일의 행도 삭제
+    """
+    from bid_pool import load_tenders
+
+    known = {row['path']: (row['size'], row['mtime_ns']) for row in conn.execute("SELECT path, size, mtime_ns FROM tenders")}
+    stale = []
+    stats = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        abs_path = os.path.abspath(path)
+        stats[abs_path] = (st.st_size, st.st_mtime_ns)
+        if known.get(abs_path) != stats[abs_path]:
+            stale.append(path)
+
+    removed = []
+    if base_dir is not None:
+        prefix = os.path.join(os.path.abspath(base_dir), '')
+        removed = [p for p in known if p.startswith(prefix) and not os.path.exists(p)]
+
+    stored = 0
+    companies = CompanyDimension(conn)
+    with conn:
+        for path, record in load_tenders(stale, jobs):
+            if record is None:
+                continue
+            store_record(conn, record, stats[os.path.abspath(path)], companies)
+            stored += 1
+        for path in removed:
+            conn.execute("DELETE FROM tenders WHERE path = ?", (path,))
+    if stored or removed:
+        print(f"DB 동기화: {stored}개 저장, {len(removed)}개 삭제 (변경 없음 {len(stats) - len(stale)}개)")
+    return stored, len(removed)
+
+
+def sync_folder(base_dir, exts=None, jobs=1, db_file=DB_FILE):
+    """폴더 전체를 DB 와 맞춘 뒤 연결 반환"""
+    conn = connect(db_file)
+    paths = list_workbooks(base_dir) if exts is None else list_workbooks(base_dir, exts)
+    sync(conn, paths, jobs, base_dir)
+    return conn
+
+
+if __name__ == "__main__":
+    from bid_pool import parse_jobs
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    jobs, args = parse_jobs()
+    if not args:
+        print("Usage: python bid_db.py <입찰결과 폴더> [폴더 ...] [-j N]")
+        sys.exit(1)
+    for base_dir in args:
+        sync_folder(base_dir, jobs=jobs).close()
+    conn = connect()
+    counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ('tenders', 'bids', 'companies')]
+    print(f"{DB_FILE}: 입찰 {counts[0]}건, 투찰 {counts[1]}건, 업체 {counts[2]}개")
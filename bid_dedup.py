@@ -0,0 +1,147 @@
+import os
+import re
+import sys
+import json
+import hashlib
+
+from bid_cache import CACHE_DIR, list_workbooks
+from bid_company import ALIAS_SIGNATURE, canonical_name
+from bid_manifest import file_hash
+from bid_schema import revision_of
+
+# 같은 입찰 건이 여러 폴더(24년이후 / 종심제,종평제 / 불참공사)와 여러 리비전(_Rev.N4.10, N4.12 ...)으로
+# 중복 저장되는 문제: 순위표(업체+입찰금액 정렬)와 공고번호로 지문을 만들어 같은 건은 최신 리비전 하나만 남김
+# 지문은 파일 경로(크기/수정시각)와 내용 해시로 캐시 -> 한 번 본 파일/사본은 다시 파싱하지 않고 중복 판정
+# 어떤 파일이 어떤 파일 때문에 빠졌는지(출처)는 FINGERPRINT_FILE 의 groups 에 기록
+# 지문에 정규화 업체명이 들어가므로 업체 별칭표가 바뀌면 캐시를 비우고 다시 계산
+FINGERPRINT_FILE = os.path.join(CACHE_DIR, 'fingerprints.json')
+
+
+def fingerprint(record):
+    """순위표 지문: 공고번호 + (정규화 업체명, 입찰금액) 정렬 목록의 sha1 (투찰 행이 없으면 None)"""
+    pairs = sorted((canonical_name(bid['company']), int(round(bid['amount'])))
+                   for bid in record['bids'] if bid['amount'] is not None)
+    if not pairs:
+        return None
+    h = hashlib.sha1(str(record['info'].get('공고번호') or '').strip().encode('utf-8'))
+    for company, amount in pairs:
+        h.update(f"\x00{company}\x01{amount}".encode('utf-8'))
+    return h.hexdigest()
+
+
+def revision_key(revision):
+    """리비전 비교용 키 ('N4.12' -> ('N', (4, 12)), 리비전 없는 파일이 가장 오래된 것으로 취급)"""
+    if not revision:
+        return ('', ())
+    match = re.match(r'([A-Z]*)(.*)$', revision.upper())
+    return match.group(1), tuple(int(n) for n in re.findall(r'\d+', match.group(2)))
+
+
+def load_index(index_file=FINGERPRINT_FILE):
+    try:
+        with open(index_file, 'r', encoding='utf-8') as fh:
+            index = json.load(fh)
+    except (OSError, ValueError):
+        index = {}
+    if index.get('aliases') != ALIAS_SIGNATURE:
+        index = {'aliases': ALIAS_SIGNATURE}
+    for section in ('files', 'hashes', 'groups'):
+        index.setdefault(section, {})
+    return index
+
+
+def save_index(index, index_file=FINGERPRINT_FILE):
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    tmp = index_file + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(index, fh, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, index_file)
+
+
+def dedup_paths(paths, jobs=1, index_file=FINGERPRINT_FILE):
+    """같은 입찰 건의 중복 파일을 빼고 최신 리비전만 남김
+
+    지문이 캐시에 없는 파일만 파싱 (같은 내용의 사본은 해시로 바로 확인), 지문이 없는 파일(순위표 없음/파싱 실패)은 그대로 유지
+    반환: (남길 경로 목록 - 입력 순서 유지, {빠진 경로: 대신 남긴 경로})
+    """
+    from bid_pool import load_tenders
+
+    index = load_index(index_file)
+    files, hashes = index['files'], index['hashes']
+    unknown = []
+    for path in paths:
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entry = files.get(key)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            continue
+        try:
+            digest = file_hash(path)
+        except OSError:
+            continue
+        entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': digest, 'revision': revision_of(path)}
+        if digest in hashes:
+            # 다른 폴더에 복사된 같은 파일: 열지 않고 지문 재사용
+            files[key] = dict(entry, fingerprint=hashes[digest])
+        else:
+            unknown.append((path, entry))
+
+    if unknown:
+        print(f"중복 확인: 새 파일 {len(unknown)}개 지문 계산")
+        for (path, record), (_, entry) in zip(load_tenders([p for p, _ in unknown], jobs), unknown):
+            if record is None:
+                continue
+            entry['fingerprint'] = fingerprint(record)
+            files[os.path.abspath(path)] = entry
+            hashes[entry['hash']] = entry['fingerprint']
+
+    groups = {}
+    for path in paths:
+        entry = files.get(os.path.abspath(path))
+        if entry and entry['fingerprint']:
+            groups.setdefault(entry['fingerprint'], []).append(path)
+
+    duplicates = {}
+    for fp, members in groups.items():
+        if len(members) < 2:
+            continue
+        newest = max(members, key=lambda p: (revision_key(files[os.path.abspath(p)]['revision']),
+                                             files[os.path.abspath(p)]['mtime_ns']))
+        dropped = [p for p in members if p != newest]
+        for path in dropped:
+            duplicates[path] = newest
+        index['groups'][fp] = {'kept': os.path.abspath(newest), 'duplicates': sorted(os.path.abspath(p) for p in dropped)}
+
+    save_index(index, index_file)
+    if duplicates:
+        print(f"중복 입찰결과 {len(duplicates)}개 제외 (최신 리비전 {len(set(duplicates.values()))}개 유지)")
+    return [p for p in paths if p not in duplicates], duplicates
+
+
+def provenance(path, index_file=FINGERPRINT_FILE):
+    """파일이 속한 중복 묶음 {'kept', 'duplicates'} (중복이 없었으면 None)"""
+    index = load_index(index_file)
+    entry = index['files'].get(os.path.abspath(path))
+    if not entry or not entry['fingerprint']:
+        return None
+    return index['groups'].get(entry['fingerprint'])
+
+
+if __name__ == "__main__":
+    from bid_pool import parse_jobs
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    jobs, args = parse_jobs()
+    if not args:
+        print("Usage: python bid_dedup.py <입찰결과 폴더> [폴더 ...] [-j N]")
+        sys.exit(1)
+    paths = []
+    for base_dir in args:
+        paths += list_workbooks(base_dir)
+    kept, duplicates = dedup_paths(paths, jobs)
+    for dup, newest in sorted(duplicates.items()):
+        print(f"{os.path.basename(dup)}\n  -> {newest}")
+    print(f"전체 {len(paths)}개 중 {len(kept)}개 유지, {len(duplicates)}개 중복")
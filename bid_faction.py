@@ -0,0 +1,116 @@
+import bisect
+from collections import deque
+
+from bid_company import COMPANIES, canonical_name
+
+# 업체 세력(조) 구분: 정규화한 업체명에 세력 업체명이 들어 있으면 그 세력
+FACTIONS = {
+    '경남기업': '우리(주황)', '극동건설': '우리(주황)', '남광토건': '우리(주황)',
+    '삼환기업': '우리(주황)', '쌍용건설': '우리(주황)', '에이치엘디앤아이한라': '우리(주황)', '호반산업': '우리(주황)',
+    '계룡건설산업': '개(그린)', '동양건설산업': '개(그린)', '디엘이앤씨': '개(그린)',
+    '케이씨씨건설': '개(그린)', '케이알산업': '개(그린)', '코오롱글로벌': '개(그린)',
+    '태영건설': '개(그린)', '현대건설': '개(그린)',
+    '금호건설': '원숭이(하늘)', '대우건설': '원숭이(하늘)', '동부건설': '원숭이(하늘)',
+    '두산건설': '원숭이(하늘)', '롯데건설': '원숭이(하늘)', '비에스한양': '원숭이(하늘)',
+    '한양': '원숭이(하늘)', '에이치제이중공업': '원숭이(하늘)', '지에스건설': '원숭이(하늘)',
+    '대보건설': '무소속(흰색)', '디엘건설': '무소속(흰색)', '에이치디씨현대산업개발': '무소속(흰색)', '한화': '무소속(흰색)',
+}
+
+
+class FactionMatcher:
+    """세력 업체명 사전으로 한 번 만든 Aho-Corasick 자동자
+
+    업체명(들)을 한 번 훑으면서 들어 있는 세력 업체명을 모두 찾음 (사전 크기와 무관하게 글자 수에 비례)
+    여러 키가 들어 있으면 사전 순서가 앞선 키 ('비에스한양' > '한양')
+    """
+
+    def __init__(self, factions):
+        self.keys = list(factions)
+        self.factions = factions
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]     # 상태 -> 이 상태에서 끝나는 키 번호 (fail 경로 포함)
+        for idx, key in enumerate(self.keys):
+            state = 0
+            for ch in key:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(idx)
+        # 너비 우선으로 실패 링크 연결 (루트 바로 아래 상태는 루트로)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text):
+        """text 에서 찾은 (끝 위치, 키 번호) 목록"""
+        hits = []
+        state = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                hits.append((pos, idx))
+        return hits
+
+    def match_many(self, names, sep='\n'):
+        """업체명 목록을 구분자로 이어 한 번에 훑음 -> 업체명마다 (세력 업체명, 세력) 또는 (None, None)"""
+        best = [None] * len(names)
+        starts = []
+        offset = 0
+        for name in names:
+            starts.append(offset)
+            offset += len(name) + len(sep)
+        for pos, idx in self.scan(sep.join(names)):
+            i = bisect.bisect_right(starts, pos) - 1
+            if best[i] is None or idx < best[i]:
+                best[i] = idx
+        return [(self.keys[idx], self.factions[self.keys[idx]]) if idx is not None else (None, None) for idx in best]
+
+
+MATCHER = FactionMatcher(FACTIONS)
+
+
+def match_faction(company):
+    return MATCHER.match_many([company.replace(' ', '')])[0]
+
+
+FACTION_CACHE = {}
+
+
+def faction_of(company_id):
+    """업체 ID -> (세력 업체명, 세력) (업체마다 한 번만 이름 비교)"""
+    if company_id not in FACTION_CACHE:
+        FACTION_CACHE[company_id] = match_faction(COMPANIES.name_of(company_id))
+    return FACTION_CACHE[company_id]
+
+
+NAME_CACHE = {}
+
+
+def tag_bids(bids):
+    """순위표 투찰 행 -> 행마다 (정규화 업체명, 세력 업체명, 세력)
+
+    처음 보는 업체명만 모아 자동자로 한 번 훑고, 이후에는 정규화 이름 캐시로 바로 찾음 (업체 DB 에 쓰지 않음)
+    """
+    names = [canonical_name(bid['company']) for bid in bids]
+    new = [name for name in dict.fromkeys(names) if name not in NAME_CACHE]
+    if new:
+        for name, hit in zip(new, MATCHER.match_many(new)):
+            NAME_CACHE[name] = hit
+    return [(name,) + NAME_CACHE[name] for name in names]
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from bid_cache import CACHE_DIR, cache_key, list_workbooks
+from bid_workbook import Workbook, pick_main_sheet
+
+# 시트 전체 셀 격자 스냅샷: 워크북을 한 번 디코딩한 뒤 시트마다 Arrow IPC 파일로 저장하고
+# 이후에는 메모리 맵으로 열어 필요한 셀만 읽음 (xlsb 디코딩 없음, 파일 전체를 메모리에 올리지 않음)
+# 새 열(상위차이, 균형가격 포함여부, 수주확률 등)을 뽑거나 디버그할 때 bid_cache 의 순위표 레코드 대신 사용
+# 열 c 는 숫자 값 n{c}(float64) 와 문자열 값 s{c} 두 열로 저장 (날짜/시각은 문자열로)
+GRID_DIR = os.path.join(CACHE_DIR, 'grid')
+GRID_VERSION = 1
+
+
+def grid_dir(path):
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(GRID_DIR, digest[:2], digest)
+
+
+def _meta_file(path):
+    return os.path.join(grid_dir(path), 'meta.json')
+
+
+def _read_meta(path, key=None):
+    """스냅샷 정보 (워크북이 바뀌었거나 없으면 None)"""
+    key = key or cache_key(path)
+    try:
+        with open(_meta_file(path), 'r', encoding='utf-8') as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != GRID_VERSION or meta.get('key') != [key[1], key[2]]:
+        return None
+    return meta
+
+
+def _cell_pair(value):
+    if value is None or isinstance(value, str) and value == '':
+        return None, None
+    if isinstance(value, bool):
+        return float(value), None
+    if isinstance(value, (int, float)):
+        return (None, None) if value != value else (float(value), None)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return None, value.isoformat()
+    return None, str(value)
+
+
+def _to_table(rows):
+    """(행번호, 값 목록) -> 빈 행까지 채운 Arrow 테이블"""
+    rows = list(rows)
+    nrows = rows[-1][0] + 1 if rows else 0
+    ncols = max((len(values) for _, values in rows), default=0)
+    nums = [[None] * nrows for _ in range(ncols)]
+    texts = [[None] * nrows for _ in range(ncols)]
+    for r_idx, values in rows:
+        for c_idx, value in enumerate(values):
+            if value is not None:
+                nums[c_idx][r_idx], texts[c_idx][r_idx] = _cell_pair(value)
+    arrays, names = [], []
+    for c_idx in range(ncols):
+        arrays += [pa.array(nums[c_idx], pa.float64()), pa.array(texts[c_idx], pa.string())]
+        names += [f"n{c_idx}", f"s{c_idx}"]
+    return pa.table(arrays, names=names)
+
+
+def build_snapshot(path, key=None):
+    """워크북의 모든 시트를 한 번에 디코딩해서 스냅샷 저장 (기존 스냅샷은 교체)"""
+    key = key or cache_key(path)
+    target = grid_dir(path)
+    tmp = target + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    with Workbook(path) as wb:
+        sheets = list(wb.sheet_names)
+        for i, sheet in enumerate(sheets):
+            table = _to_table(wb.rows(sheet))
+            with pa.OSFile(os.path.join(tmp, f"{i}.arrow"), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+    meta = {'version': GRID_VERSION, 'key': [key[1], key[2]], 'path': os.path.abspath(path), 'sheets': sheets}
+    with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as fh:
+        json.dump(meta, fh, ensure_ascii=False)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    return meta
+
+
+def snapshot(path, rebuild=False):
+    """스냅샷 정보 반환 (없거나 워크북이 바뀌었으면 새로 만듦)"""
+    key = cache_key(path)
+    meta = None if rebuild else _read_meta(path, key)
+    return meta or build_snapshot(path, key)
+
+
+class Grid:
+    """메모리 맵으로 연 시트 격자 (행/열 번호는 0 기준, pd.read_excel(header=None) 과 같은 좌표)
+
+    다 쓰면 close() 또는 with 문으로 메모리 맵을 닫음 (열린 동안은 Windows 에서 스냅샷을 다시 만들 수 없음)
+        with load_grid(path) as grid: ...
+    """
+
+    def __init__(self, table, path, sheet, source=None):
+        self.table = table
+        self.path = path
+        self.sheet = sheet
+        self.source = source
+        self.nrows = table.num_rows
+        self.ncols = table.num_columns // 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        # 테이블 버퍼가 매핑을 잡고 있으므로 테이블도 같이 놓아야 실제로 해제됨
+        self.table = None
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+    def cell(self, r, c):
+        if r >= self.nrows or c >= self.ncols:
+            return None
+        num = self.table.column(2 * c)[r].as_py()
+        return num if num is not None else self.table.column(2 * c + 1)[r].as_py()
+
+    def row(self, r):
+        return [self.cell(r, c) for c in range(self.ncols)]
+
+    def column(self, c, start=0, stop=None):
+        """열 값 목록 (숫자 우선, 없으면 문자열, 빈칸 None)"""
+        if c >= self.ncols:
+            return [None] * (len(range(self.nrows)[start:stop]))
+        nums = self.table.column(2 * c).slice(start, None if stop is None else stop - start).to_pylist()
+        texts = self.table.column(2 * c + 1).slice(start, None if stop is None else stop - start).to_pylist()
+        return [n if n is not None else t for n, t in zip(nums, texts)]
+
+    def frame(self, header=None):
+        """DataFrame 으로 변환 (header 에 행번호를 주면 그 행을 열 이름으로 쓰고 다음 행부터 데이터)
+
+        셀 값을 파이썬 객체로 복사해서 만드는 사본 (메모리 맵을 공유하지 않으므로 close() 후에도 사용 가능)
+        """
+        df = pd.DataFrame({c: self.column(c) for c in range(self.ncols)}, index=range(self.nrows)).infer_objects()
+        if header is not None:
+            df.columns = [c if v is None else v for c, v in zip(df.columns, df.iloc[header])]
+            df = df.iloc[header + 1:].reset_index(drop=True).infer_objects()
+        return df
+
+
+def sheet_names(path):
+    return snapshot(path)['sheets']
+
+
+def load_grid(path, sheet=None, rebuild=False):
+    """시트 격자 열기: sheet 는 이름 또는 순서(0 기준), None 이면 입찰결과 시트 (with 문으로 닫기)"""
+    meta = snapshot(path, rebuild)
+    sheets = meta['sheets']
+    if sheet is None:
+        sheet = pick_main_sheet(sheets)
+    idx = sheet if isinstance(sheet, int) else sheets.index(sheet) if sheet in sheets else None
+    if idx is None:
+        raise KeyError(f"시트 없음: {sheet}")
+    source = pa.memory_map(os.path.join(grid_dir(path), f"{idx}.arrow"), 'r')
+    try:
+        table = pa.ipc.open_file(source).read_all()
+    except Exception:
+        source.close()
+        raise
+    return Grid(table, path, sheets[idx], source)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    rebuild = '--rebuild' in sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a != '--rebuild']
+    if not args:
+        print("Usage: python bid_grid.py <입찰결과 폴더> [폴더 ...] [--rebuild]")
+        sys.exit(1)
+    built = failed = 0
+    for base_dir in args:
+        for path in list_workbooks(base_dir):
+            try:
+                key = cache_key(path)
+                if rebuild or _read_meta(path, key) is None:
+                    build_snapshot(path, key)
+                    built += 1
+            except Exception as e:
+                failed += 1
+                print(f"Skipping {os.path.basename(path)} (Error: {e})")
+    print(f"스냅샷 {built}개 생성, 실패 {failed}개 ({GRID_DIR})")
@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+from bid_cache import CACHE_DIR
+from bid_manifest import file_hash
+
+# 조모임 워크북(업체명 셀 배경색 = 조) 읽기: openpyxl 로 워크북 전체를 올리는 대신 xlsx(zip) 안의
+# xl/styles.xml(채우기/셀 서식)과 활성 시트 XML 을 스트리밍으로 읽어 테마 색 채우기가 있는 문자열 셀만 뽑음
+# 결과(시트 순서의 [업체명, 'Theme_N'] 목록)는 파일 내용 해시로 캐시 -> 파일이 바뀔 때만 다시 읽음
+# 테마 번호는 openpyxl 의 cell.fill.start_color(patternFill fgColor) 와 같은 값
+GROUP_CACHE = os.path.join(CACHE_DIR, 'groups.json')
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _children(elem, name):
+    return [child for child in elem if _local(child.tag) == name]
+
+
+def _rel_target(base, target):
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+
+
+def _active_sheet_part(zf):
+    """활성 시트(openpyxl 의 wb.active)의 zip 안 경로"""
+    root = ET.fromstring(zf.read('xl/workbook.xml'))
+    active = 0
+    sheets = []
+    for elem in root.iter():
+        name = _local(elem.tag)
+        if name == 'workbookView':
+            active = int(elem.get('activeTab', 0))
+        elif name == 'sheet':
+            sheets.append(next(v for k, v in elem.attrib.items() if _local(k) == 'id'))
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+    return _rel_target('xl/workbook.xml', targets[sheets[min(active, len(sheets) - 1)]])
+
+
+def _fill_themes(zf):
+    """셀 서식 번호(s) -> 채우기 전경색 테마 번호 (테마 색이 아니면 None)"""
+    try:
+        root = ET.fromstring(zf.read('xl/styles.xml'))
+    except KeyError:
+        return {}
+    fill_themes, xf_fills = [], []
+    for section in root:
+        if _local(section.tag) == 'fills':
+            for fill in _children(section, 'fill'):
+                theme = None
+                for pattern in _children(fill, 'patternFill'):
+                    for fg in _children(pattern, 'fgColor'):
+                        theme = fg.get('theme')
+                fill_themes.append(None if theme is None else int(theme))
+        elif _local(section.tag) == 'cellXfs':
+            xf_fills = [int(xf.get('fillId', 0)) for xf in _children(section, 'xf')]
+    return {s: fill_themes[fill_id] if fill_id < len(fill_themes) else None for s, fill_id in enumerate(xf_fills)}
+
+
+def _text(elem):
+    # 서식 있는 텍스트(r/t)는 이어 붙이고, 윗주(rPh)는 제외
+    parts = []
+    for child in elem:
+        if _local(child.tag) == 't':
+            parts.append(child.text or '')
+        elif _local(child.tag) == 'r':
+            parts += [t.text or '' for t in _children(child, 't')]
+    return ''.join(parts)
+
+
+def _shared_strings(zf):
+    try:
+        source = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with source:
+        for _, elem in ET.iterparse(source):
+            if _local(elem.tag) == 'si':
+                strings.append(_text(elem))
+                elem.clear()
+    return strings
+
+
+def themed_cells(path):
+    """활성 시트에서 테마 색 채우기가 있는 문자열 셀 -> [(값, 'Theme_N'), ...] (시트 순서)
+
+    문자열 셀: 공유 문자열(s), 수식 결과 문자열(str), 셀 안 문자열(inlineStr), 오류 값(e, openpyxl 과 같이 '#N/A' 등)
+    """
+    cells = []
+    with zipfile.ZipFile(path) as zf:
+        themes = _fill_themes(zf)
+        strings = None
+        with zf.open(_active_sheet_part(zf)) as source:
+            for _, elem in ET.iterparse(source):
+                name = _local(elem.tag)
+                if name == 'row':
+                    elem.clear()
+                if name != 'c':
+                    continue
+                theme = themes.get(int(elem.get('s', 0)))
+                kind = elem.get('t')
+                if theme is not None and kind in ('s', 'str', 'inlineStr', 'e'):
+                    if kind == 'inlineStr':
+                        value = ''.join(_text(child) for child in elem if _local(child.tag) == 'is')
+                    else:
+                        value = next((v.text for v in elem if _local(v.tag) == 'v'), None)
+                        if kind == 's' and value is not None:
+                            if strings is None:
+                                strings = _shared_strings(zf)
+                            value = strings[int(value)]
+                    if value:
+                        cells.append((value, f"Theme_{theme}"))
+                elem.clear()
+    return cells
+
+
+def _read_cache():
+    try:
+        with open(GROUP_CACHE, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_groups(path, group_keys=None):
+    """조모임 워크북 -> [(업체명, 그룹 키 'Theme_N'), ...] (group_keys 를 주면 그 그룹만)
+
+    크기/수정시각이 같거나 내용 해시가 같으면 캐시 사용, 바뀐 파일만 다시 읽음
+    """
+    key = os.path.abspath(path)
+    st = os.stat(path)
+    cache = _read_cache()
+    entry = cache.get(key)
+    if not (entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns):
+        digest = file_hash(path)
+        if not (entry and entry['hash'] == digest):
+            entry = {'hash': digest, 'cells': themed_cells(path)}
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        cache[key] = entry
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = GROUP_CACHE + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(cache, fh, ensure_ascii=False, indent=1)
+        os.replace(tmp, GROUP_CACHE)
+    return [(name, group) for name, group in entry['cells'] if group_keys is None or group in group_keys]
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    if len(sys.argv) < 2:
+        print("Usage: python bid_groups.py <조모임 워크북.xlsx>")
+        sys.exit(1)
+    groups = {}
+    for name, group in load_groups(sys.argv[1]):
+        groups.setdefault(group, []).append(name)
+    for group, names in sorted(groups.items()):
+        print(f"{group} ({len(names)}): {', '.join(names)}")
@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import argparse
+
+from bid_cache import read_cached, parse_bid_date
+
+# 파일을 열기 전에 파일명/폴더/캐시된 헤더만으로 걸러내는 인덱스
+# - 날짜: 파일명 YYMMDD ("입찰결과 - 260113 ..."), 캐시된 입찰일, 폴더 연도 ("2023", "2020전")
+# - 방식: 파일명 괄호 "(종심-고)", "(종평)", "(간이종심)"
+# - 발주처: 캐시된 헤더의 발주처 (파일명 "[한전]" 같은 약칭은 이름이 달라 사용하지 않음)
+# 값을 모르는 조건은 통과시키고(파일을 열어서 확인), 확실히 벗어나는 파일만 제외
+METHODS = ['간이종심', '종심', '종평']
+# 헤더 낙찰자결정방법 값 -> 방식 (파일을 연 뒤 확인용, 앞쪽 우선)
+HEADER_METHODS = [('간이', '간이종심'), ('종합심사', '종심'), ('종합평가', '종평')]
+
+
+def period_end(until):
+    """--until 값을 그 기간의 마지막 날짜 문자열로: '2024' -> '2024-12-31', '2024-06' -> '2024-06-31'
+
+    입찰일은 'YYYY-MM-DD' 문자열로 비교하므로 월말은 항상 31 로 둬도 됨 (날짜 전체를 주면 그대로)
+    """
+    if not until:
+        return until
+    until = str(until).strip()
+    if re.fullmatch(r'\d{4}', until):
+        return until + '-12-31'
+    if re.fullmatch(r'\d{4}-\d{2}', until):
+        return until + '-31'
+    return until
+
+
+def parse_filters(argv=None, since=None, until=None):
+    """공통 --since/--until/--method/--client 옵션 파싱 (나머지 인자는 그대로 반환)
+
+    --since/--until 은 'YYYY', 'YYYY-MM', 'YYYY-MM-DD' 모두 가능 (--until 2024 는 2024-12-31 까지)
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--since', default=since)
+    parser.add_argument('--until', default=until)
+    parser.add_argument('--method', action='append', dest='methods')
+    parser.add_argument('--client', action='append', dest='clients')
+    args, rest = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    args.until = period_end(args.until)
+    return vars(args), rest
+
+
+def filename_date(file_name):
+    """파일명 앞쪽 YYMMDD -> 'YYYY-MM-DD' (없거나 날짜가 아니면 None)"""
+    name = re.sub(r'^입찰결과\s*-\s*', '', file_name)
+    match = re.match(r'(\d{2})(\d{2})(\d{2})(?!\d)', name)
+    if not match:
+        return None
+    yy, mm, dd = (int(x) for x in match.groups())
+    if not (1 <= mm <= 12 and 1 <= dd <= 31):
+        return None
+    year = 2000 + yy if yy < 50 else 1900 + yy
+    return f"{year}-{mm:02d}-{dd:02d}"
+
+
+def folder_years(path):
+    """경로의 연도 폴더 -> (최소 연도, 최대 연도), '2020전' 은 2019 이하 (연도 폴더 없으면 None)"""
+    for part in reversed(os.path.normpath(os.path.dirname(path)).split(os.sep)):
+        match = re.fullmatch(r'((?:19|20)\d{2})\s*(전|이전)?', part.strip())
+        if match:
+            year = int(match.group(1))
+            return (None, year - 1) if match.group(2) else (year, year)
+    return None
+
+
+def filename_method(file_name):
+    for paren in re.findall(r'\(([^)]*)\)', file_name):
+        for method in METHODS:
+            if paren.startswith(method):
+                return method
+    return None
+
+
+def method_of(file_name, label=None):
+    """방식: 파일명 괄호 우선, 없으면 헤더 낙찰자결정방법 값 (둘 다 모르면 None)"""
+    method = filename_method(file_name)
+    if method is None and label:
+        label = str(label).replace(" ", "")
+        method = next((m for key, m in HEADER_METHODS if key in label), None)
+    return method
+
+
+def index_entry(path, use_cache=True):
+    """파일 하나의 사전 필터 정보 (워크북은 열지 않음, 캐시에 파싱 결과가 있으면 헤더 값 사용)"""
+    file_name = os.path.basename(path)
+    entry = {
+        'date': filename_date(file_name),
+        'years': folder_years(path),
+        'method': filename_method(file_name),
+        'client': None,
+    }
+    if use_cache:
+        try:
+            record = read_cached(path)
+        except OSError:
+            record = None
+        if record is not None:
+            info = record['info']
+            if entry['date'] is None:
+                for date_val in (info.get('입찰일'), info.get('입찰마감')):
+                    parsed = parse_bid_date(date_val)
+                    if parsed:
+                        entry['date'] = parsed[1]
+                        break
+            if info.get('발주처'):
+                entry['client'] = str(info['발주처']).strip()
+    return entry
+
+
+def record_entry(path, record):
+    """파싱한 레코드 기준 필터 정보 (사전 필터에서 애매했던 파일을 연 뒤 다시 확인할 때 사용)"""
+    file_name = os.path.basename(path)
+    info = record['info']
+    entry = {'date': None, 'years': folder_years(path), 'method': method_of(file_name, info.get('낙찰자결정방법')), 'client': None}
+    for date_val in (info.get('입찰일'), info.get('입찰마감')):
+        parsed = parse_bid_date(date_val)
+        if parsed:
+            entry['date'] = parsed[1]
+            break
+    if entry['date'] is None:
+        entry['date'] = filename_date(file_name)
+    if info.get('발주처'):
+        entry['client'] = str(info['발주처']).strip()
+    return entry
+
+
+def matches(entry, since=None, until=None, methods=None, clients=None):
+    """entry 가 조건을 확실히 벗어나면 False, 만족하거나 알 수 없으면 True"""
+    until = period_end(until)
+    if since or until:
+        if entry['date']:
+            if since and entry['date'] < since:
+                return False
+            if until and entry['date'] > until:
+                return False
+        elif entry['years']:
+            lo, hi = entry['years']
+            if since and hi is not None and hi < int(since[:4]):
+                return False
+            if until and lo is not None and lo > int(until[:4]):
+                return False
+    if methods and entry['method'] and entry['method'] not in methods:
+        return False
+    if clients and entry['client']:
+        client = entry['client'].replace(" ", "")
+        if not any(c.replace(" ", "") in client for c in clients):
+            return False
+    return True
+
+
+def prune(paths, since=None, until=None, methods=None, clients=None, use_cache=True):
+    """파일을 열기 전에 날짜('YYYY-MM-DD')/방식/발주처 조건으로 걸러낸 경로 목록 반환"""
+    kept = [p for p in paths if matches(index_entry(p, use_cache), since, until, methods, clients)]
+    print(f"사전 필터: {len(paths)}개 중 {len(kept)}개 대상 ({len(paths) - len(kept)}개 열지 않음)")
+    return kept
@@ -0,0 +1,131 @@
+import os
+import sys
+import re
+import json
+import hashlib
+import argparse
+
+# 입찰결과 아카이브 매니페스트: 파일별 크기/수정시각/내용 해시/파싱 상태/템플릿 리비전
+# --incremental 실행 시 현재 폴더와 비교해서 추가/수정된 워크북만 다시 처리
+# 출력물(CSV/시트)마다 반영된 파일이 다르므로 매니페스트는 출력 이름별로 따로 관리
+MANIFEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.bid_cache', 'manifest')
+
+
+def parse_incremental(argv=None):
+    """공통 --incremental 옵션 파싱 (나머지 인자는 그대로 반환)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--incremental', action='store_true')
+    args, rest = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args.incremental, rest
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def manifest_file(name):
+    return os.path.join(MANIFEST_DIR, re.sub(r'[\\/:*?"<>|\s]+', '_', name) + '.json')
+
+
+def load_manifest(name):
+    try:
+        with open(manifest_file(name), 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(name, manifest):
+    path = manifest_file(name)
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def scan_changes(paths, manifest, base_dir=None):
+    """현재 파일 목록을 매니페스트와 비교
+
+    크기/수정시각이 같으면 그대로, 다르면 내용 해시까지 비교 (복사 등으로 시각만 바뀐 파일은 변경 아님).
+    반환: {'added', 'modified', 'unchanged', 'removed': 경로 목록, 'hashes': {경로: 해시}}
+    """
+    changes = {'added': [], 'modified': [], 'unchanged': [], 'removed': [], 'hashes': {}}
+    current = set()
+    for path in paths:
+        key = os.path.abspath(path)
+        current.add(key)
+        st = os.stat(path)
+        entry = manifest.get(key)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            changes['unchanged'].append(path)
+            continue
+        digest = file_hash(path)
+        changes['hashes'][key] = digest
+        if entry is None:
+            changes['added'].append(path)
+        elif entry['hash'] == digest:
+            entry['size'], entry['mtime_ns'] = st.st_size, st.st_mtime_ns
+            changes['unchanged'].append(path)
+        else:
+            changes['modified'].append(path)
+
+    # 스캔 범위(base_dir) 안에서 더 이상 존재하지 않는 파일만 삭제로 처리
+    root = os.path.abspath(base_dir) if base_dir else None
+    for key in manifest:
+        if key in current or (root and not key.startswith(root + os.sep)):
+            continue
+        if not os.path.exists(key):
+            changes['removed'].append(key)
+    return changes
+
+
+def update_manifest(manifest, results, changes=None):
+    """load_tenders 결과 (path, record) 로 매니페스트 갱신 (record=None 은 파싱 실패)"""
+    hashes = changes['hashes'] if changes else {}
+    for path, record in results:
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+            digest = hashes.get(key) or file_hash(path)
+        except OSError:
+            manifest.pop(key, None)
+            continue
+        manifest[key] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'hash': digest,
+            'status': 'ok' if record is not None else 'error',
+            'revision': record.get('revision') if record is not None else None,
+        }
+    if changes:
+        for key in changes['removed']:
+            manifest.pop(key, None)
+    return manifest
+
+
+def select_targets(name, paths, incremental, base_dir=None):
+    """처리할 워크북 선택: 전체 실행이면 전부, --incremental 이면 추가/수정된 파일만
+
+    name 은 출력물 이름 (매니페스트 파일 구분용). 반환: (처리할 경로 목록, 매니페스트, 변경 내역)
+    전체 실행은 매니페스트를 읽거나 파일 해시를 만들지 않음 (매니페스트/변경 내역 None)
+    """
+    if not incremental:
+        return list(paths), None, None
+    manifest = load_manifest(name)
+    changes = scan_changes(paths, manifest, base_dir)
+    print(f"증분 처리: 추가 {len(changes['added'])}개, 수정 {len(changes['modified'])}개, "
+          f"삭제 {len(changes['removed'])}개, 변경없음 {len(changes['unchanged'])}개")
+    return changes['added'] + changes['modified'], manifest, changes
+
+
+def stale_files(changes):
+    """기존 출력에서 다시 만들거나 지워야 할 파일 (추가/수정/삭제된 파일, 절대 경로 기준)
+
+    하위 폴더가 달라도 파일명이 같은 워크북이 있으므로 파일명이 아니라 경로로 구분
+    """
+    return {os.path.abspath(p) for p in changes['added'] + changes['modified'] + changes['removed']}
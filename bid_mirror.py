@@ -0,0 +1,73 @@
+import os
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# 네트워크 드라이브(V:\) 워크북을 로컬 디스크에 복사해두고 읽는 read-through 미러
+# 파일마다 SMB 왕복을 여러 번 하는 대신 한 번에 통째로 복사하고, 크기/수정시각이 같으면 재사용
+MIRROR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.bid_cache', 'mirror')
+MIRROR_ROOTS = ('V:\\', '\\\\')  # 미러를 거쳐 읽을 경로 (네트워크 드라이브, UNC)
+FETCH_THREADS = 8
+
+
+def needs_mirror(path):
+    return os.path.abspath(path).upper().startswith(MIRROR_ROOTS)
+
+
+def mirror_path(path):
+    # 원본 파일명(확장자/리비전)은 그대로 두고 폴더만 경로 해시로 구분
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(MIRROR_DIR, digest[:2], digest[2:16], os.path.basename(path))
+
+
+def is_fresh(src_stat, dst):
+    try:
+        st = os.stat(dst)
+    except OSError:
+        return False
+    # 파일시스템마다 수정시각 정밀도가 달라서 1초 이내 차이는 같은 것으로 봄
+    return st.st_size == src_stat.st_size and abs(st.st_mtime - src_stat.st_mtime) < 1.0
+
+
+def fetch(path):
+    """원본과 같은 로컬 사본 경로 반환 (없거나 바뀌었으면 복사, 미러 대상이 아니면 원본 경로)"""
+    if not needs_mirror(path):
+        return path
+    dst = mirror_path(path)
+    src_stat = os.stat(path)
+    if is_fresh(src_stat, dst):
+        return dst
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    shutil.copyfile(path, tmp)
+    os.utime(tmp, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    os.replace(tmp, dst)
+    return dst
+
+
+class Prefetcher:
+    """백그라운드 스레드로 미리 복사 (파싱하는 쪽은 get() 으로 복사가 끝난 로컬 경로를 받음)"""
+
+    def __init__(self, paths, threads=FETCH_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.futures = {path: self.executor.submit(fetch, path) for path in paths}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def ready(self, path):
+        return self.futures[path].done()
+
+    def get(self, path):
+        """로컬 사본 경로 (복사 실패 시 원본 경로로 직접 읽음)"""
+        try:
+            return self.futures[path].result()
+        except OSError as e:
+            print(f"미러 복사 실패, 원본에서 읽음 ({os.path.basename(path)}): {e}")
+            return path
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,158 @@
+import numpy as np
+
+from bid_cache import parse_bid_date
+from bid_company import COMPANIES, canonical_name
+
+# 입찰 건 하나를 열 단위 NumPy 배열로 보관하는 모델
+# 투찰 행마다 dict 를 만드는 대신 필드별 배열 하나씩 두므로 아카이브 전체를 메모리에 올려도 수 MB 수준이고
+# max/min/비교 같은 연산을 배열째로 할 수 있음. 빈 값: 정수 -1, 실수 NaN, 날짜 NaT, 문자열 ""
+# 업체는 bid_company 업체 차원의 ID (company_id) 로 보관, 아직 적재(bid_db)되지 않은 업체는 -1 + 원본 표기
+
+
+def _float(val):
+    return np.nan if val is None else float(val)
+
+
+def _text(val):
+    return "" if val is None else str(val).strip()
+
+
+class Tender:
+    """입찰 건 하나 (헤더 값 + 순위표 열 배열)"""
+    __slots__ = (
+        'path', 'file', 'revision',
+        'client', 'method', 'decision', 'bid_date',
+        'base_amount', 'estimated_price', 'balance_price',
+        'rank', 'company_id', 'amount', 'yega_ratio', 'base_ratio', 'price_score', 'deduct_score', 'priority',
+        'company_raw', 'companies',
+    )
+
+    def __init__(self, n, companies=COMPANIES):
+        self.path = ""
+        self.file = ""
+        self.revision = None
+        self.client = ""                         # 발주처
+        self.method = ""                         # 낙찰자결정방법
+        self.decision = ""                       # 결정방식 (V1)
+        self.bid_date = np.datetime64('NaT', 'D')
+        self.base_amount = np.nan                # 기초금액
+        self.estimated_price = np.nan            # 예정가격
+        self.balance_price = np.nan              # 균형가격
+        self.rank = np.full(n, -1, dtype=np.int16)
+        self.company_id = np.full(n, -1, dtype=np.int32)
+        self.amount = np.full(n, -1, dtype=np.int64)
+        self.yega_ratio = np.full(n, np.nan, dtype=np.float64)
+        self.base_ratio = np.full(n, np.nan, dtype=np.float64)
+        self.price_score = np.full(n, np.nan, dtype=np.float64)
+        self.deduct_score = np.full(n, np.nan, dtype=np.float64)
+        self.priority = np.full(n, -1, dtype=np.int16)
+        self.company_raw = [""] * n              # 순위표 업체명 원본 (ID 가 없는 업체 표시용)
+        self.companies = companies
+
+    @classmethod
+    def from_record(cls, record, companies=COMPANIES):
+        """bid_cache 레코드 -> Tender (업체 ID 는 조회만 하고 등록하지 않음: 등록은 bid_db 적재 경로)"""
+        bids = record['bids']
+        info = record['info']
+        tender = cls(len(bids), companies)
+        tender.path = record['path']
+        tender.file = record['file']
+        tender.revision = record.get('revision')
+        tender.client = _text(info.get('발주처'))
+        tender.method = _text(info.get('낙찰자결정방법'))
+        tender.decision = _text(info.get('결정방식'))
+        for date_val in (info.get('입찰일'), info.get('입찰마감')):
+            parsed = parse_bid_date(date_val)
+            if parsed:
+                tender.bid_date = np.datetime64(parsed[1], 'D')
+                break
+        tender.base_amount = _float(info.get('기초금액'))
+        tender.estimated_price = _float(info.get('예정가격'))
+        tender.balance_price = _float(info.get('균형가격'))
+
+        for i, bid in enumerate(bids):
+            tender.rank[i] = bid['rank']
+            company_id = companies.resolve(bid['company'])
+            if company_id is not None:
+                tender.company_id[i] = company_id
+            tender.company_raw[i] = _text(bid['company'])
+            if bid['amount'] is not None:
+                tender.amount[i] = int(round(bid['amount']))
+            tender.yega_ratio[i] = _float(bid['yega_ratio'])
+            tender.base_ratio[i] = _float(bid['base_ratio'])
+            tender.price_score[i] = _float(bid['price_score'])
+            tender.deduct_score[i] = _float(bid['deduct_score'])
+            if bid['priority'] is not None:
+                tender.priority[i] = bid['priority']
+        return tender
+
+    def __len__(self):
+        return len(self.rank)
+
+    def company(self, i):
+        """정규화 업체명 (ID 가 없으면 원본 표기를 정규화)"""
+        if self.company_id[i] == -1:
+            return canonical_name(self.company_raw[i])
+        return self.companies.name_of(self.company_id[i])
+
+    def winner(self):
+        """우선순위 1 인 투찰 행 번호 (없으면 None)"""
+        idx = np.flatnonzero(self.priority == 1)
+        return int(idx[0]) if len(idx) else None
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in
+                   ('rank', 'company_id', 'amount', 'yega_ratio', 'base_ratio', 'price_score', 'deduct_score', 'priority'))
+
+
+def yega_percent(tender):
+    """예가대비를 % 단위로 (비율(0.88)로 적힌 파일은 x100)"""
+    return np.where(tender.yega_ratio < 2.0, tender.yega_ratio * 100, tender.yega_ratio)
+
+
+def to_ratio(val):
+    """투찰율 값 -> 비율 (0.75~0.99 그대로, 75~99 는 %로 보고 /100, 그 밖이면 None)"""
+    if val is None: return None
+    if 0.75 <= val <= 0.99:
+        return val
+    if 75.0 <= val <= 99.0:
+        return val / 100.0
+    return None
+
+
+def price_limit(tender):
+    """가격점수 만점 + 단가감점 0 인 투찰 중 가장 낮은 예가대비(%) -> (행 번호, 하한선), 없으면 (None, None)"""
+    valid = ~np.isnan(tender.price_score) & ~np.isnan(tender.yega_ratio)
+    if not valid.any():
+        return None, None
+    price = tender.price_score[valid]
+    deduct = np.nan_to_num(tender.deduct_score[valid])  # 감점 빈칸은 0
+    yega = yega_percent(tender)[valid]
+    perfect = (price == price.max()) & (deduct == 0.0)
+    if not perfect.any():
+        return None, None
+    idx = np.flatnonzero(perfect)[np.argmin(yega[perfect])]
+    return int(np.flatnonzero(valid)[idx]), float(yega[idx])
+
+
+def tender_facts(tender, has_company=True):
+    """입찰 건 하나의 요약 값 (참여업체 수, 1순위, 최고 가격점수, 하한선)"""
+    winner = tender.winner()
+    # 1순위 투찰율: 우선순위 1 중 기초대비가 있는 첫 행
+    winner_ratio = None
+    for i in np.flatnonzero(tender.priority == 1):
+        if not np.isnan(tender.base_ratio[i]):
+            winner_ratio = float(tender.base_ratio[i])
+            break
+    scores = tender.price_score[~np.isnan(tender.price_score)]
+    limit_idx, limit_yega = price_limit(tender)
+    return {
+        'bidder_count': len(tender) if has_company else 0,
+        'winner_company_id': int(tender.company_id[winner]) if winner is not None else None,
+        'winner_amount': int(tender.amount[winner]) if winner is not None and tender.amount[winner] >= 0 else None,
+        'winner_base_ratio': winner_ratio,
+        'max_price_score': float(scores.max()) if len(scores) else None,
+        'limit_yega': limit_yega,
+        'limit_company_id': int(tender.company_id[limit_idx]) if limit_idx is not None else None,
+    }
@@ -0,0 +1,128 @@
+import os
+import sys
+
+from bid_cache import list_workbooks
+from bid_company import CompanyDimension
+from bid_db import connect, sync
+from bid_dedup import dedup_paths
+from bid_index import method_of, prune
+from bid_query import company_bids, company_ids
+
+# 업체별 참여 색인: 업체 -> [(입찰, 순위, 우선순위, 입찰금액, 기초대비), ...]
+# 색인은 창고 DB(bid_db)의 bids 테이블 (업체 ID, 입찰 ID 인덱스) 그대로이고, 폴더는 sync_index 로 한 번만 훑음
+# (새로 들어오거나 바뀐 파일만 파싱) -> 업체가 몇 개든 보고서는 같은 색인에서 한 번의 조회로 만듦
+# 업체 하나의 전체 참여 이력 조회: python bid_participation.py 대우건설 --since 2024-01-01
+
+
+def sync_index(base_dir, jobs=1, db_file=None, **filters):
+    """폴더를 참여 색인(DB)과 맞추고 연결 반환
+
+    filters(since/until/methods/clients) 밖의 파일은 열지 않고, 같은 입찰 건의 중복 파일은 최신 리비전만 남김
+    """
+    conn = connect() if db_file is None else connect(db_file)
+    paths = prune(list_workbooks(base_dir), **filters)
+    paths, duplicates = dedup_paths(paths, jobs)
+    print(f"총 {len(paths)}개의 엑셀 파일을 색인에 반영합니다.")
+    sync(conn, paths, jobs, base_dir)
+    with conn:
+        conn.executemany("DELETE FROM tenders WHERE path = ?", [(os.path.abspath(p),) for p in duplicates])
+    return conn
+
+
+def target_ids(conn, name, companies=None):
+    """업체 id 또는 이름 -> 업체 id 목록 (대표 업체명/별칭이면 그 업체, 처음 보는 이름이면 이름 일부가 들어간 업체들)"""
+    if isinstance(name, int):
+        return [name]
+    company_id = (companies or CompanyDimension(conn)).resolve(name)
+    return [company_id] if company_id is not None else company_ids(conn, [name])
+
+
+def participation(conn, names, base_dir=None, exts=None, since=None, until=None, clients=None, methods=None):
+    """업체 목록 -> {업체: [투찰 행, ...]} (모든 업체를 한 번에 조회, 입찰금액이 있는 실제 투찰 행만, 입찰일 순)
+
+    투찰 행은 bid_query.company_bids 와 같음 (입찰 정보 + company_id/company, rank, priority, amount, base_ratio ...)
+    methods 는 사전 필터와 같은 방식(종심/종평/간이종심), 방식을 모르는 입찰은 통과 (bid_index.matches 와 동일)
+    """
+    companies = CompanyDimension(conn)
+    targets = {name: target_ids(conn, name, companies) for name in names}
+    ids = sorted({company_id for group in targets.values() for company_id in group})
+    by_company = {}
+    for row in company_bids(conn, ids, base_dir=base_dir, exts=exts, since=since, until=until, clients=clients):
+        if row['amount'] is None:
+            continue
+        method = method_of(row['file'], row['method'])
+        if methods and method and method not in methods:
+            continue
+        by_company.setdefault(row['company_id'], []).append(row)
+
+    result = {}
+    for name, group in targets.items():
+        rows = [row for company_id in group for row in by_company.get(company_id, [])]
+        rows.sort(key=lambda row: (row['bid_date'] is None, row['bid_date'] or '', row['path'], row['row']))
+        result[name] = rows
+    return result
+
+
+def sheet_rows(rows, project_name):
+    """투찰 행 -> 참여현황 시트 행 [연도, 입찰일자, 공사명, "O", 낙찰우선순위, 입찰금액, 기초대비, 원본파일명]
+
+    입찰일 오름차순, 같은 공사명은 처음 나온 건만 (project_name: 파일명 -> 공사명)
+    """
+    results = []
+    for row in rows:
+        if row['bid_date']:
+            year, full_date = row['bid_date'][:4], row['bid_date']
+        else:
+            year, full_date = "연도미상", "일자미상"
+        results.append([
+            year,
+            full_date,
+            project_name(row['file']),
+            "O",
+            str(row['priority']) if row['priority'] is not None else "",
+            row['amount'],
+            row['base_ratio'] if row['base_ratio'] is not None else "",
+            row['file'],
+        ])
+    return dedup_rows(results)
+
+
+def dedup_rows(results):
+    """시트 행 입찰일 오름차순 정렬 후 같은 공사명(C열)은 처음 나온 건만"""
+    results = sorted(results, key=lambda x: (str(x[0]), str(x[1])))
+    dedup_results = []
+    seen_projects = set()
+    for row in results:
+        if row[2] not in seen_projects:
+            seen_projects.add(row[2])
+            dedup_results.append(row)
+    return dedup_results
+
+
+if __name__ == "__main__":
+    import time
+    import argparse
+    from bid_index import parse_filters
+    from bid_pool import parse_jobs
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    jobs, rest = parse_jobs()
+    filters, rest = parse_filters(rest)
+    parser = argparse.ArgumentParser(description="업체별 입찰 참여 이력 (참여 색인 조회)")
+    parser.add_argument('company', nargs='+', help="업체명 (대표 이름/별칭, 처음 보는 이름은 이름 일부로 검색)")
+    parser.add_argument('--folder', action='append', dest='folders', help="조회 전에 이 폴더를 색인에 반영")
+    args = parser.parse_args(rest)
+
+    conn = connect()
+    for base_dir in args.folders or []:
+        sync_index(base_dir, jobs, **filters).close()
+    started = time.perf_counter()
+    result = participation(conn, args.company, **filters)
+    elapsed = time.perf_counter() - started
+    for name, rows in result.items():
+        wins = sum(1 for row in rows if row['priority'] == 1)
+        print(f"[{name}] {len(rows)}건 (1순위 {wins}건)")
+        for row in rows:
+            print(f"  {row['bid_date'] or '일자미상'}  순위 {row['rank']}  우선순위 {row['priority']}"
+                  f"  입찰금액 {row['amount']:,.0f}  기초대비 {row['base_ratio']}  {row['file']}")
+    print(f"({elapsed * 1000:.1f} ms)")
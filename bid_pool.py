@@ -0,0 +1,240 @@
+import os
+import sys
+import time
+import signal
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from bid_cache import load_tender, read_cached
+from bid_mirror import Prefetcher, needs_mirror
+from bid_quarantine import PARSE_STAGES, quarantined, quarantine, release, stage_of
+
+try:
+    # 리눅스/맥: 워커 주소 공간 상한 (RLIMIT_AS)
+    import resource
+except ImportError:
+    resource = None
+try:
+    # Windows 에는 resource 모듈이 없으므로 psutil 로 워커 메모리(RSS)를 감시하다가 넘으면 워커 종료
+    import psutil
+except ImportError:
+    psutil = None
+
+# 병렬 파싱 기본값 (캐시에 없는 워크북만 워커 프로세스로 보냄)
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) - 1)
+FILE_TIMEOUT = 120      # 워크북 하나 당 최대 파싱 시간(초)
+MEMORY_LIMIT_MB = 2048  # 워커 프로세스 메모리 상한 (resource 또는 psutil 이 있을 때만 적용)
+MEMORY_POLL_SECONDS = 0.5
+MEMORY_EXIT_CODE = 3
+
+_memory_warned = False
+
+
+def parse_jobs(argv=None):
+    """모든 스크립트 공통 --jobs/-j 옵션 파싱 (나머지 인자는 그대로 반환)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_JOBS)
+    args, rest = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return max(1, args.jobs), rest
+
+
+def _warn_memory_limit(memory_limit_mb):
+    global _memory_warned
+    if memory_limit_mb and resource is None and psutil is None and not _memory_warned:
+        _memory_warned = True
+        print(f"워커 메모리 상한 {memory_limit_mb}MB 미적용 (이 OS 에는 resource 모듈이 없음, pip install psutil 필요)")
+
+
+def _watch_memory(limit):
+    proc = psutil.Process()
+    while True:
+        if proc.memory_info().rss > limit:
+            # 파싱 중인 워커를 바로 끝냄 -> 부모는 BrokenProcessPool 로 보고 그 파일만 혼자 다시 시도 후 격리
+            os._exit(MEMORY_EXIT_CODE)
+        time.sleep(MEMORY_POLL_SECONDS)
+
+
+def _init_worker(memory_limit_mb, pid_queue):
+    pid_queue.put(os.getpid())
+    if not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    if resource is not None:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    elif psutil is not None:
+        threading.Thread(target=_watch_memory, args=(limit,), daemon=True).start()
+
+
+def _parse_worker(path, read_from=None):
+    return load_tender(path, use_cache=False, read_from=read_from)
+
+
+class _WorkerPool:
+    """ProcessPoolExecutor + 워커 pid 목록 (멈춘 워커는 shutdown 으로 끝나지 않으므로 pid 로 직접 종료)"""
+
+    def __init__(self, jobs, memory_limit_mb):
+        context = multiprocessing.get_context()
+        self.pid_queue = context.SimpleQueue()
+        self.pids = set()
+        self.executor = ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_init_worker,
+                                            initargs=(memory_limit_mb, self.pid_queue))
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.pid_queue.close()
+
+    def terminate(self):
+        while not self.pid_queue.empty():
+            self.pids.add(self.pid_queue.get())
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)  # Windows 에서는 TerminateProcess
+            except OSError:
+                pass  # 이미 끝난 워커
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pid_queue.close()
+
+
+def load_tenders(paths, jobs=DEFAULT_JOBS, timeout=FILE_TIMEOUT, memory_limit_mb=MEMORY_LIMIT_MB, use_cache=True, use_mirror=True):
+    """워크북 목록을 병렬로 파싱하여 입력 순서대로 (path, record) 리스트 반환 (실패/시간초과 시 record=None)
+
+    네트워크 드라이브 파일은 백그라운드 스레드가 로컬 미러로 먼저 복사하고, 복사가 끝난 파일부터 파싱
+    실패한 파일은 격리 목록(bid_quarantine)에 기록하고, 격리된 파일은 바뀌기 전까지 열지 않음 (record=None)
+    """
+    paths = list(paths)
+    records = [None] * len(paths)
+    pending = []
+    skipped = 0
+    for idx, path in enumerate(paths):
+        record = None
+        if use_cache:
+            try:
+                record = read_cached(path)
+            except OSError:
+                record = None
+        if record is not None:
+            records[idx] = record
+        elif quarantined(path):
+            skipped += 1
+        else:
+            pending.append(idx)
+    if skipped:
+        print(f"격리된 워크북 {skipped}개 건너뜀 (목록: python bid_quarantine.py)")
+
+    remote = [paths[idx] for idx in pending if use_mirror and needs_mirror(paths[idx])]
+    with Prefetcher(remote) as prefetcher:
+        _parse_pending(paths, records, pending, prefetcher, jobs, timeout, memory_limit_mb)
+    for idx in pending:
+        if records[idx] is not None:
+            release(paths[idx], PARSE_STAGES)
+    return list(zip(paths, records))
+
+
+def _parse_pending(paths, records, pending, prefetcher, jobs, timeout, memory_limit_mb):
+    def is_ready(idx):
+        return paths[idx] not in prefetcher.futures or prefetcher.ready(paths[idx])
+
+    def local_path(idx):
+        return prefetcher.get(paths[idx]) if paths[idx] in prefetcher.futures else None
+
+    # 시간/메모리 상한이 없을 때만 현재 프로세스에서 파싱 (상한이 있으면 파일 하나라도 워커로 보내서 적용)
+    if not timeout and not memory_limit_mb:
+        for idx in pending:
+            try:
+                records[idx] = load_tender(paths[idx], use_cache=False, read_from=local_path(idx))
+            except Exception as e:
+                print(f"Skipping {os.path.basename(paths[idx])} (Error: {e})")
+                quarantine(paths[idx], stage_of(e), e)
+        return
+    if not pending:
+        return
+
+    jobs = max(1, min(jobs, len(pending)))
+    timeout = timeout or float('inf')
+    _warn_memory_limit(memory_limit_mb)
+    print(f"{len(pending)}개 워크북 병렬 파싱 (jobs={jobs}, 캐시 {len(paths) - len(pending)}개 사용, 미러 {len(prefetcher.futures)}개)")
+    queue = list(pending)
+    # 워커가 죽었을 때 진행 중이던 파일들: 누가 원인인지 모르므로 하나씩 혼자 다시 돌려 보고,
+    # 혼자 돌려도 죽는 파일만 격리 (같이 돌던 정상 파일이 격리되지 않도록)
+    suspects = set()
+    while queue:
+        executor = _WorkerPool(jobs, memory_limit_mb)
+        running = {}  # future -> (idx, deadline)
+        restart = crashed = False
+        try:
+            while (queue or running) and not restart:
+                # 동시에 jobs 개만 제출해서 제출 시각 = 시작 시각이 되도록 유지 (로컬 복사가 끝난 파일 먼저)
+                while len(running) < jobs:
+                    if any(idx in suspects for idx, _ in running.values()):
+                        break
+                    ready = [idx for idx in queue if is_ready(idx)]
+                    if not ready:
+                        break
+                    isolated = [idx for idx in ready if idx in suspects]
+                    if isolated and running:
+                        break
+                    idx = (isolated or ready)[0]
+                    queue.remove(idx)
+                    future = executor.submit(_parse_worker, paths[idx], local_path(idx))
+                    running[future] = (idx, time.monotonic() + timeout)
+
+                fetching = [prefetcher.futures[paths[idx]] for idx in queue if not is_ready(idx)]
+                if not running:
+                    wait(fetching, return_when=FIRST_COMPLETED)
+                    continue
+
+                next_deadline = min(deadline for _, deadline in running.values())
+                wait_for = None if next_deadline == float('inf') else max(0.0, next_deadline - time.monotonic())
+                done, _ = wait(list(running) + fetching, timeout=wait_for, return_when=FIRST_COMPLETED)
+                done = [fut for fut in done if fut in running]
+
+                for fut in done:
+                    idx, _ = running.pop(fut)
+                    try:
+                        records[idx] = fut.result()
+                    except BrokenProcessPool as e:
+                        # 워커가 죽으면(메모리 초과 등) 혼자 돌던 파일만 격리, 나머지는 혼자 다시 시도
+                        restart = crashed = True
+                        if idx in suspects:
+                            print(f"Skipping {os.path.basename(paths[idx])} (Error: worker crashed)")
+                            quarantine(paths[idx], 'crash', e)
+                        else:
+                            suspects.add(idx)
+                            queue.insert(0, idx)
+                    except MemoryError as e:
+                        print(f"Skipping {os.path.basename(paths[idx])} (Error: memory limit {memory_limit_mb}MB exceeded)")
+                        quarantine(paths[idx], 'memory', e)
+                    except Exception as e:
+                        print(f"Skipping {os.path.basename(paths[idx])} (Error: {e})")
+                        quarantine(paths[idx], stage_of(e), e)
+
+                now = time.monotonic()
+                expired = [fut for fut, (_, deadline) in running.items() if deadline <= now and not fut.done()]
+                for fut in expired:
+                    idx, _ = running.pop(fut)
+                    print(f"Skipping {os.path.basename(paths[idx])} (Error: timeout after {timeout}s)")
+                    quarantine(paths[idx], 'timeout', TimeoutError(f"timeout after {timeout}s"))
+                if expired:
+                    restart = True
+
+            if restart:
+                # 다른 워커에서 진행 중이던 파일은 새 풀에서 처음부터 다시 처리 (워커가 죽은 경우엔 하나씩)
+                if crashed:
+                    suspects.update(idx for idx, _ in running.values())
+                queue = [idx for idx, _ in running.values()] + queue
+                running.clear()
+                executor.terminate()
+            else:
+                executor.shutdown()
+        except BaseException:
+            executor.terminate()
+            raise
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+from bid_manifest import file_hash
+from bid_schema import revision_of
+
+# 열리지 않거나 파싱이 안 되는 워크북 격리 목록 (경로, 크기/수정시각, 내용 해시, 실패 단계, 예외, 템플릿 리비전)
+# 격리된 파일은 파일이 바뀔 때까지 다음 실행부터 열지 않고 건너뜀 (모든 스크립트가 같은 목록 사용)
+# 실패 단계: decode(워크북 읽기) / parse(순위표·헤더 해석) / timeout / crash(워커 종료) / memory
+# 스크립트 단계(레코드 처리 중 예외)는 단계 이름을 스크립트 이름으로 기록하고, 그 스크립트만 건너뜀
+QUARANTINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.bid_cache', 'quarantine.json')
+PARSE_STAGES = ('decode', 'parse', 'timeout', 'crash', 'memory')
+
+_entries = None
+
+
+def _read():
+    try:
+        with open(QUARANTINE_FILE, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(entries):
+    os.makedirs(os.path.dirname(QUARANTINE_FILE), exist_ok=True)
+    tmp = QUARANTINE_FILE + f'.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(entries, fh, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, QUARANTINE_FILE)
+
+
+def entries():
+    global _entries
+    if _entries is None:
+        _entries = _read()
+    return _entries
+
+
+def _update(change):
+    # 다른 프로세스(감시 프로세스 등)가 그 사이에 기록한 항목도 유지
+    global _entries
+    current = _read()
+    change(current)
+    _write(current)
+    _entries = current
+
+
+def failure_class(entry):
+    return f"{entry['stage']}: {entry['error_type']}"
+
+
+def stage_of(exc, default='parse'):
+    """예외가 난 단계 (bid_cache.parse_tender 가 워크북 읽기 실패에 bid_stage='decode' 를 붙임)"""
+    return getattr(exc, 'bid_stage', default)
+
+
+def quarantined(path, stages=PARSE_STAGES):
+    """격리 중이고 파일이 그대로면 격리 항목, 아니면 None
+
+    크기/수정시각이 바뀌었으면 내용 해시까지 비교해서 내용이 바뀐 경우에만 격리 해제
+    """
+    key = os.path.abspath(path)
+    entry = entries().get(key)
+    if entry is None or entry['stage'] not in stages:
+        return None
+    try:
+        st = os.stat(path)
+        if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry
+        digest = file_hash(path)
+    except OSError:
+        return None
+    if digest == entry['hash']:
+        def touch(current):
+            if key in current:
+                current[key]['size'], current[key]['mtime_ns'] = st.st_size, st.st_mtime_ns
+        _update(touch)
+        return entry
+    release(path)
+    return None
+
+
+def quarantine(path, stage, exc):
+    """실패한 워크북 기록 (같은 경로의 이전 기록은 교체)"""
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+        size, mtime_ns, digest = st.st_size, st.st_mtime_ns, file_hash(path)
+    except OSError:
+        return
+    entry = {
+        'size': size,
+        'mtime_ns': mtime_ns,
+        'hash': digest,
+        'stage': stage,
+        'error_type': type(exc).__name__,
+        'error': str(exc)[:500],
+        'revision': revision_of(path),
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+    def add(current):
+        current[key] = entry
+    _update(add)
+
+
+def release(path, stages=None):
+    """격리 해제 (stages 를 주면 그 단계로 격리된 경우만)"""
+    key = os.path.abspath(path)
+    entry = entries().get(key)
+    if entry is not None and (stages is None or entry['stage'] in stages):
+        _update(lambda current: current.pop(key, None))
+
+
+def report(stages=None):
+    """실패 종류(단계: 예외)별 격리 파일 목록 출력"""
+    groups = {}
+    for path, entry in entries().items():
+        if stages and entry['stage'] not in stages:
+            continue
+        groups.setdefault(failure_class(entry), []).append((path, entry))
+    if not groups:
+        print("격리된 워크북 없음")
+        return groups
+    for cls, items in sorted(groups.items(), key=lambda item: -len(item[1])):
+        print(f"[{cls}] {len(items)}개")
+        for path, entry in sorted(items):
+            print(f"  {entry['time']}  Rev {entry['revision'] or '-'}  {path}")
+            print(f"      {entry['error']}")
+    print(f"총 {sum(len(items) for items in groups.values())}개 ({len(groups)}종류)")
+    return groups
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description="격리된 입찰결과 워크북 목록")
+    parser.add_argument('--stage', action='append', dest='stages', help="이 단계만 (decode/parse/timeout/... 또는 스크립트 이름)")
+    parser.add_argument('--release', nargs='+', metavar='PATH', help="격리 해제 (다음 실행에서 다시 열어봄)")
+    parser.add_argument('--release-all', action='store_true')
+    args = parser.parse_args()
+
+    if args.release_all:
+        _update(lambda current: current.clear())
+        print("격리 목록을 비웠습니다.")
+    elif args.release:
+        for path in args.release:
+            release(path)
+        print(f"{len(args.release)}개 격리 해제")
+    else:
+        report(args.stages)
@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+
+from bid_db import connect
+from bid_index import period_end
+
+# 창고 DB(bid_db) 조회 함수 모음
+# 업체/발주처/낙찰자결정방법 조건은 먼저 작은 목록(companies, DISTINCT client/method)에서 이름을 골라
+# id/값 IN (...) 으로 바꾸므로 인덱스를 타고, 폴더 조건은 path 범위 검색으로 처리
+
+
+def _squash(text):
+    return str(text).replace(" ", "").upper()
+
+
+def company_ids(conn, names):
+    """업체 id 목록: 정수는 업체 id 그대로, 문자열은 업체명 일부(공백/대소문자 무시)가 들어간 업체
+
+    스크립트는 COMPANIES.resolve('대표 업체명') 으로 받은 id 를 넘기고(처음 보는 업체면 None 이므로 조회하지 않음), 이름 일부 검색은 명령행 조회용
+    """
+    ids = [name for name in names if isinstance(name, int)]
+    keys = [_squash(name) for name in names if not isinstance(name, int)]
+    if keys:
+        ids += [row['id'] for row in conn.execute("SELECT id, name FROM companies")
+                if any(key in _squash(row['name']) for key in keys) and row['id'] not in ids]
+    return ids
+
+
+def _matching_values(conn, column, keys):
+    keys = [_squash(key) for key in keys]
+    return [row[0] for row in conn.execute(f"SELECT DISTINCT {column} FROM tenders WHERE {column} IS NOT NULL")
+            if any(key in _squash(row[0]) for key in keys)]
+
+
+def _in(column, values):
+    return f"{column} IN ({', '.join('?' * len(values))})", list(values)
+
+
+def _tender_filter(conn, base_dir=None, exts=None, since=None, until=None, clients=None, methods=None):
+    """tenders(t) 조건 -> (WHERE 절 목록, 파라미터 목록)
+
+    날짜를 모르는 입찰은 since/until 조건을 통과시킴 (bid_index 사전 필터와 동일)
+    """
+    where, params = [], []
+    if base_dir is not None:
+        prefix = os.path.join(os.path.abspath(base_dir), '')
+        where.append("t.path >= ? AND t.path < ?")
+        params += [prefix, prefix + '\uffff']
+    if exts:
+        where.append("(" + " OR ".join("lower(t.file) LIKE ?" for _ in exts) + ")")
+        params += ['%' + ext.lower() for ext in exts]
+    if since:
+        where.append("(t.bid_date IS NULL OR t.bid_date >= ?)")
+        params.append(since)
+    if until:
+        where.append("(t.bid_date IS NULL OR t.bid_date <= ?)")
+        params.append(period_end(until))
+    for column, keys in (('client', clients), ('method', methods)):
+        if keys:
+            clause, values = _in('t.' + column, _matching_values(conn, column, keys))
+            where.append(clause)
+            params += values
+    return where, params
+
+
+def _tender_dict(row):
+    tender = dict(row)
+    if 'columns' in tender:
+        tender['columns'] = json.loads(tender['columns'])
+    return tender
+
+
+def tenders(conn, **filters):
+    """조건에 맞는 입찰 목록 (dict, 경로 순)"""
+    where, params = _tender_filter(conn, **filters)
+    sql = "SELECT t.* FROM tenders t"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return [_tender_dict(row) for row in conn.execute(sql + " ORDER BY t.path", params)]
+
+
+def facts(conn, **filters):
+    """조건에 맞는 입찰 건 요약 행 목록 (tender_facts, 경로 순)"""
+    where, params = _tender_filter(conn, **filters)
+    sql = "SELECT t.* FROM tender_facts t"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return [dict(row) for row in conn.execute(sql + " ORDER BY t.path", params)]
+
+
+def company_bids(conn, names, **filters):
+    """업체 id 또는 업체명 일부로 고른 업체들의 투찰 행 (입찰 정보 + 업체명 + 투찰 값, 입찰/순위표 순)"""
+    ids = company_ids(conn, names)
+    if not ids:
+        return []
+    clause, params = _in('b.company_id', ids)
+    where, tender_params = _tender_filter(conn, **filters)
+    sql = ("SELECT t.*, b.company_id, c.name AS company, b.row, b.rank, b.amount, b.yega_ratio, b.base_ratio,"
+           " b.price_score, b.deduct_score, b.priority"
+           " FROM bids b JOIN tenders t ON t.id = b.tender_id JOIN companies c ON c.id = b.company_id"
+           " WHERE " + " AND ".join([clause] + where) + " ORDER BY t.path, b.row")
+    return [_tender_dict(row) for row in conn.execute(sql, params + tender_params)]
+
+
+def by_tender(rows):
+    """company_bids 결과 -> 입찰 id 별 투찰 행 목록"""
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row['id'], []).append(row)
+    return grouped
+
+
+def winners(conn, **filters):
+    """입찰 id -> 우선순위 1 투찰 행 (업체명/투찰 값)"""
+    where, params = _tender_filter(conn, **filters)
+    sql = ("SELECT b.tender_id, c.name AS company, b.row, b.rank, b.amount, b.yega_ratio, b.base_ratio,"
+           " b.price_score, b.deduct_score, b.priority"
+           " FROM bids b JOIN tenders t ON t.id = b.tender_id JOIN companies c ON c.id = b.company_id"
+           " WHERE " + " AND ".join(["b.priority = 1"] + where) + " ORDER BY b.tender_id, b.row")
+    result = {}
+    for row in conn.execute(sql, params):
+        result.setdefault(row['tender_id'], dict(row))
+    return result
+
+
+if __name__ == "__main__":
+    import time
+    import argparse
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description="입찰결과 DB 에서 업체 투찰 내역 조회")
+    parser.add_argument('company', nargs='+', help="업체명 일부 (공백 무시)")
+    parser.add_argument('--since')
+    parser.add_argument('--until')
+    parser.add_argument('--client', action='append', dest='clients')
+    parser.add_argument('--method', action='append', dest='methods')
+    args = parser.parse_args()
+
+    conn = connect()
+    started = time.perf_counter()
+    rows = company_bids(conn, args.company, since=args.since, until=args.until, clients=args.clients, methods=args.methods)
+    elapsed = time.perf_counter() - started
+    for row in rows:
+        print(f"{row['bid_date'] or '일자미상'}  {row['company']}  순위 {row['rank']}  우선순위 {row['priority']}"
+              f"  기초대비 {row['base_ratio']}  {row['file']}")
+    print(f"{len(rows)}건 ({elapsed * 1000:.1f} ms)")
@@ -0,0 +1,92 @@
+import os
+import re
+import json
+
+# 템플릿 리비전(_Rev.N4.12 등) 별 고정 좌표 레지스트리
+# 같은 리비전 안에서는 레이아웃이 고정이므로 좌표만 알면 셀을 바로 읽을 수 있음.
+# 처음 보는 리비전은 키워드 검색으로 파싱한 뒤 찾은 좌표를 REGISTRY_FILE 에 저장(자동 학습)
+REGISTRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.bid_cache', 'revisions.json')
+
+# N4 템플릿 (create_bids_sheet 의 I4/I5/I6, V1, 우선순위 13열 기준)
+# fields: 필드명 -> [행, 라벨 열, 값 열] (0 기준), columns: 순위표 필드 -> 열 (0 기준)
+TEMPLATE_N4 = {
+    'header_row': 9,
+    'fields': {
+        '공사명': [3, 0, 2],
+        '발주처': [4, 0, 2],
+        '낙찰자결정방법': [5, 0, 2],
+        '입찰일': [6, 0, 2],
+        '공고번호': [2, 16, 17],
+        '결정방식': [0, 20, 21],
+        '기초금액': [3, 6, 8],
+        '예정가격': [4, 6, 8],
+        '균형가격': [5, 6, 8],
+    },
+    'columns': {
+        'company': 1,
+        'amount': 2,
+        'yega_ratio': 3,
+        'base_ratio': 4,
+        'price_score': 8,
+        'deduct_score': 11,
+        'priority': 13,
+    },
+}
+
+KNOWN_REVISIONS = {
+    'N4.10': TEMPLATE_N4,
+    'N4.11': TEMPLATE_N4,
+    'N4.12': TEMPLATE_N4,
+}
+
+_learned = None
+
+
+def revision_of(path):
+    """파일명에서 템플릿 리비전 추출 ('..._Rev.N4.12.xlsb' -> 'N4.12', 없으면 None)"""
+    match = re.search(r'_Rev\.?\s*([A-Za-z]*\d+(?:\.\d+)*)', os.path.basename(path), re.IGNORECASE)
+    if match:
+        return match.group(1).upper()
+    return None
+
+
+def load_registry():
+    global _learned
+    if _learned is None:
+        _learned = {}
+        try:
+            with open(REGISTRY_FILE, 'r', encoding='utf-8') as fh:
+                _learned = json.load(fh)
+        except (OSError, ValueError):
+            pass
+    return _learned
+
+
+def get_schema(revision):
+    if not revision:
+        return None
+    learned = load_registry()
+    if revision in learned:
+        return learned[revision]
+    return KNOWN_REVISIONS.get(revision)
+
+
+def learn_schema(revision, schema):
+    """새 리비전 좌표 저장 (다른 프로세스가 같이 써도 파일이 깨지지 않도록 임시 파일 후 교체)"""
+    learned = load_registry()
+    learned[revision] = schema
+    try:
+        # 다른 워커가 먼저 저장한 리비전도 유지
+        with open(REGISTRY_FILE, 'r', encoding='utf-8') as fh:
+            on_disk = json.load(fh)
+    except (OSError, ValueError):
+        on_disk = {}
+    on_disk.update(learned)
+    try:
+        os.makedirs(os.path.dirname(REGISTRY_FILE), exist_ok=True)
+        tmp = f"{REGISTRY_FILE}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(on_disk, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, REGISTRY_FILE)
+    except OSError as e:
+        print(f"리비전 좌표 저장 실패 ({revision}): {e}")
@@ -0,0 +1,88 @@
+import bisect
+
+import gspread
+
+# 구글 시트 증분 갱신 (--incremental): 시트를 지우고 전부 다시 쓰는 대신
+# 키 열이 같은 행은 그 자리에서 고치고, 새 행은 정렬 위치에 끼워 넣고, 지워진 파일의 행만 삭제
+# 시트는 1행 헤더, 2행부터 데이터이고 데이터 행은 order 기준으로 정렬되어 있다고 가정
+# 시트에서 읽은 값은 문자열이므로 key/order 는 새 행과 시트 행 모두 같은 문자열 값이 나오도록 만들어야 함
+
+
+def _col_letter(n):
+    return gspread.utils.rowcol_to_a1(1, n)[:-1]
+
+
+def upsert_rows(worksheet, rows, key, stale=(), order=None):
+    """rows 를 시트에 반영하고 새로 쓰거나 고친 행의 {키: 행 번호(1 기준)} 반환 (서식 적용용)
+
+    key(row) -> 행 키, stale: 지울 행 키 (rows 에 같은 키가 있으면 삭제 대신 갱신)
+    order(row) -> 정렬 키 (없으면 새 행은 맨 뒤에 추가)
+    """
+    values = worksheet.get_all_values()
+    data = values[1:]
+    keys = [key(row) for row in data]
+    orders = [order(row) for row in data] if order else None
+    new_rows = {}
+    for row in rows:
+        new_rows[key(row)] = row
+
+    # 1. 지워진 파일의 행 삭제 (아래쪽부터, 이어진 행은 한 번에)
+    doomed = [i for i, k in enumerate(keys) if k in stale and k not in new_rows]
+    for start, end in reversed(_runs(doomed)):
+        worksheet.delete_rows(start + 2, end + 2)
+        del keys[start:end + 1]
+        if orders is not None:
+            del orders[start:end + 1]
+    if doomed:
+        print(f"  시트에서 {len(doomed)}행 삭제")
+
+    # 2. 이미 있는 키는 그 행을 덮어씀
+    updates = []
+    position = {}
+    for i, k in enumerate(keys):
+        position.setdefault(k, i)
+    for k, row in new_rows.items():
+        if k in position:
+            r = position[k] + 2
+            updates.append({'range': f"A{r}:{_col_letter(len(row))}{r}", 'values': [list(row)]})
+    if updates:
+        worksheet.batch_update(updates)
+
+    # 3. 새 키는 정렬 위치에 끼워 넣음 (같은 위치에 들어갈 행은 한 번에, 서식은 윗행을 따름)
+    inserts = [row for k, row in new_rows.items() if k not in position]
+    if order:
+        inserts.sort(key=order)
+    pending = []
+    for row in inserts:
+        i = bisect.bisect_right(orders, order(row)) if order else len(keys)
+        if pending and pending[0] != i:
+            _insert(worksheet, keys, orders, pending, key, order)
+            i = bisect.bisect_right(orders, order(row)) if order else len(keys)
+            pending = []
+        if not pending:
+            pending = [i]
+        pending.append(row)
+    if pending:
+        _insert(worksheet, keys, orders, pending, key, order)
+
+    print(f"  시트 증분 반영: 수정 {len(updates)}행, 추가 {len(inserts)}행")
+    return {k: i + 2 for i, k in enumerate(keys) if k in new_rows}
+
+
+def _insert(worksheet, keys, orders, pending, key, order):
+    i, rows = pending[0], pending[1:]
+    worksheet.insert_rows([list(row) for row in rows], row=i + 2, inherit_from_before=i > 0)
+    keys[i:i] = [key(row) for row in rows]
+    if orders is not None:
+        orders[i:i] = [order(row) for row in rows]
+
+
+def _runs(indices):
+    """정렬된 번호 목록 -> 이어진 구간 [(시작, 끝), ...]"""
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1] = (runs[-1][0], i)
+        else:
+            runs.append((i, i))
+    return runs
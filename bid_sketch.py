@@ -0,0 +1,310 @@
+import os
+import math
+import pickle
+import bisect
+
+import pandas as pd
+
+from bid_cache import CACHE_DIR
+from bid_company import COMPANIES
+from bid_index import record_entry
+from bid_model import Tender, to_ratio
+from bid_db import register_companies
+
+# 합칠 수 있는 요약 통계(스케치): 업체 x 발주처 x 연도 칸마다 기초대비 투찰율(ratio)의
+# 개수/평균/편차제곱합(Welford)/최소/최대 + 분위수용 t-digest 를 유지
+# - 새 입찰 건은 참여업체 수만큼만 갱신하고, 세력/업체/발주처/연도별 값은 칸을 합쳐서 계산
+# - 개수/합/최소/최대/평균/표준편차는 합쳐도 정확하고, 분위수(t-digest)는 근사값
+# - 최소/최대/분위수는 뺄 수 없으므로 바뀌거나 지워진 입찰이 있는 연도만 캐시된 레코드로 다시 합산
+# - 칸 키의 업체 ID 는 입찰결과 DB 가 발급하므로 DB 가 다시 만들어졌으면(토큰이 다르면) 처음부터 다시 합산
+SKETCH_DIR = os.path.join(CACHE_DIR, 'sketch')
+SKETCH_VERSION = 2
+METRICS = ('ratio',)
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+class Moments:
+    """개수/평균/편차제곱합(m2)/최소/최대 (합치면 정확)
+
+    투찰율처럼 평균(0.9 안팎)에 비해 편차가 아주 작은 값은 제곱합 공식(sumsq - total²/n)이 자릿수 상쇄로
+    분산을 잃으므로 Welford 방식으로 누적하고, 칸을 합칠 때는 Chan 의 병렬 공식 사용
+    """
+
+    __slots__ = ('count', 'mu', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mu = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mu
+        self.mu += delta / self.count
+        self.m2 += delta * (x - self.mu)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mu - self.mu
+        self.mu += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean(self):
+        return self.mu if self.count else math.nan
+
+    def std(self):
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(max(self.m2 / (self.count - 1), 0.0))
+
+
+class TDigest:
+    """분위수 근사용 t-digest (merging 방식): 양 끝 분위수일수록 작은 중심점으로 유지"""
+
+    __slots__ = ('compression', 'means', 'weights', 'buffer', 'min', 'max')
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x, w=1.0):
+        self.buffer.append((x, w))
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if len(self.buffer) >= 5 * self.compression:
+            self.compress()
+
+    def merge(self, other):
+        self.buffer.extend(zip(other.means, other.weights))
+        self.buffer.extend(other.buffer)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+
+    def compress(self):
+        if not self.buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self.buffer)
+        self.buffer = []
+        total = sum(w for _, w in points)
+        means, weights = [], []
+        cum = 0.0
+        cur_m, cur_w = points[0]
+        for m, w in points[1:]:
+            q = (cum + cur_w + w / 2) / total
+            if cur_w + w <= max(1.0, 4 * total * q * (1 - q) / self.compression):
+                cur_m += (m - cur_m) * w / (cur_w + w)
+                cur_w += w
+            else:
+                means.append(cur_m)
+                weights.append(cur_w)
+                cum += cur_w
+                cur_m, cur_w = m, w
+        means.append(cur_m)
+        weights.append(cur_w)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q):
+        self.compress()
+        if not self.means:
+            return math.nan
+        if len(self.means) == 1:
+            return self.means[0]
+        total = sum(self.weights)
+        target = q * total
+        # 중심점 위치(누적 가중치 중앙) 사이를 선형 보간, 양 끝은 최소/최대값까지
+        centers, cum = [], 0.0
+        for w in self.weights:
+            centers.append(cum + w / 2)
+            cum += w
+        if target <= centers[0]:
+            return self.min + (self.means[0] - self.min) * (target / centers[0] if centers[0] else 0.0)
+        if target >= centers[-1]:
+            span = total - centers[-1]
+            return self.means[-1] + (self.max - self.means[-1]) * ((target - centers[-1]) / span if span else 0.0)
+        i = bisect.bisect_right(centers, target) - 1
+        frac = (target - centers[i]) / (centers[i + 1] - centers[i])
+        return self.means[i] + (self.means[i + 1] - self.means[i]) * frac
+
+
+class Sketch:
+    __slots__ = ('moments', 'digest')
+
+    def __init__(self):
+        self.moments = Moments()
+        self.digest = TDigest()
+
+    def add(self, x):
+        self.moments.add(x)
+        self.digest.add(x)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        return self
+
+    def stats(self, quantiles=QUANTILES):
+        m = self.moments
+        row = {'count': m.count, 'mean': m.mean(), 'std': m.std(), 'min': m.min, 'max': m.max}
+        for q in quantiles:
+            row[f"p{int(q * 100)}"] = self.digest.quantile(q)
+        return row
+
+
+def tender_values(record):
+    """입찰 건 하나 -> (연도, 발주처, [(업체 ID, 지표, 값), ...])
+
+    ratio: 기초대비(없으면 예가대비)를 비율로
+    """
+    entry = record_entry(record['path'], record)
+    year = int(entry['date'][:4]) if entry['date'] else 0
+    client = entry['client'] or ''
+    values = []
+    # 업체 ID 는 조회만 함 (SketchStore 는 add_record 에서 bid_db 적재 경로로 먼저 등록), ID 가 없는 업체는 제외
+    tender = Tender.from_record(record)
+    for bid, company_id in zip(record['bids'], tender.company_id):
+        if company_id == -1:
+            continue
+        ratio = to_ratio(bid['base_ratio'])
+        if ratio is None:
+            ratio = to_ratio(bid['yega_ratio'])
+        if ratio is not None:
+            values.append((int(company_id), 'ratio', ratio))
+    return year, client, values
+
+
+class SketchStore:
+    """업체 x 발주처 x 연도 칸별 스케치 + 반영된 입찰 목록 (경로 -> [크기, 수정시각, 연도])
+
+    store = SketchStore('analyze_factions')
+    store.update(load_tenders(paths), removed=changes['removed']); store.save()
+    store.frame(lambda cid, client, year: faction_of(cid)[1], 'ratio')
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.cells = {}     # (업체 ID, 발주처, 연도) -> {지표: Sketch}
+        self.applied = {}
+        if name:
+            self._load()
+
+    def _file(self):
+        return os.path.join(SKETCH_DIR, f"{self.name}.pkl")
+
+    def _load(self):
+        try:
+            with open(self._file(), 'rb') as fh:
+                state = pickle.load(fh)
+        except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+            # 예전 버전 스케치(칸 클래스 구조가 다름)는 처음부터 다시 합산
+            return
+        if state.get('version') == SKETCH_VERSION and state.get('token') == COMPANIES.token():
+            self.cells, self.applied = state['cells'], state['applied']
+
+    def save(self):
+        os.makedirs(SKETCH_DIR, exist_ok=True)
+        tmp = self._file() + '.tmp'
+        with open(tmp, 'wb') as fh:
+            pickle.dump({'version': SKETCH_VERSION, 'token': COMPANIES.token(), 'cells': self.cells,
+                         'applied': self.applied}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._file())
+
+    def add_record(self, record):
+        """입찰 건 하나 반영 (참여업체 수만큼만 갱신), 반환: 연도"""
+        # 칸 키가 업체 ID 이므로 처음 보는 업체는 입찰결과 DB 에 먼저 등록 (DB 적재와 같은 ID)
+        register_companies(record, COMPANIES)
+        year, client, values = tender_values(record)
+        for company_id, metric, value in values:
+            cell = self.cells.setdefault((company_id, client, year), {})
+            cell.setdefault(metric, Sketch()).add(value)
+        return year
+
+    def update(self, results, removed=(), current=None):
+        """load_tenders 결과 (path, record) 반영 (이미 반영된 같은 파일은 건너뜀)
+
+        removed: 지워진 파일 경로, current 를 주면 그 목록에 없는 반영 파일도 지워진 것으로 처리
+        """
+        from bid_pool import load_tenders
+
+        if current is not None:
+            current = {os.path.abspath(p) for p in current}
+            removed = list(removed) + [p for p in self.applied if p not in current]
+        dirty = set()
+        fresh = {}
+        for path, record in results:
+            if record is None:
+                continue
+            key = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            old = self.applied.get(key)
+            if old is not None and old[:2] == [st.st_size, st.st_mtime_ns]:
+                continue
+            if old is not None:
+                dirty.add(old[2])
+            fresh[key] = ([st.st_size, st.st_mtime_ns], record)
+        for path in removed:
+            old = self.applied.pop(os.path.abspath(path), None)
+            if old is not None:
+                dirty.add(old[2])
+
+        if dirty:
+            # 바뀐/지워진 입찰이 있는 연도는 칸을 비우고 그 연도 입찰 전체를 다시 합산
+            self.cells = {key: cell for key, cell in self.cells.items() if key[2] not in dirty}
+            redo = [p for p, (_, _, year) in self.applied.items() if year in dirty and p not in fresh]
+            for path, record in load_tenders(redo):
+                if record is None:
+                    self.applied.pop(path, None)
+                    continue
+                self.add_record(record)
+        for key, (stat, record) in fresh.items():
+            self.applied[key] = stat + [self.add_record(record)]
+        if fresh or dirty:
+            print(f"스케치 갱신: 입찰 {len(fresh)}건 추가, 다시 합산한 연도 {len(dirty)}개")
+        return len(fresh)
+
+    def merge(self, other):
+        """다른 스캔의 스케치를 합침 (같은 입찰을 두 번 합치지 않도록 반영 목록이 겹치지 않아야 함)"""
+        for key, cell in other.cells.items():
+            mine = self.cells.setdefault(key, {})
+            for metric, sketch in cell.items():
+                mine.setdefault(metric, Sketch()).merge(sketch)
+        self.applied.update(other.applied)
+        return self
+
+    def rollup(self, key_fn, metric):
+        """key_fn(업체 ID, 발주처, 연도) -> 묶음 키 (None 이면 제외) 별로 칸을 합친 스케치"""
+        groups = {}
+        for (company_id, client, year), cell in self.cells.items():
+            sketch = cell.get(metric)
+            if sketch is None:
+                continue
+            key = key_fn(company_id, client, year)
+            if key is None:
+                continue
+            groups.setdefault(key, Sketch()).merge(sketch)
+        return groups
+
+    def frame(self, key_fn, metric, names=('Key',), quantiles=QUANTILES):
+        """rollup 결과 -> DataFrame (키 열 + count/mean/std/min/max/p10/p50/p90)"""
+        rows = []
+        for key, sketch in self.rollup(key_fn, metric).items():
+            key = key if isinstance(key, tuple) else (key,)
+            rows.append(dict(zip(names, key), **sketch.stats(quantiles)))
+        return pd.DataFrame(rows, columns=list(names) + ['count', 'mean', 'std', 'min', 'max']
+                            + [f"p{int(q * 100)}" for q in quantiles])
@@ -0,0 +1,89 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+# 분석 결과(analysis / winners / summary)를 CSV 대신 Parquet 로 저장하는 열 저장소
+# - analysis / winners: 입찰 연/월 폴더로 나눠 저장 (Year=2025/Month=3/...), 날짜를 모르면 Year=0/Month=0
+# - File/Company/Faction 같은 반복 문자열은 사전(dictionary) 인코딩 -> 파일명은 파일마다 한 번만 저장
+# 읽을 때는 필요한 열과 연/월 파티션만 골라 읽음
+STORE_DIR = r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_store"
+
+PARTITIONING = ds.partitioning(pa.schema([('Year', pa.int16()), ('Month', pa.int8())]), flavor='hive')
+PARTITION_COLUMNS = ['Year', 'Month']
+DICTIONARY_COLUMNS = ['File', 'Path', 'Company', 'Faction', 'WinnerCompany', 'WinnerFaction']
+
+
+def table_dir(name, store_dir=None):
+    return os.path.join(store_dir or STORE_DIR, name)
+
+
+def table_exists(name, store_dir=None):
+    return os.path.isdir(table_dir(name, store_dir))
+
+
+def date_partition(date_str):
+    """'YYYY-MM-DD' -> (Year, Month), 모르면 (0, 0)"""
+    if not date_str:
+        return 0, 0
+    return int(date_str[:4]), int(date_str[5:7])
+
+
+def write_table(name, df, store_dir=None):
+    """DataFrame 을 저장소 테이블로 통째로 교체 (Year/Month 열이 있으면 연/월 파티션으로 나눔)
+
+    임시 폴더에 다 쓴 뒤 바꿔치기하므로 쓰는 중에 실패해도 이전 테이블은 그대로 남음
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in DICTIONARY_COLUMNS:
+        if col in table.column_names and not pa.types.is_dictionary(table.schema.field(col).type):
+            idx = table.column_names.index(col)
+            table = table.set_column(idx, col, pc.dictionary_encode(table[col].cast(pa.string())))
+
+    partitioned = all(col in table.column_names for col in PARTITION_COLUMNS)
+    if partitioned:
+        for col, typ in zip(PARTITION_COLUMNS, (pa.int16(), pa.int8())):
+            idx = table.column_names.index(col)
+            table = table.set_column(idx, col, table[col].cast(typ))
+
+    target = table_dir(name, store_dir)
+    tmp = target + '.tmp'
+    old = target + '.old'
+    shutil.rmtree(tmp, ignore_errors=True)
+    ds.write_dataset(table, tmp, format='parquet', basename_template='part-{i}.parquet',
+                     partitioning=PARTITIONING if partitioned else None)
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(target):
+        os.replace(target, old)
+    os.replace(tmp, target)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def read_table(name, columns=None, years=None, months=None, categorical=True, store_dir=None):
+    """저장소 테이블 -> DataFrame
+
+    columns: 읽을 열만 (None 이면 전체), years/months: 읽을 연/월 파티션 (예: years=[2025, 2026])
+    categorical=False 면 사전 인코딩 열을 일반 문자열(object) 열로 반환
+    """
+    path = table_dir(name, store_dir)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(path)
+    partitioned = any(entry.startswith('Year=') for entry in os.listdir(path))
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING if partitioned else None)
+
+    expr = None
+    for col, values in (('Year', years), ('Month', months)):
+        if values is not None and col in dataset.schema.names:
+            cond = ds.field(col).isin(list(values))
+            expr = cond if expr is None else expr & cond
+    table = dataset.to_table(columns=columns, filter=expr)
+
+    df = table.to_pandas()
+    if not categorical:
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+    return df
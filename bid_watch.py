@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import zipfile
+import argparse
+import threading
+import subprocess
+
+from bid_cache import list_workbooks, is_workbook
+from bid_db import connect, store_record
+from bid_pool import load_tenders, parse_jobs
+from bid_manifest import load_manifest, save_manifest, scan_changes, update_manifest
+
+try:
+    # watchdog 이 있으면 OS 파일 이벤트(inotify / ReadDirectoryChangesW) 사용, 없으면 주기적 폴링
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 감시 폴더 -> 새 입찰결과가 들어오면 순서대로 실행할 스크립트
+# (새 파일은 먼저 캐시와 입찰결과 DB 에 넣어두므로 각 스크립트는 바로 조회)
+# 시트 스크립트는 --incremental 로 새/바뀐 파일의 행만 고치거나 끼워 넣음
+# process_bids 는 공구별 열 묶음이 몇 개 안 되는 요약표라 (공구가 늘면 열 배치가 통째로 바뀜) 캐시된 레코드로 다시 씀
+PIPELINES = {
+    r"E:\인프라수주팀\트레이닝\24년이후 입찰결과": [
+        ['analyze_factions.py', '--incremental'],
+        ['create_bids_sheet.py', '--incremental'],
+        ['upload_hanwha_bids_v5.py', '--incremental'],
+        ['fix_bidder_count_sheet1_v4.py', '--incremental'],
+    ],
+    r"E:\인프라수주팀\입찰결과분석": [
+        ['process_bids.py'],
+    ],
+}
+
+# --rebuild: 시트 전체를 지우고 다시 쓰는 실행 (증분 결과가 어긋났을 때), 파이프라인 대신 실행
+REBUILDS = {
+    r"E:\인프라수주팀\트레이닝\24년이후 입찰결과": [
+        ['analyze_factions.py'],
+        ['create_bids_sheet.py'],
+        ['upload_hanwha_bids_v5.py'],
+        ['fix_bidder_count_sheet1_v4.py'],
+    ],
+    r"E:\인프라수주팀\입찰결과분석": [
+        ['process_bids.py'],
+    ],
+}
+
+POLL_SECONDS = 5      # 폴링 모드 스캔 주기
+SETTLE_SECONDS = 3    # 크기/수정시각이 이 시간 동안 그대로여야 복사/저장이 끝난 것으로 봄
+
+
+def file_state(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def is_complete(path):
+    """엑셀에서 열려 있거나(~$ 잠금 파일) 아직 쓰는 중인 zip(xlsx/xlsb) 은 제외"""
+    folder, name = os.path.split(path)
+    if os.path.exists(os.path.join(folder, '~$' + name)):
+        return False
+    if path.lower().endswith(('.xlsx', '.xlsb', '.xlsm')):
+        return zipfile.is_zipfile(path)
+    return True
+
+
+class FolderWatcher:
+    """폴더 하나의 새/변경 워크북을 모아두었다가 쓰기가 끝난(안정된) 파일만 돌려줌
+
+    처리한 파일은 감시용 매니페스트에 남기고, 시작할 때 매니페스트와 폴더를 비교해서
+    감시가 꺼져 있는 동안 들어오거나 바뀐 파일도 대기 목록에 넣음 (지워진 파일은 removed)
+    """
+
+    def __init__(self, base_dir, settle=SETTLE_SECONDS):
+        self.base_dir = base_dir
+        self.settle = settle
+        self.name = 'bid_watch ' + os.path.abspath(base_dir)
+        self.manifest = load_manifest(self.name)
+        changes = scan_changes(list_workbooks(base_dir), self.manifest, base_dir)
+        self.known = {path: (entry['size'], entry['mtime_ns']) for path, entry in self.manifest.items()}
+        self.removed = changes['removed']
+        self.pending = {}  # path -> (state, 마지막으로 바뀐 시각)
+        self.lock = threading.Lock()
+        for path in changes['added'] + changes['modified']:
+            self.touch(path)
+        if self.pending or self.removed:
+            print(f"{base_dir}: 감시 중지 동안 추가/수정 {len(self.pending)}개, 삭제 {len(self.removed)}개")
+
+    def touch(self, path):
+        if not is_workbook(os.path.basename(path)):
+            return
+        path = os.path.abspath(path)
+        state = file_state(path)
+        if state is None or self.known.get(path) == state:
+            return
+        with self.lock:
+            if path not in self.pending or self.pending[path][0] != state:
+                self.pending[path] = (state, time.monotonic())
+
+    def poll(self):
+        for path in list_workbooks(self.base_dir):
+            self.touch(path)
+
+    def settled(self):
+        now = time.monotonic()
+        ready = []
+        with self.lock:
+            for path, (state, since) in list(self.pending.items()):
+                current = file_state(path)
+                if current is None:
+                    del self.pending[path]
+                elif current != state:
+                    self.pending[path] = (current, now)
+                elif now - since >= self.settle and is_complete(path):
+                    ready.append(path)
+                    self.known[path] = state
+                    del self.pending[path]
+        return sorted(ready)
+
+    def commit(self, results):
+        """파이프라인을 돌린 파일 (path, record) 과 지워진 파일을 매니페스트에 반영"""
+        update_manifest(self.manifest, results, {'hashes': {}, 'removed': self.removed})
+        self.removed = []
+        save_manifest(self.name, self.manifest)
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        self.watcher.touch(getattr(event, 'dest_path', None) or event.src_path)
+
+
+def run_pipeline(paths, commands, dry_run=False, jobs=1):
+    """새 파일을 워커 풀로 파싱(시간/메모리 상한, 실패 파일 격리)해서 DB 에 넣은 뒤 스크립트 실행, (path, record) 목록 반환"""
+    print(f"\n[{time.strftime('%H:%M:%S')}] 새 입찰결과 {len(paths)}개")
+    results = load_tenders(paths, jobs)
+    conn = connect()
+    for path, record in results:
+        if record is None:
+            print(f"  Skipping {os.path.basename(path)} (파싱 실패, 격리됨)")
+            continue
+        with conn:
+            store_record(conn, record)
+        print(f"  파싱 완료: {record['file']} (투찰 {len(record['bids'])}건)")
+    conn.close()
+
+    for cmd in commands:
+        args = [sys.executable, os.path.join(SCRIPT_DIR, cmd[0])] + cmd[1:] + ['--jobs', str(jobs)]
+        print(f"  실행: {' '.join(cmd)}")
+        if dry_run:
+            continue
+        started = time.monotonic()
+        result = subprocess.run(args, cwd=SCRIPT_DIR)
+        status = "완료" if result.returncode == 0 else f"실패 (exit {result.returncode})"
+        print(f"  {cmd[0]} {status} ({time.monotonic() - started:.1f}s)")
+    return results
+
+
+def watch(pipelines, use_events=True, interval=POLL_SECONDS, dry_run=False, rebuilds=None, jobs=1):
+    """rebuilds 를 주면 폴더별로 파이프라인 대신 그 스크립트(전체 다시 쓰기)를 실행"""
+    commands = {base_dir: (rebuilds or {}).get(base_dir, cmds) for base_dir, cmds in pipelines.items()}
+    watchers = {}
+    for base_dir in pipelines:
+        if os.path.isdir(base_dir):
+            watchers[base_dir] = FolderWatcher(base_dir)
+        else:
+            print(f"감시 폴더 없음, 건너뜀: {base_dir}")
+    if not watchers:
+        return
+
+    observer = None
+    if use_events and Observer is not None:
+        observer = Observer()
+        for base_dir, watcher in watchers.items():
+            observer.schedule(_EventHandler(watcher), base_dir, recursive=True)
+        observer.start()
+        print(f"파일 이벤트 감시 시작 ({len(watchers)}개 폴더)")
+    else:
+        print(f"폴링 감시 시작 ({len(watchers)}개 폴더, {interval}s 간격)")
+
+    last_poll = 0.0
+    try:
+        while True:
+            if observer is None and time.monotonic() - last_poll >= interval:
+                for watcher in watchers.values():
+                    watcher.poll()
+                last_poll = time.monotonic()
+            for base_dir, watcher in watchers.items():
+                ready = watcher.settled()
+                if ready or watcher.removed:
+                    watcher.commit(run_pipeline(ready, commands[base_dir], dry_run, jobs))
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("감시 종료")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="입찰결과 폴더 감시: 새 파일이 들어오면 파싱 → 분석 → 시트 업로드")
+    parser.add_argument('--poll', action='store_true', help="파일 이벤트 대신 폴링 사용")
+    parser.add_argument('--interval', type=float, default=POLL_SECONDS, help="폴링 간격(초)")
+    parser.add_argument('--dry-run', action='store_true', help="스크립트는 실행하지 않고 파싱만")
+    parser.add_argument('--rebuild', action='store_true', help="증분 반영 대신 시트 전체를 다시 씀 (느림)")
+    jobs, rest = parse_jobs()
+    args = parser.parse_args(rest)
+    watch(PIPELINES, use_events=not args.poll, interval=args.interval, dry_run=args.dry_run,
+          rebuilds=REBUILDS if args.rebuild else None, jobs=jobs)
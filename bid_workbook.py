@@ -0,0 +1,128 @@
+import openpyxl
+import pandas as pd
+
+from bid_biff12 import Biff12Book
+
+# 워크북 파일은 한 번만 열고, 시트 목록/시트 데이터는 실제로 요청할 때만 읽음
+# (pd.read_excel(sheet_name=None) 처럼 모든 시트를 디코딩하거나 시트마다 파일을 다시 여는 것을 피하기 위함)
+
+
+def pick_main_sheet(sheet_names):
+    """입찰결과 시트 선택: '입찰결과' > '기초'가 아닌 첫 시트 > 첫 시트"""
+    if '입찰결과' in sheet_names:
+        return '입찰결과'
+    for sn in sheet_names:
+        if "기초" not in sn:
+            return sn
+    return sheet_names[0]
+
+
+def _pad(values, max_col):
+    if max_col is None:
+        return values
+    values = values[:max_col]
+    values.extend([None] * (max_col - len(values)))
+    return values
+
+
+def _xlsb_rows(book, sheet, max_col, start, stop):
+    # BIFF12 레코드를 직접 읽음 (빈 행은 건너뛰므로 행번호는 셀 좌표 기준)
+    return book.rows(sheet, max_col=max_col, start=start, stop=stop)
+
+
+def _xlsx_rows(book, sheet, max_col, start, stop):
+    ws = book[sheet]
+    # 다른 프로그램이 저장한 xlsx 는 dimension 정보가 틀린 경우가 있어 실제 행 기준으로 읽음
+    ws.reset_dimensions()
+    rows = ws.iter_rows(min_row=start + 1, max_row=stop, max_col=max_col, values_only=True)
+    for r_idx, row in enumerate(rows, start):
+        yield r_idx, _pad([None if v == '' else v for v in row], max_col)
+
+
+def _xls_rows(book, sheet, max_col, start, stop):
+    # xls(xlrd) 는 스트리밍이 안 되므로 필요한 행 수만큼만 DataFrame 으로 변환
+    df = book.parse(sheet, header=None, nrows=stop)
+    for r_idx, row in enumerate(df.itertuples(index=False)):
+        if r_idx < start:
+            continue
+        values = [None if (not isinstance(v, str) and pd.isna(v)) else v for v in row]
+        yield r_idx, _pad(values, max_col)
+
+
+class Workbook:
+    """입찰결과 워크북 핸들 (xlsb/xlsx/xls 공통)
+
+    with Workbook(path) as wb:
+        for r_idx, values in wb.rows(wb.main_sheet(), max_col=24, stop=50): ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        lower = path.lower()
+        if lower.endswith('.xlsb'):
+            self.kind = 'xlsb'
+        elif lower.endswith(('.xlsx', '.xlsm')):
+            self.kind = 'xlsx'
+        else:
+            self.kind = 'xls'
+        self._book = None
+        self._sheet_names = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open(self):
+        if self._book is None:
+            if self.kind == 'xlsb':
+                self._book = Biff12Book(self.path)
+            elif self.kind == 'xlsx':
+                self._book = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+            else:
+                self._book = pd.ExcelFile(self.path)
+        return self._book
+
+    def close(self):
+        if self._book is not None:
+            self._book.close()
+            self._book = None
+
+    @property
+    def sheet_names(self):
+        if self._sheet_names is None:
+            book = self._open()
+            if self.kind == 'xlsb':
+                self._sheet_names = list(book.sheets)
+            elif self.kind == 'xlsx':
+                self._sheet_names = list(book.sheetnames)
+            else:
+                self._sheet_names = list(book.sheet_names)
+        return self._sheet_names
+
+    def main_sheet(self):
+        return pick_main_sheet(self.sheet_names)
+
+    def rows(self, sheet, max_col=None, start=0, stop=None):
+        """시트의 start <= 행번호 < stop 범위를 (행번호, 값 목록) 으로 반환 (stop 이후 행은 읽지 않음)
+
+        max_col 을 주면 값 목록을 그 길이로 자르거나 None 으로 채움. xlsb 는 빈 행을 건너뜀.
+        """
+        if sheet not in self.sheet_names:
+            raise KeyError(f"시트 없음: {sheet}")
+        book = self._open()
+        if self.kind == 'xlsb':
+            return _xlsb_rows(book, sheet, max_col, start, stop)
+        elif self.kind == 'xlsx':
+            return _xlsx_rows(book, sheet, max_col, start, stop)
+        return _xls_rows(book, sheet, max_col, start, stop)
+
+    def frame(self, sheet, max_col=None, start=0, stop=None):
+        """행 범위를 빈 행까지 채운 DataFrame 으로 반환 (index = 0 기준 행번호, header=None 과 동일)"""
+        data = []
+        for r_idx, values in self.rows(sheet, max_col=max_col, start=start, stop=stop):
+            while start + len(data) < r_idx:
+                data.append([])
+            data.append(values)
+        return pd.DataFrame(data, index=range(start, start + len(data)))
@@ -1,10 +1,13 @@
 import gspread
 from google.oauth2.service_account import Credentials
 import os
-import pandas as pd
+from bid_cache import format_excel_date
+from bid_pool import load_tenders, parse_jobs
+from bid_manifest import parse_incremental, select_targets, update_manifest, save_manifest
+from bid_sheet import upsert_rows
 import sys
 import re
-from gspread_formatting import format_cell_range, CellFormat, TextFormat, Color, NumberFormat, set_column_width, Borders, Border
+from gspread_formatting import format_cell_range, format_cell_ranges, CellFormat, TextFormat, Color, NumberFormat, set_column_width, Borders, Border
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -17,188 +20,109 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive'
 ]
 
-def format_excel_date(excel_date):
-    if pd.isna(excel_date) or str(excel_date).strip() == "": return ""
-    try:
-        dt = pd.to_datetime('1899-12-30') + pd.to_timedelta(float(excel_date), unit='D')
-        if dt.hour == 0 and dt.minute == 0:
-            return dt.strftime('%Y/%m/%d')
-        else:
-            return dt.strftime('%Y/%m/%d %H:%M')
-    except:
-        return str(excel_date)
-
-def get_bid_date(file_path):
-    try:
-        df_info = pd.read_excel(file_path, engine='pyxlsb', sheet_name='기초정보', header=None)
-        
-        r1_val = None
-        try:
-            r1_val = df_info.iloc[0, 17]
-        except:
-            pass
-            
-        date_str = format_excel_date(r1_val)
-        if date_str:
-            return date_str
-            
-        for idx, row in df_info.iterrows():
-            for col_idx, cell in enumerate(row):
-                if str(cell).replace(" ", "") == "입찰마감":
-                    next_val = row[col_idx + 1] if col_idx + 1 < len(row) else None
-                    if next_val and not pd.isna(next_val):
-                        return format_excel_date(next_val)
-                    
-        return ""
-    except Exception as e:
-        print(f"[{os.path.basename(file_path)}] Failed to read 기초정보: {e}")
-        return ""
-
-def process_file_rank1(file_path):
+def process_file_rank1(file_path, record):
     try:
         filename = os.path.basename(file_path)
+        info = record['info']
         
-        # 1. Fetch info from "기초정보" sheet
-        bid_date_str = get_bid_date(file_path)
-            
-        # 2. Main sheet parsing
-        main_sheet_name = None
-        xls = pd.ExcelFile(file_path, engine='pyxlsb')
-        for sn in xls.sheet_names:
-            if "기초" not in sn:
-                main_sheet_name = sn
-                break
+        # 1. 입찰일시: "기초정보" 시트의 입찰마감 (캐시 레코드)
+        bid_date_str = format_excel_date(info['입찰마감'])
         
-        if not main_sheet_name:
-            main_sheet_name = xls.sheet_names[0]
-            
-        df = pd.read_excel(file_path, engine='pyxlsb', sheet_name=main_sheet_name, header=None)
-        
-        decision_method = ""
-        try:
-            val_v1 = df.iloc[0, 21]
-            if not pd.isna(val_v1):
-                decision_method = str(val_v1).strip()
-        except:
-            pass
-        
-        project_name = ""
-        client_str = ""
-        estimated_price = 0 # 예정가격
-        base_amount = 0 # 기초금액
-        balance_price = 0 # 균형가격
-        header_row_idx = -1
-        
-        for idx, row in df.head(30).iterrows():
-            c0 = str(row[0]).replace(" ", "")
-            if c0 == "공사명":
-                project_name = str(row[2]).strip() if not pd.isna(row[2]) else ""
-            elif c0 == "발주처":
-                client_str = str(row[2]).strip() if not pd.isna(row[2]) else ""
-            elif c0 == "순위":
-                header_row_idx = idx
-                break
-                
-            # Search for base_amount (기초금액) and balance_price (균형가격)
-            for c_idx, cell in enumerate(row):
-                cell_str = str(cell).replace(" ", "")
-                if "기초금액" in cell_str:
-                    try:
-                        # usually in I4. In our loop, we look for the next numeric value in the same row
-                        # but in the user test it was exactly at I4 and value was at I4. Let's just grab row[8] (index 8 is I)
-                        # Wait, the label "기초금액" was at G4 (col 6), and value was at I4 (col 8).
-                        # Let's just robustly grab I4 and I6 directly by index.
-                        pass
-                    except:
-                        pass
+        # 2. 입찰결과 헤더 정보 (V1 결정방식, 공사명, 발주처, I4/I5/I6 금액)
+        decision_method = str(info['결정방식']).strip() if info['결정방식'] is not None else ""
+        project_name = str(info['공사명']).strip() if info['공사명'] is not None else ""
+        client_str = str(info['발주처']).strip() if info['발주처'] is not None else ""
+        base_amount = info['기초금액'] or 0 # 기초금액
+        estimated_price = info['예정가격'] or 0 # 예정가격
+        balance_price = info['균형가격'] or 0 # 균형가격
         
-        try:
-            # I4 is index 3, 8
-            # I5 is index 4, 8
-            # I6 is index 5, 8
-            base_val = df.iloc[3, 8]
-            est_val = df.iloc[4, 8]
-            bal_val = df.iloc[5, 8]
-            if not pd.isna(base_val): base_amount = float(base_val)
-            if not pd.isna(est_val): estimated_price = float(est_val)
-            if not pd.isna(bal_val): balance_price = float(bal_val)
-        except Exception as e:
-            print(f"Error extracting I4/I5/I6 for {filename}: {e}")
-        
-        if header_row_idx == -1: return None
-
-        data_df = df.iloc[header_row_idx+1:].copy()
+        if not record['headers']: return None
         
         note_str = ""
         match_note = re.search(r'\((.*?)\)', filename)
         if match_note:
             note_str = match_note.group(1).strip()
             
-        for _, row in data_df.iterrows():
-            try:
-                if len(row) <= 13: continue 
-                n_col = row[13] 
-                if pd.isna(n_col): continue
-                
-                n_str = str(n_col).strip()
-                
-                if n_str == "1" or n_str == "1.0":
-                    company = str(row[1]).strip()
-                    amount = float(row[2]) 
-                    
-                    ratio = "-"
-                    try:
-                        r = row[4] 
-                        if not pd.isna(r):
-                            ratio_val = float(r) * 100
-                            ratio = round(ratio_val, 4)
-                    except:
-                        pass
+        for bid in record['bids']:
+            if bid['priority'] != 1 or bid['amount'] is None: continue
+            
+            company = bid['company']
+            amount = bid['amount']
+            
+            ratio = "-"
+            if bid['base_ratio'] is not None:
+                ratio = round(bid['base_ratio'] * 100, 4)
+            
+            if not project_name:
+                match = re.search(r'\)(.*?)(?:_Rev|\.xlsb)', filename)
+                if match:
+                    project_name = match.group(1).strip()
+                else:
+                    project_name = filename.replace('.xlsb', '').strip()
                     
-                    if not project_name:
-                        match = re.search(r'\)(.*?)(?:_Rev|\.xlsb)', filename)
-                        if match:
-                            project_name = match.group(1).strip()
-                        else:
-                            project_name = filename.replace('.xlsb', '').strip()
-                            
-                    clean_client = client_str
-                    if "조달청(" in client_str and client_str.endswith(")"):
-                        clean_client = client_str.replace("조달청(", "").rstrip(")")
-                        
-                    return {
-                        'date': bid_date_str,
-                        'project': project_name,
-                        'client': clean_client,
-                        'company': company,
-                        'decision_method': decision_method,
-                        'amount': int(amount),
-                        'estimated_price': int(estimated_price) if estimated_price else 0,
-                        'base_amount': int(base_amount) if base_amount else 0,
-                        'balance_price': int(balance_price) if balance_price else 0,
-                        'ratio': ratio,
-                        'note': note_str
-                    }
-            except Exception as e:
-                continue
+            clean_client = client_str
+            if "조달청(" in client_str and client_str.endswith(")"):
+                clean_client = client_str.replace("조달청(", "").rstrip(")")
+                
+            return {
+                'date': bid_date_str,
+                'project': project_name,
+                'client': clean_client,
+                'company': company,
+                'decision_method': decision_method,
+                'amount': int(amount),
+                'estimated_price': int(estimated_price) if estimated_price else 0,
+                'base_amount': int(base_amount) if base_amount else 0,
+                'balance_price': int(balance_price) if balance_price else 0,
+                'ratio': ratio,
+                'note': note_str
+            }
                 
     except Exception as e:
         print(f"Error parsing {file_path}: {e}")
         return None
     return None
 
-def main():
+def row_key(row):
+    # 시트 행 키: 입찰일시(A) + 공고명(B) (시트에서 읽은 값과 같도록 문자열)
+    return f"{row[0]}\t{row[1]}"
+
+def row_order(row):
+    return (str(row[0]), str(row[1]))
+
+def data_formats(ranges):
+    """데이터 행 서식 (ranges: [(시작 행, 끝 행), ...])"""
+    num_fmt = CellFormat(numberFormat=NumberFormat(type='NUMBER', pattern='#,##0'))
+    ratio_fmt = CellFormat(numberFormat=NumberFormat(type='NUMBER', pattern='0.0###'))
+    border_style = Border(style='SOLID', color=Color(0.8, 0.8, 0.8))
+    border_fmt = CellFormat(borders=Borders(top=border_style, bottom=border_style, left=border_style, right=border_style))
+    formats = []
+    for first, last in ranges:
+        # Money format for F, G, H, L (예정가격, 기초금액, 균형가격, 투찰금액)
+        formats.append((f"F{first}:H{last}", num_fmt))
+        formats.append((f"L{first}:L{last}", num_fmt))
+        # Ratio format for I, J, K (예정/기초, 균형/기초, 투찰/기초)
+        formats.append((f"I{first}:K{last}", ratio_fmt))
+        formats.append((f"A{first}:M{last}", border_fmt))
+    return formats
+
+def main(jobs=1, incremental=False):
     print("--- Parsing local .xlsb files for Rank 1 Winner Data & Add Base/Balance ---")
     xlsb_files = []
     for root, dirs, files in os.walk(BASE_DIR):
         for file in files:
             if file.startswith("입찰결과") and file.endswith(".xlsb"):
                 xlsb_files.append(os.path.join(root, file))
-                
+    # --incremental: 추가/수정된 파일의 행만 만들어서 시트에 끼워 넣고, 지워진 파일의 행은 삭제
+    targets, manifest, changes = select_targets('create_bids_sheet', xlsb_files, incremental, BASE_DIR)
+
     results = []
-    for file_path in xlsb_files:
-        data = process_file_rank1(file_path)
+    loaded = load_tenders(targets, jobs)
+    for file_path, record in loaded:
+        if record is None: continue
+        data = process_file_rank1(file_path, record)
         if data:
+            data['path'] = os.path.abspath(file_path)
             results.append(data)
             
     results.sort(key=lambda x: (x['date'], x['project']))
@@ -262,6 +186,25 @@ def main():
     credentials = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=SCOPES)
     gc = gspread.authorize(credentials)
     
+    if incremental:
+        try:
+            worksheet = gc.open_by_key(SHEET_ID).sheet1
+            # 수정/삭제된 파일이 예전에 쓴 행 (매니페스트에 기록해 둔 행 키)
+            stale = {manifest[os.path.abspath(p)].get('row_key') for p in changes['modified'] + changes['removed']
+                     if os.path.abspath(p) in manifest}
+            touched = upsert_rows(worksheet, upload_rows[1:], row_key, stale, row_order)
+            if touched:
+                format_cell_ranges(worksheet, data_formats([(r, r) for r in touched.values()]))
+        except Exception as e:
+            print(f"Error accessing Google Sheet: {e}")
+            return
+        update_manifest(manifest, loaded, changes)
+        for r, row in zip(results, upload_rows[1:]):
+            manifest[r['path']]['row_key'] = row_key(row)
+        save_manifest('create_bids_sheet', manifest)
+        print("Incremental sheet update complete!")
+        return
+
     try:
         sh = gc.open_by_key(SHEET_ID)
         worksheet = sh.sheet1
@@ -279,20 +222,11 @@ def main():
         )
         format_cell_range(worksheet, "A1:M1", header_fmt)
         
-        # Money format for F, G, H, L (예정가격, 기초금액, 균형가격, 투찰금액)
-        num_fmt = CellFormat(numberFormat=NumberFormat(type='NUMBER', pattern='#,##0'))
-        format_cell_range(worksheet, f"F2:H{total_rows}", num_fmt)
-        format_cell_range(worksheet, f"L2:L{total_rows}", num_fmt)
-        
-        # Ratio format for I, J, K (예정/기초, 균형/기초, 투찰/기초)
-        ratio_fmt = CellFormat(numberFormat=NumberFormat(type='NUMBER', pattern='0.0###'))
-        format_cell_range(worksheet, f"I2:K{total_rows}", ratio_fmt)
-        
-        # Borders
+        # 숫자/비율 서식과 테두리 (증분 실행에서 새 행에도 같은 서식 사용)
+        format_cell_ranges(worksheet, data_formats([(2, total_rows)]))
         border_style = Border(style='SOLID', color=Color(0.8, 0.8, 0.8))
         full_borders = Borders(top=border_style, bottom=border_style, left=border_style, right=border_style)
-        border_fmt = CellFormat(borders=full_borders)
-        format_cell_range(worksheet, f"A1:M{total_rows}", border_fmt)
+        format_cell_range(worksheet, "A1:M1", CellFormat(borders=full_borders))
         
         # Column Widths
         set_column_width(worksheet, 'A', 130) # Date
@@ -315,4 +249,6 @@ def main():
         print(f"Error accessing Google Sheet: {e}")
 
 if __name__ == "__main__":
-    main()
+    jobs, rest = parse_jobs()
+    incremental, _ = parse_incremental(rest)
+    main(jobs, incremental)
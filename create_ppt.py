@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -7,6 +8,7 @@ from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 import math
+from bid_store import read_table, table_exists
 
 # 한국어 폰트 설정
 plt.rc('font', family='Malgun Gothic')
@@ -26,24 +28,21 @@ def add_p(tf, text, level=0, bold=False, size=12):
 
 def create_ppt():
     # 1. Load Data
-    summary_path = r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_summary.csv"
-    raw_data_path = r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_analysis.csv"
-    
-    if not os.path.exists(summary_path) or not os.path.exists(raw_data_path):
+    # analyze_factions.py 가 만든 Parquet 저장소에서 필요한 열만 읽음
+    if not table_exists('summary') or not table_exists('analysis'):
         print(f"Error: Data file not found")
         return
         
-    df_summary = pd.read_csv(summary_path)
+    df_summary = read_table('summary', categorical=False)
     df_summary = df_summary.dropna(subset=['mean'])
     df_summary['mean_pct'] = df_summary['mean'] * 100
 
-    df_raw = pd.read_csv(raw_data_path)
+    df_raw = read_table('analysis', columns=['File', 'Faction', 'Ratio'], categorical=False)
     df_raw = df_raw.dropna(subset=['Ratio'])
     df_raw['Ratio_pct'] = df_raw['Ratio'] * 100
 
-    winners_path = r"E:\인프라수주팀\트레이닝\프로젝트1\bidding_winners.csv"
-    if os.path.exists(winners_path):
-        df_winners = pd.read_csv(winners_path)
+    if table_exists('winners'):
+        df_winners = read_table('winners', columns=['File', 'WinnerCompany', 'WinnerFaction'], categorical=False)
     else:
         df_winners = pd.DataFrame(columns=['File', 'WinnerCompany', 'WinnerFaction'])
 
@@ -318,4 +317,8 @@ def create_ppt():
         print(f"PPT 생성 완료: {output_path_v2}")
 
 if __name__ == "__main__":
+    # 보고서는 parquet 저장소 전체 집계로 차트/표를 그리므로 부분 갱신할 단위가 없음
+    if '--incremental' in sys.argv[1:]:
+        print("오류: create_ppt.py 는 --incremental 을 지원하지 않습니다. 옵션 없이 실행하면 보고서를 다시 만듭니다.")
+        sys.exit(2)
     create_ppt()
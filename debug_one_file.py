@@ -1,6 +1,6 @@
 import os
 import sys
-import pandas as pd
+from bid_grid import load_grid
 
 # 인코딩 설정
 sys.stdout.reconfigure(encoding='utf-8')
@@ -22,7 +22,8 @@ def debug_one():
         print("No files found.")
         return
 
-    df = pd.read_excel(test_file, engine='pyxlsb', sheet_name='입찰결과', header=None)
+    with load_grid(test_file, '입찰결과') as grid:
+        df = grid.frame()
     
     b_col_data = df.iloc[11:, 1]
     valid_bidders = b_col_data.dropna().astype(str).str.strip()
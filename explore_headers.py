@@ -1,12 +1,13 @@
-import os
 import sys
 import pandas as pd
+from bid_grid import load_grid
 
 sys.stdout.reconfigure(encoding='utf-8')
 sample_file = r"V:\인프라수주팀\인프라자료실\01.입찰결과\입찰결과_09.불참공사\2020전\170103 (종심-일)대청댐계통 광역상수도사업 제2공구 정수시설공사.xlsx"
 
 try:
-    df = pd.read_excel(sample_file, sheet_name='입력(개찰후)', header=None)
+    with load_grid(sample_file, '입력(개찰후)') as grid:
+        df = grid.frame()
     for idx in range(25, 35):
         row = df.iloc[idx].tolist()
         # Print column indices with their values
@@ -1,6 +1,8 @@
 import os
 import sys
 import pandas as pd
+from bid_cache import list_workbooks
+from bid_pool import load_tenders, parse_jobs
 import warnings
 from collections import defaultdict
 import gspread
@@ -27,7 +29,7 @@ def get_google_sheet_client():
     client = gspread.authorize(creds)
     return client
 
-def simulate_and_export(base_dir):
+def simulate_and_export(base_dir, jobs=1):
     bidding_data = [] 
     target_stats = defaultdict(lambda: {
         'total_encounters': 0, 
@@ -41,104 +43,52 @@ def simulate_and_export(base_dir):
     
     print("도로공사 데이터 파싱 시작...")
     
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            file_lower = file.lower()
-            if not file.startswith('~') and (file_lower.endswith('.xlsb') or file_lower.endswith('.xlsx') or file_lower.endswith('.xls')):
-                file_path = os.path.join(root, file)
+    for file_path, record in load_tenders(list_workbooks(base_dir), jobs):
+        rel_path = os.path.relpath(file_path, base_dir)
+        scanned_count += 1
+        
+        if record is None: continue
+        
+        try:
+            # 한국도로공사 검사
+            client_name = str(record['info']['발주처'] or "").replace(" ", "")
+            if "한국도로공사" not in client_name: continue
+            dorogongsa_count += 1
+            
+            columns = record['columns']
+            if -1 in [columns['company'], columns['yega_ratio'], columns['price_score'], columns['deduct_score']]: continue
+            
+            valid_bids = []
+            for bid in record['bids']:
+                if bid['price_score'] is None or bid['yega_ratio'] is None: continue
                 
-                try:
-                    if file_lower.endswith('.xlsb'):
-                        df = pd.read_excel(file_path, engine='pyxlsb', header=None)
-                    else:
-                        df = pd.read_excel(file_path, header=None)
-                    
-                    is_dorogongsa = False
-                    try:
-                        c5_val = str(df.iloc[4, 2]).replace(" ", "")
-                        if "한국도로공사" in c5_val:
-                            is_dorogongsa = True
-                        else:
-                            for i in range(min(15, len(df))):
-                                for j in range(min(5, len(df.columns))):
-                                    cell_val = str(df.iloc[i, j]).replace(" ", "")
-                                    if "한국도로공사" in cell_val:
-                                        is_dorogongsa = True
-                                        break
-                                if is_dorogongsa: break
-                    except IndexError: pass
-                            
-                    if not is_dorogongsa: continue
-                    dorogongsa_count += 1
-                    
-                    header_row_idx = -1
-                    for idx, row in df.iterrows():
-                        if str(row[0]).replace(" ", "") == "순위" and str(row[1]).replace(" ", "") == "회사명":
-                            header_row_idx = idx
-                            break
-                    if header_row_idx == -1: continue
-                        
-                    headers = [str(x).replace("\n", "").replace(" ", "") for x in df.iloc[header_row_idx].values]
-                    def find_col(kws):
-                        for kw in kws:
-                            for c_idx, h in enumerate(headers):
-                                if kw in h: return c_idx
-                        return -1
-                        
-                    idx_company = find_col(['회사명'])
-                    idx_yega = find_col(['예가대비'])
-                    idx_price_score = find_col(['가격점수'])
-                    idx_deduct_score = find_col(['단가감점'])
+                yega_val = bid['yega_ratio']
+                if yega_val < 2.0: yega_val *= 100
                     
-                    if -1 in [idx_company, idx_yega, idx_price_score, idx_deduct_score]: continue
-                        
-                    data_df = df.iloc[header_row_idx+1:]
+                valid_bids.append({
+                    'company': bid['company'],
+                    'price_score': bid['price_score'],
+                    'deduct_score': bid['deduct_score'] if bid['deduct_score'] is not None else 0.0,
+                    'yega_ratio': yega_val
+                })
                     
-                    valid_bids = []
-                    for _, row in data_df.iterrows():
-                        try:
-                            price_score_raw = str(row[idx_price_score]).strip()
-                            deduct_score_raw = str(row[idx_deduct_score]).strip()
-                            yega_raw = str(row[idx_yega]).strip()
-                            company = str(row[idx_company]).strip()
-                            
-                            if pd.isna(row[idx_price_score]) or pd.isna(row[idx_yega]) or price_score_raw == 'nan':
-                                continue
-                                
-                            try: p_score = float(price_score_raw)
-                            except: continue
-                            
-                            try: d_score = float(deduct_score_raw) if deduct_score_raw not in ['nan', '-'] else 0.0
-                            except: d_score = 0.0
-                            
-                            yega_val = float(yega_raw.replace("%", ""))
-                            if yega_val < 2.0: yega_val *= 100
-                                
-                            valid_bids.append({
-                                'company': company,
-                                'price_score': p_score,
-                                'deduct_score': d_score,
-                                'yega_ratio': yega_val
-                            })
-                        except: pass
-                            
-                    if not valid_bids: continue
-                        
-                    max_price_score = max([b['price_score'] for b in valid_bids])
-                    perfect_bids = [b for b in valid_bids if b['price_score'] == max_price_score and b['deduct_score'] == 0.0]
-                    
-                    if perfect_bids:
-                        min_yega_bid = min(perfect_bids, key=lambda x: x['yega_ratio'])
-                        limit_yega = min_yega_bid['yega_ratio']
-                        
-                        bidding_data.append({
-                            'limit_yega': limit_yega,
-                            'bids': valid_bids
-                        })
+            if not valid_bids: continue
+                
+            max_price_score = max([b['price_score'] for b in valid_bids])
+            perfect_bids = [b for b in valid_bids if b['price_score'] == max_price_score and b['deduct_score'] == 0.0]
+            
+            if perfect_bids:
+                min_yega_bid = min(perfect_bids, key=lambda x: x['yega_ratio'])
+                limit_yega = min_yega_bid['yega_ratio']
+                
+                bidding_data.append({
+                    'limit_yega': limit_yega,
+                    'bids': valid_bids
+                })
 
-                except Exception as e:
-                    print(f"에러: {e}")
-                    
+        except Exception as e:
+            print(f"에러: {e}")
+            
     print(f"데이터 파싱 완료 (도로공사 건 총 {dorogongsa_count}개)\n시뮬레이터 가동 중...")
     
     # 전략 시뮬레이션
@@ -268,4 +218,5 @@ def simulate_and_export(base_dir):
         print(f"❌ 구글 시트 연동 실패: {e}")
 
 if __name__ == "__main__":
-    simulate_and_export(BASE_DIR)
+    jobs, _ = parse_jobs()
+    simulate_and_export(BASE_DIR, jobs)
@@ -1,6 +1,8 @@
-import os
 import sys
 import pandas as pd
+from bid_pool import parse_jobs
+from bid_index import parse_filters
+from bid_participation import sync_index, participation, sheet_rows
 import gspread
 from google.oauth2.service_account import Credentials
 import re
@@ -11,12 +13,20 @@ sys.stdout.reconfigure(encoding='utf-8')
 CREDENTIALS_FILE = 'credentials.json'
 SHEET_ID = '1n3WxFMxjS-mhHGE8I4dXi4Q2oJ3l4sq_OkCkBeJkbJI'
 
-if len(sys.argv) < 3:
-    print("Usage: python extract_custom_bids.py <COMPANY_KEYWORD> <SHEET_NAME>")
+JOBS, ARGS = parse_jobs()
+FILTERS, ARGS = parse_filters(ARGS, since='2024-01-01')
+# 업체별 시트는 기간/업체 조건에 따라 행 구성이 통째로 바뀌므로 증분 반영을 지원하지 않음
+# (입력 쪽은 참여 색인이 바뀐 파일만 다시 읽으므로 이미 증분)
+if '--incremental' in ARGS:
+    print("오류: extract_custom_bids.py 는 --incremental 을 지원하지 않습니다. 옵션 없이 실행하면 업체별 시트를 다시 만듭니다.")
+    sys.exit(2)
+if len(ARGS) < 2 or len(ARGS) % 2:
+    print("Usage: python extract_custom_bids.py <COMPANY_KEYWORD> <SHEET_NAME> [<COMPANY_KEYWORD> <SHEET_NAME> ...] [--jobs N] "
+          "[--since YYYY-MM-DD] [--until YYYY-MM-DD] [--method 종심|종평|간이종심] [--client 발주처]")
     sys.exit(1)
 
-COMPANY_KEYWORD = sys.argv[1]
-WORKSHEET_NAME = sys.argv[2]
+# 업체/시트 쌍 여러 개를 한 번에 (폴더는 한 번만 훑고 같은 참여 색인에서 업체별 시트를 만듦)
+REPORTS = list(zip(ARGS[0::2], ARGS[1::2]))
 BASE_DIR = r"V:\인프라수주팀\인프라자료실\01.입찰결과\입찰결과_01.종심제,종평제"
 
 SCOPES = [
@@ -29,42 +39,6 @@ def get_google_sheet_client():
     client = gspread.authorize(creds)
     return client
 
-def extract_bid_date(filename, df):
-    try:
-        if isinstance(df, dict):
-            for sheet_name, sheet_df in df.items():
-                for idx, row in sheet_df.head(50).iterrows():
-                    row_strs = [str(x) for x in row if pd.notna(x)]
-                    if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                        for c_idx, val in enumerate(row):
-                            if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                                if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                    date_val = str(row[c_idx+1])
-                                    match = re.search(r'(\d{4})[-/년]', date_val)
-                                    if match: return match.group(1), date_val
-        else:
-            for idx, row in df.head(50).iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                    for c_idx, val in enumerate(row):
-                        if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                            if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                date_val = str(row[c_idx+1])
-                                match = re.search(r'(\d{4})[-/년]', date_val)
-                                if match: return match.group(1), date_val
-    except Exception:
-        pass
-
-    match = re.search(r'(\d{2})(\d{2})(\d{2})', filename)
-    if match:
-        yy = int(match.group(1))
-        mm = match.group(2)
-        dd = match.group(3)
-        year = 2000 + yy if yy < 50 else 1900 + yy
-        return str(year), f"{year}-{mm}-{dd}"
-        
-    return "연도미상", "일자미상"
-
 def extract_project_name(filename):
     name = filename
     if " - " in name:
@@ -79,120 +53,28 @@ def extract_project_name(filename):
         name = name[2:]
     return name.strip()
 
-def process_files():
-    results = []
-    excel_files = []
-    
-    for root, dirs, files in os.walk(BASE_DIR):
-        for file in files:
-            if file.endswith(('.xls', '.xlsx', '.xlsb')) and not file.startswith('~'):
-                if any(str(y) in root for y in range(2014, 2024)):
-                    continue
-                excel_files.append((root, file))
-                
-    print(f"총 {len(excel_files)}개의 엑셀 파일을 스캔합니다.")
-    
-    processed_count = 0
-    for root, file in excel_files:
-        fpath = os.path.join(root, file)
-        project_name = extract_project_name(file)
-        
-        try:
-            if file.endswith('.xlsb'):
-                df_all = pd.read_excel(fpath, sheet_name=None, engine='pyxlsb', header=None)
-                df = df_all[list(df_all.keys())[0]] 
-            else:
-                df_all = pd.read_excel(fpath, sheet_name=None, header=None)
-                df = df_all[list(df_all.keys())[0]]
-                
-            year, full_date = extract_bid_date(file, df_all)
-            
-            try:
-                if int(year) < 2024:
-                    continue
-            except:
-                pass
-                
-            for idx, row in df.iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any(COMPANY_KEYWORD.lower() in s.replace(" ", "").lower() for s in row_strs):
-                    n_val = row[13] if len(row) > 13 else None
-                    rank_val = ""
-                    if pd.notna(n_val):
-                        try:
-                            if float(n_val).is_integer():
-                                rank_val = str(int(float(n_val)))
-                            else:
-                                rank_val = str(n_val)
-                        except:
-                            rank_val = str(n_val)
-                            
-                    bid_amount = row[2] if len(row) > 2 else ""
-                    bid_ratio = row[4] if len(row) > 4 else ""
-                    
-                    try:
-                        amt_str = str(bid_amount).replace(',', '').strip()
-                        if amt_str == "" or amt_str.lower() == "nan":
-                            continue
-                        float(amt_str)
-                    except ValueError:
-                        continue
-                        
-                    results.append([
-                        year,
-                        full_date,
-                        project_name,
-                        "O",
-                        rank_val,
-                        bid_amount,
-                        bid_ratio,
-                        file
-                    ])
-                    # Found, skip rest
-                    # 공사 하나 당 여러개 컨소시엄이면?
-                    # 중복방지에서 제거됨
-        except Exception as e:
-            pass
-            
-        processed_count += 1
-        if processed_count % 10 == 0:
-            print(f"{processed_count}/{len(excel_files)} 처리중...")
-            
-    results.sort(key=lambda x: (str(x[0]), str(x[1])), reverse=False)
-    
-    dedup_results = []
-    seen_projects = set()
-    for row in results:
-        project_name = row[2]
-        if project_name not in seen_projects:
-            seen_projects.add(project_name)
-            dedup_results.append(row)
-            
-    return dedup_results
+def process_files(jobs=1):
+    """반환: {업체: 공사별 참여 행}"""
+    conn = sync_index(BASE_DIR, jobs, **FILTERS)
+    rows = participation(conn, [keyword for keyword, _ in REPORTS], base_dir=BASE_DIR, **FILTERS)
+    conn.close()
+    return {keyword: sheet_rows(rows[keyword], extract_project_name) for keyword in rows}
 
-def main():
-    print(f"{COMPANY_KEYWORD} 2024년 이후 참여 공사 데이터 추출 시작...")
-    extracted_data = process_files()
-    
+def upload_sheet(sh, company_keyword, worksheet_name, extracted_data):
     if not extracted_data:
-        print(f"조건에 맞는 데이터({COMPANY_KEYWORD} 참여)를 찾지 못했습니다.")
-        extracted_data = [] 
+        print(f"조건에 맞는 데이터({company_keyword} 참여)를 찾지 못했습니다.")
     else:
-        print(f"총 {len(extracted_data)} 건의 {COMPANY_KEYWORD} 참여 공사 데이터를 찾았습니다.")
-    
-    print("구글 시트 연동 중...")
-    client = get_google_sheet_client()
-    sh = client.open_by_key(SHEET_ID)
+        print(f"총 {len(extracted_data)} 건의 {company_keyword} 참여 공사 데이터를 찾았습니다.")
     
     try:
-        worksheet = sh.worksheet(WORKSHEET_NAME)
+        worksheet = sh.worksheet(worksheet_name)
         worksheet.clear()
-        print(f"기존 '{WORKSHEET_NAME}' 시트를 초기화했습니다.")
+        print(f"기존 '{worksheet_name}' 시트를 초기화했습니다.")
     except gspread.exceptions.WorksheetNotFound:
-        worksheet = sh.add_worksheet(title=WORKSHEET_NAME, rows="100", cols="10")
-        print(f"새 시트 '{WORKSHEET_NAME}'를 생성했습니다.")
+        worksheet = sh.add_worksheet(title=worksheet_name, rows="100", cols="10")
+        print(f"새 시트 '{worksheet_name}'를 생성했습니다.")
         
-    headers = [["연도", "입찰일자", "공사명", f"{COMPANY_KEYWORD[:2]}참여", "낙찰우선순위", "입찰금액", "기초대비 투찰율(%)", "원본파일명"]]
+    headers = [["연도", "입찰일자", "공사명", f"{company_keyword[:2]}참여", "낙찰우선순위", "입찰금액", "기초대비 투찰율(%)", "원본파일명"]]
     
     cleaned_data = []
     for row in extracted_data:
@@ -243,7 +125,17 @@ def main():
     set_column_width(worksheet, 'F', 150)
     set_column_width(worksheet, 'G', 120)
     set_column_width(worksheet, 'H', 400)
+
+def main():
+    names = ", ".join(keyword for keyword, _ in REPORTS)
+    print(f"{names} {FILTERS['since'] or ''} 이후 참여 공사 데이터 추출 시작...")
+    extracted = process_files(JOBS)
     
+    print("구글 시트 연동 중...")
+    client = get_google_sheet_client()
+    sh = client.open_by_key(SHEET_ID)
+    for company_keyword, worksheet_name in REPORTS:
+        upload_sheet(sh, company_keyword, worksheet_name, extracted[company_keyword])
     print("모든 작업이 완료되었습니다.")
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
-import os
 import sys
 import pandas as pd
+from bid_pool import parse_jobs
+from bid_company import COMPANIES
+from bid_participation import sync_index, participation, sheet_rows
 import gspread
 from google.oauth2.service_account import Credentials
 import re
@@ -23,44 +25,6 @@ def get_google_sheet_client():
     client = gspread.authorize(creds)
     return client
 
-def extract_bid_date(filename, df):
-    # 1. 시트 내에서 "입찰일", "개찰일", "투찰일" 검색
-    try:
-        if isinstance(df, dict):
-            for sheet_name, sheet_df in df.items():
-                for idx, row in sheet_df.head(50).iterrows():
-                    row_strs = [str(x) for x in row if pd.notna(x)]
-                    if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                        for c_idx, val in enumerate(row):
-                            if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                                if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                    date_val = str(row[c_idx+1])
-                                    match = re.search(r'(\d{4})[-/년]', date_val)
-                                    if match: return match.group(1), date_val
-        else:
-            for idx, row in df.head(50).iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                    for c_idx, val in enumerate(row):
-                        if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                            if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                date_val = str(row[c_idx+1])
-                                match = re.search(r'(\d{4})[-/년]', date_val)
-                                if match: return match.group(1), date_val
-    except Exception:
-        pass
-
-    # 2. 파일명에서 날짜(YYMMDD) 추출
-    match = re.search(r'(\d{2})(\d{2})(\d{2})', filename)
-    if match:
-        yy = int(match.group(1))
-        mm = match.group(2)
-        dd = match.group(3)
-        year = 2000 + yy if yy < 50 else 1900 + yy
-        return str(year), f"{year}-{mm}-{dd}"
-        
-    return "연도미상", "일자미상"
-
 def extract_project_name(filename):
     name = filename
     if " - " in name:
@@ -75,105 +39,22 @@ def extract_project_name(filename):
         name = name[2:]
     return name.strip()
 
-def process_files():
-    results = []
-    excel_files = []
-    
-    for root, dirs, files in os.walk(BASE_DIR):
-        for file in files:
-            if file.endswith(('.xls', '.xlsx', '.xlsb')) and not file.startswith('~'):
-                # 2024년 이후 데이터만 스캔 (폴더나 파일명 기준)
-                if any(str(y) in root for y in range(2014, 2024)):
-                    continue
-                excel_files.append((root, file))
-                
-    print(f"총 {len(excel_files)}개의 엑셀 파일을 스캔합니다.")
-    
-    processed_count = 0
-    for root, file in excel_files:
-        fpath = os.path.join(root, file)
-        project_name = extract_project_name(file)
-        
-        try:
-            if file.endswith('.xlsb'):
-                df_all = pd.read_excel(fpath, sheet_name=None, engine='pyxlsb', header=None)
-                df = df_all[list(df_all.keys())[0]] 
-            else:
-                df_all = pd.read_excel(fpath, sheet_name=None, header=None)
-                df = df_all[list(df_all.keys())[0]]
-                
-            year, full_date = extract_bid_date(file, df_all)
-            
-            try:
-                if int(year) < 2024:
-                    continue
-            except:
-                pass
-                
-            for idx, row in df.iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any("대우건설" in s.replace(" ", "") for s in row_strs):
-                    n_val = row[13] if len(row) > 13 else None
-                    rank_val = ""
-                    if pd.notna(n_val):
-                        try:
-                            if float(n_val).is_integer():
-                                rank_val = str(int(float(n_val)))
-                            else:
-                                rank_val = str(n_val)
-                        except:
-                            rank_val = str(n_val)
-                            
-                    bid_amount = row[2] if len(row) > 2 else ""
-                    bid_ratio = row[4] if len(row) > 4 else ""
-                    
-                    try:
-                        amt_str = str(bid_amount).replace(',', '').strip()
-                        if amt_str == "" or amt_str.lower() == "nan":
-                            continue
-                        float(amt_str)
-                    except ValueError:
-                        continue
-                        
-                    results.append([
-                        year,
-                        full_date,
-                        project_name,
-                        "O",
-                        rank_val,
-                        bid_amount,
-                        bid_ratio,
-                        file
-                    ])
-                    # 공사 하나 당 대우건설이 보통 1번 참여하므로 찾으면 break. 
-                    # 컨소시엄 여러줄인 경우 대비해서 break 안할 수도 있지만 보통 한줄로 나옴.
-                    
-        except Exception as e:
-            # print(f"Error reading {file}: {e}")
-            pass
-            
-        processed_count += 1
-        if processed_count % 10 == 0:
-            print(f"{processed_count}/{len(excel_files)} 처리중...")
-            
-    # 연도별, 입찰일자별 정렬 (오름차순) 
-    # 요구사항: 예전 날짜부터 최근까지 순서대로 다시 정리해줘
-    results.sort(key=lambda x: (str(x[0]), str(x[1])), reverse=False)
-    
-    # 중복 제거 (파일 내 시트복사본 등으로 여러번 잡힌 경우 방지)
-    dedup_results = []
-    seen_projects = set()
-    for row in results:
-        project_name = row[2]
-        if project_name not in seen_projects:
-            seen_projects.add(project_name)
-            dedup_results.append(row)
-            
-    return dedup_results
+def process_files(jobs=1):
+    # 새로 들어오거나 바뀐 파일만 참여 색인(DB)에 반영하고, 대우건설 투찰 행은 색인에서 바로 조회
+    # (입찰일을 모르는 입찰은 날짜 조건을 통과시킴)
+    conn = sync_index(BASE_DIR, jobs, since='2024-01-01')
+    # 순위표에 한 번도 나오지 않았으면 업체 ID 가 없음 (참여 공사 없음)
+    company_id = COMPANIES.resolve('대우건설')
+    if company_id is None:
+        conn.close()
+        return []
+    rows = participation(conn, [company_id], base_dir=BASE_DIR, since='2024-01-01')
+    conn.close()
+    return sheet_rows(rows[company_id], extract_project_name)
 
-def main():
+def main(jobs=1):
     print("대우건설 2024년 이후 참여 공사 데이터 추출 시작...")
-    extracted_data = process_files()
+    extracted_data = process_files(jobs)
     
     if not extracted_data:
         print("조건에 맞는 데이터(대우건설 참여)를 찾지 못했습니다.")
@@ -248,4 +129,5 @@ def main():
     print("모든 작업이 완료되었습니다.")
 
 if __name__ == "__main__":
-    main()
+    jobs, _ = parse_jobs()
+    main(jobs)
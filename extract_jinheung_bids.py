@@ -1,6 +1,10 @@
-import os
 import sys
 import pandas as pd
+from bid_pool import parse_jobs
+from bid_company import COMPANIES, canonical_name
+from bid_participation import sync_index, participation, sheet_rows, dedup_rows
+from bid_query import tenders
+from bid_grid import load_grid
 import gspread
 from google.oauth2.service_account import Credentials
 import re
@@ -23,44 +27,6 @@ def get_google_sheet_client():
     client = gspread.authorize(creds)
     return client
 
-def extract_bid_date(filename, df):
-    # 1. 시트 내에서 "입찰일", "개찰일", "투찰일" 검색
-    try:
-        if isinstance(df, dict): # xlsb 등 sheet_name=None 인 경우
-            for sheet_name, sheet_df in df.items():
-                for idx, row in sheet_df.head(50).iterrows():
-                    row_strs = [str(x) for x in row if pd.notna(x)]
-                    if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                        for c_idx, val in enumerate(row):
-                            if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                                if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                    date_val = str(row[c_idx+1])
-                                    match = re.search(r'(\d{4})[-/년]', date_val)
-                                    if match: return match.group(1), date_val
-        else:
-            for idx, row in df.head(50).iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                    for c_idx, val in enumerate(row):
-                        if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                            if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                date_val = str(row[c_idx+1])
-                                match = re.search(r'(\d{4})[-/년]', date_val)
-                                if match: return match.group(1), date_val
-    except Exception:
-        pass
-
-    # 2. 파일명에서 날짜(YYMMDD) 추출 (Fall-back)
-    match = re.search(r'(\d{2})(\d{2})(\d{2})', filename)
-    if match:
-        yy = int(match.group(1))
-        mm = match.group(2)
-        dd = match.group(3)
-        year = 2000 + yy if yy < 50 else 1900 + yy
-        return str(year), f"{year}-{mm}-{dd}"
-        
-    return "연도미상", "일자미상"
-
 def extract_project_name(filename):
     name = filename
     if " - " in name:
@@ -72,102 +38,73 @@ def extract_project_name(filename):
     name = re.sub(r'\.[a-zA-Z]+$', '', name)
     return name.strip()
 
-def process_files():
+def cell_rank(val):
+    # 1.0 같은 실수는 정수 문자열로
+    if val is None:
+        return ""
+    try:
+        return str(int(float(val))) if float(val).is_integer() else str(val)
+    except (TypeError, ValueError):
+        return str(val)
+
+def scan_unranked(conn, company_name):
+    """순위표(순위/회사명)를 못 찾은 불참공사 양식: 첫 시트에서 업체명이 들어간 행을 직접 찾음
+
+    C열 투찰금액(숫자인 행만), E열 투찰율, N열 순위 (색인 이전 방식과 같은 위치)
+    """
     results = []
-    excel_files = []
-    
-    for root, dirs, files in os.walk(BASE_DIR):
-        for file in files:
-            if file.endswith(('.xls', '.xlsx', '.xlsb')) and not file.startswith('~'):
-                # 24년~26년 데이터 필터링 조건 추가 (폴더명이나 파일명 기준 1차 필터)
-                # 정밀 필터링은 date 추출 후 수행하기 위해 여기서는 최대한 포함하거나 명시적으로 과거 제외
-                if "2020전" in root or "2021" in root or "2022" in root or "2023" in root:
-                    continue
-                excel_files.append((root, file))
-                
-    print(f"총 {len(excel_files)}개의 엑셀 파일을 스캔합니다.")
-    
-    for root, file in excel_files:
-        fpath = os.path.join(root, file)
-        project_name = extract_project_name(file)
-        
+    unranked = [t for t in tenders(conn, base_dir=BASE_DIR, since='2024-01-01', until='2026-12-31')
+                if t['columns']['company'] == -1]
+    for tender in unranked:
         try:
-            if file.endswith('.xlsb'):
-                df_all = pd.read_excel(fpath, sheet_name=None, engine='pyxlsb', header=None)
-                df = df_all[list(df_all.keys())[0]] # 첫번째 시트를 메인 데이터로 사용
-            else:
-                df_all = pd.read_excel(fpath, sheet_name=None, header=None)
-                df = df_all[list(df_all.keys())[0]]
-                
-            year, full_date = extract_bid_date(file, df_all)
-            
-            # 24~26년 필터링 (최종)
-            try:
-                if int(year) < 2024 or int(year) > 2026:
-                    continue
-            except:
-                pass # 연도미상인 경우 혹시 모르니 일단 포함 (또는 제외 결정 필요)
-                
-            for idx, row in df.iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any("진흥" in s for s in row_strs):
-                    n_val = row[13] if len(row) > 13 else None
-                    rank_val = ""
-                    if pd.notna(n_val):
-                        # Convert float like 1.0 to integer string 1 if possible
-                        try:
-                            if float(n_val).is_integer():
-                                rank_val = str(int(float(n_val)))
-                            else:
-                                rank_val = str(n_val)
-                        except:
-                            rank_val = str(n_val)
-                            
-                    # 사용자 피드백 반영: 투찰금액 = 입찰금액 (C열, 인덱스 2) / 투찰율 = 기초대비(%) (E열, 인덱스 4)
-                    bid_amount = row[2] if len(row) > 2 else ""
-                    bid_ratio = row[4] if len(row) > 4 else ""
-                    
-                    # E, F열이 누락되는 가짜 행(메타데이터/요약 행) 필터링
-                    # 실제 입찰 데이터라면 C열(투찰금액)이 숫자여야 함
-                    try:
-                        amt_str = str(bid_amount).replace(',', '').strip()
-                        if amt_str == "" or amt_str.lower() == "nan":
-                            continue
-                        float(amt_str)
-                    except ValueError:
-                        # 숫자로 변환할 수 없는 텍스트(예: "참여회사: 진흥기업 등")가 들어간 행은 실제 입찰 행이 아니므로 제외
-                        continue
-                        
-                    results.append([
-                        year,
-                        full_date,
-                        project_name,
-                        "O",
-                        rank_val,
-                        bid_amount,
-                        bid_ratio,
-                        file
-                    ])
+            with load_grid(tender['path'], 0) as grid:
+                grid_rows = [grid.row(r) for r in range(grid.nrows)]
         except Exception as e:
-            print(f"Error reading {file}: {e}")
-            
-    # 연도별, 입찰일자별 오름차순 정렬 (과거 -> 최신)
-    results.sort(key=lambda x: (str(x[0]), str(x[1])), reverse=False)
-    
-    # 공사명(C열, idx=2) 기준 중복 제거 (정렬 후 처음 나온 건만 유지)
-    dedup_results = []
-    seen_projects = set()
-    for row in results:
-        project_name = row[2]
-        if project_name not in seen_projects:
-            seen_projects.add(project_name)
-            dedup_results.append(row)
-            
-    return dedup_results
+            print(f"Error reading {tender['file']}: {e}")
+            continue
+        if tender['bid_date']:
+            year, full_date = tender['bid_date'][:4], tender['bid_date']
+        else:
+            year, full_date = "연도미상", "일자미상"
+        for row in grid_rows:
+            if not any(isinstance(v, str) and company_name in canonical_name(v) for v in row):
+                continue
+            bid_amount = row[2] if len(row) > 2 else None
+            try:
+                float(str(bid_amount).replace(',', '').strip())
+            except ValueError:
+                # "참여회사: 진흥기업 등" 같은 요약 행은 제외
+                continue
+            results.append([
+                year,
+                full_date,
+                extract_project_name(tender['file']),
+                "O",
+                cell_rank(row[13] if len(row) > 13 else None),
+                bid_amount,
+                row[4] if len(row) > 4 and row[4] is not None else "",
+                tender['file']
+            ])
+    print(f"순위표 없는 양식 {len(unranked)}개 파일 직접 확인, {len(results)}행 추가")
+    return results
+
+def process_files(jobs=1):
+    # 새로 들어오거나 바뀐 파일만 참여 색인(DB)에 반영하고, 진흥기업 투찰 행은 색인에서 바로 조회
+    # (입찰일을 모르는 입찰은 날짜 조건을 통과시킴)
+    conn = sync_index(BASE_DIR, jobs, since='2024-01-01', until='2026-12-31')
+    # 순위표에 한 번도 나오지 않았으면 업체 ID 가 없음 (그때는 아래 직접 확인 결과만 사용)
+    company_id = COMPANIES.resolve('진흥기업')
+    rows = []
+    if company_id is not None:
+        rows = participation(conn, [company_id], base_dir=BASE_DIR, since='2024-01-01', until='2026-12-31')[company_id]
+    # 불참공사 폴더에는 표준 순위표가 없는 양식도 있어서 그런 파일만 셀을 직접 훑어서 보충
+    extra = scan_unranked(conn, canonical_name('진흥기업'))
+    conn.close()
+    return dedup_rows(sheet_rows(rows, extract_project_name) + extra)
 
-def main():
+def main(jobs=1):
     print("진흥기업 모든 참여 공사 데이터 추출 시작...")
-    extracted_data = process_files()
+    extracted_data = process_files(jobs)
     
     if not extracted_data:
         print("조건에 맞는 데이터(진흥기업 참여)를 찾지 못했습니다.")
@@ -245,4 +182,5 @@ def main():
     print("모든 작업이 완료되었습니다.")
 
 if __name__ == "__main__":
-    main()
+    jobs, _ = parse_jobs()
+    main(jobs)
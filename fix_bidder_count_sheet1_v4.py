@@ -1,6 +1,10 @@
 import os
 import sys
-import pandas as pd
+from bid_pool import parse_jobs
+from bid_db import sync_folder
+from bid_query import facts
+from bid_cache import list_workbooks
+from bid_manifest import parse_incremental, select_targets, update_manifest, save_manifest
 import gspread
 from google.oauth2.service_account import Credentials
 
@@ -16,66 +20,35 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive'
 ]
 
-def extract_bidder_count_dynamic(base_dir):
+def extract_bidder_count_dynamic(base_dir, jobs=1, paths=None):
+    """{공고명 키: 참여업체 수} (paths 를 주면 그 파일들만, 반환: (업체 수, {경로: 입찰 건 요약}))"""
     bidder_counts = {}
+    found = {}
     
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith('.xlsb') and not file.startswith('~'):
-                file_path = os.path.join(root, file)
-                print(f"엑셀 읽는 중: {file}")
-                
-                try:
-                    try:
-                        df = pd.read_excel(file_path, engine='pyxlsb', sheet_name='입찰결과', header=None)
-                    except Exception as e:
-                        df = pd.read_excel(file_path, engine='pyxlsb', header=None)
-                    
-                    header_row_idx = -1
-                    col_idx_company = -1
-                    
-                    # '회사명' 셀을 찾습니다. 사용자가 'B열의 "회사명"이라고 입력된 칸의 아랫칸부터' 라고 했습니다.
-                    # B열은 주로 index 1입니다. 전체 데이터프레임을 순회하며 '회사명' 텍스트를 찾습니다.
-                    for r_idx, row in df.iterrows():
-                        for c_idx, cell_val in enumerate(row):
-                            if str(cell_val).replace(" ", "") == "회사명":
-                                header_row_idx = r_idx
-                                col_idx_company = c_idx
-                                break
-                        if header_row_idx != -1:
-                            break
-                            
-                    if header_row_idx != -1 and col_idx_company != -1:
-                        # 회사명 아래 행부터 끝까지 해당 열의 데이터 추출
-                        col_data = df.iloc[header_row_idx+1:, col_idx_company]
-                        
-                        valid_bidders = col_data.dropna().astype(str).str.strip()
-                        # 빈 문자열, nan, "-", "0" 등의 값을 필터링
-                        valid_bidders = valid_bidders[
-                            (valid_bidders != '') & 
-                            (valid_bidders.str.lower() != 'nan') & 
-                            (valid_bidders != '-') &
-                            (valid_bidders != '0') &
-                            (valid_bidders != '0.0') &
-                            (valid_bidders.str.len() > 0)
-                        ]
-                        count = len(valid_bidders)
-                        print(f"  -> {file} 참여업체: {count}개 추출 (헤더 인덱스: {header_row_idx}, 컬럼 인덱스: {col_idx_company})")
-                    else:
-                        print("  -> '회사명' 셀을 찾을 수 없습니다.")
-                        count = 0
-                    
-                    key = file.replace('.xlsb', '').strip()
-                    bidder_counts[key] = count
-                    
-                except Exception as e:
-                    print(f"  -> 파일 처리 중 에러: {e}")
+    # 새로 들어온 파일만 DB 에 반영하고, 업체 수는 입찰 건 요약(tender_facts)에서 바로 읽음
+    conn = sync_folder(base_dir, ('.xlsb',), jobs)
+    for fact in facts(conn, base_dir=base_dir, exts=('.xlsb',)):
+        file = fact['file']
+        if paths is not None and fact['path'] not in paths:
+            continue
+        found[fact['path']] = fact
+        
+        # '회사명' 헤더 아래 순위표에서 순위가 있는 참여업체 수 (빈칸, '-' 등은 파싱 단계에서 제외, 회사명 열이 없으면 0)
+        count = fact['bidder_count']
+        print(f"  -> {file} 참여업체: {count}개")
+        
+        key = file.replace('.xlsb', '').strip()
+        bidder_counts[key] = count
                     
-    return bidder_counts
+    conn.close()
+    return bidder_counts, found
 
-def update_col_in_sheet1():
+def update_col_in_sheet1(jobs=1, incremental=False):
     print("업체 수 데이터(회사명 아랫칸부터, '-' 등 제외) 카운트 시작...")
-    bidder_counts = extract_bidder_count_dynamic(BASE_DIR)
+    # --incremental: 추가/수정된 파일의 공고 행만 갱신 (지워진 파일의 행은 create_bids_sheet --incremental 이 삭제)
+    targets, manifest, changes = select_targets('fix_bidder_count_sheet1_v4', list_workbooks(BASE_DIR, ('.xlsb',)),
+                                                incremental, BASE_DIR)
+    bidder_counts, found = extract_bidder_count_dynamic(BASE_DIR, jobs, {os.path.abspath(p) for p in targets} if incremental else None)
     
     client = gspread.authorize(Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=SCOPES))
     sh = client.open_by_key(SHEET_ID)
@@ -114,6 +87,11 @@ def update_col_in_sheet1():
         print("업데이트 완료!")
     else:
         print("수정할 데이터가 없습니다.")
+    if incremental:
+        save_manifest('fix_bidder_count_sheet1_v4', update_manifest(
+            manifest, [(p, found.get(os.path.abspath(p))) for p in targets], changes))
 
 if __name__ == '__main__':
-    update_col_in_sheet1()
+    jobs, rest = parse_jobs()
+    incremental, _ = parse_incremental(rest)
+    update_col_in_sheet1(jobs, incremental)
@@ -1,5 +1,5 @@
-import pandas as pd
 import os
+from bid_grid import load_grid
 
 # 파일 경로 설정
 folder_path = r"E:\인프라수주팀\입찰결과분석"
@@ -10,8 +10,9 @@ file_path = os.path.join(folder_path, target_file)
 print(f"분석 대상 파일: {file_path}")
 
 try:
-    # 엑셀 파일 읽기 (엔진: pyxlsb)
-    df = pd.read_excel(file_path, engine='pyxlsb')
+    # 첫 시트 셀 격자 (처음 한 번만 xlsb 디코딩, 이후 Arrow 스냅샷을 메모리 맵으로 읽음)
+    with load_grid(file_path, 0) as grid:
+        df = grid.frame(header=0)
     
     print("\n--- 데이터프레임 정보 ---")
     print(df.info())
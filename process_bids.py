@@ -1,13 +1,14 @@
 import os
 import sys
-import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
-import datetime
 import re
-import openpyxl
 from gspread_formatting import format_cell_ranges, CellFormat, Color, TextFormat
 from gspread.utils import rowcol_to_a1
+from bid_pool import load_tenders, parse_jobs
+from bid_db import connect, sync
+from bid_company import COMPANIES, CompanyIndex
+from bid_groups import load_groups
 
 # 인코딩 설정
 sys.stdout.reconfigure(encoding='utf-8')
@@ -45,60 +46,25 @@ def load_company_map():
 
     print(f"Loading colors from: {COLOR_FILE_NAME}")
     try:
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        ws = wb.active
-        
-        company_map = {} # company -> {'group': 'Theme_X', 'color': ColorObj}
-        
-        for row in ws.iter_rows():
-            for cell in row:
-                if cell.value and isinstance(cell.value, str):
-                    fill = cell.fill
-                    if fill and fill.start_color:
-                        color = fill.start_color
-                        theme_key = ""
-                        if color.type == 'theme':
-                            theme_key = f"Theme_{color.theme}"
-                        
-                        matched_group_key = None
-                        if "Theme_9" in theme_key: matched_group_key = 'Theme_9'
-                        elif "Theme_6" in theme_key: matched_group_key = 'Theme_6'
-                        elif "Theme_8" in theme_key: matched_group_key = 'Theme_8'
-                        
-                        if matched_group_key:
-                            company = cell.value.strip()
-                            company_map[company] = {
-                                'group_key': matched_group_key,
-                                'color': GROUP_COLORS[matched_group_key]['color']
-                            }
-                            
+        # 셀 배경 테마 색(Theme_9/6/8)별 업체 목록은 파일이 바뀔 때만 다시 읽음 (bid_groups 캐시)
+        company_map = {} # company_id -> {'group': 'Theme_X', 'color': ColorObj}
+        for name, group_key in load_groups(file_path, GROUP_COLORS):
+            # 입찰결과 DB 에 없는 업체(순위표에 한 번도 나오지 않은 업체)는 칠할 셀도 없으므로 제외
+            company_id = COMPANIES.resolve(name)
+            if company_id is None:
+                continue
+            company_map[company_id] = {
+                'group_key': group_key,
+                'color': GROUP_COLORS[group_key]['color']
+            }
         return company_map
     except Exception as e:
         print(f"Error loading colors: {e}")
         return {}
 
-def find_company_info(company_name, company_map):
-    """회사명에 맞는 정보(색상, 그룹)를 부분 일치로 검색"""
-    if not company_name: return None
-
-    # 1. 완전 일치
-    if company_name in company_map:
-        return company_map[company_name]
-    
-    # 2. 정제 후 부분 일치
-    clean_target = company_name.replace("주식회사", "").replace("(주)", "").replace(" ", "")
-    
-    if not clean_target: return None
-
-    for key_name, info in company_map.items():
-        clean_key = key_name.replace("주식회사", "").replace("(주)", "").replace(" ", "")
-        
-        if not clean_key: continue
-
-        if len(clean_key) > 1 and (clean_key in clean_target or clean_target in clean_key):
-             return info
-             
-    return None
+def find_company_info(company_id, company_index):
+    """업체 ID 에 맞는 정보(색상, 그룹) 검색: 같은 업체, 없으면 정규화한 업체명 부분 일치 (CompanyIndex)"""
+    return company_index.lookup(company_id)
 
 def extract_zone(filename):
     match = re.search(r'제(\d+)공구', filename)
@@ -106,58 +72,27 @@ def extract_zone(filename):
         return f"{match.group(1)}공구"
     return "기타"
 
-def process_file(file_path):
-    print(f"Reading file: {os.path.basename(file_path)}")
-    try:
-        df = pd.read_excel(file_path, engine='pyxlsb', header=None)
-        
-        header_row_idx = -1
-        for idx, row in df.iterrows():
-            if str(row[0]).replace(" ", "") == "순위":
-                header_row_idx = idx
-                break
-        
-        if header_row_idx == -1: return []
+def process_file(record):
+    """캐시된 입찰결과 레코드에서 순위/회사명/입찰금액(억원)/기초대비(%) 추출"""
+    data_rows = []
+    for bid in record['bids']:
+        if bid['amount'] is None or bid['base_ratio'] is None: continue
 
-        data_rows = []
-        data_df = df.iloc[header_row_idx+1:].copy()
-        
-        for _, row in data_df.iterrows():
-            rank = row[0]
-            if pd.isna(rank): continue
-            
-            rank_str = str(rank).strip()
-            if not rank_str.isdigit(): continue
+        amount_billions = bid['amount'] / 100000000
+        ratio_percent = bid['base_ratio'] * 100
 
-            try:
-                rank_val = int(rank_str)
-                company = str(row[1]).strip()
-                if rank_val == 1:
-                    company = "★ " + company
-
-                amount = float(row[2])
-                ratio = float(row[4]) 
-                
-                amount_billions = amount / 100000000
-                ratio_percent = ratio * 100
-                
-                data_rows.append({
-                    'rank': rank_val,
-                    'company': company,
-                    'amount': amount_billions,
-                    'ratio': ratio_percent
-                })
-            except (ValueError, TypeError):
-                continue
-        
-        data_rows.sort(key=lambda x: x['rank'])
-        return data_rows
+        data_rows.append({
+            'rank': bid['rank'],
+            'company': bid['company'],
+            'company_id': COMPANIES.resolve(bid['company']),
+            'amount': amount_billions,
+            'ratio': ratio_percent
+        })
 
-    except Exception as e:
-        print(f"Error checking file {file_path}: {e}")
-        return []
+    data_rows.sort(key=lambda x: x['rank'])
+    return data_rows
 
-def main():
+def main(jobs=1):
     client = get_google_sheet_client()
     sh = client.open_by_key(SHEET_ID)
     
@@ -170,15 +105,21 @@ def main():
     # 1. Excel 파일 처리
     files = [f for f in os.listdir(FOLDER_PATH) if f.endswith('.xlsb')]
     
+    paths = [os.path.join(FOLDER_PATH, f) for f in files]
+    # 업체 ID 는 입찰결과 DB 에서 조회만 하므로 이 폴더의 새 파일을 먼저 DB 에 적재
+    conn = connect()
+    sync(conn, paths, jobs, FOLDER_PATH)
+    conn.close()
+    
     zone_data = {}
-    for file_name in files:
-        zone = extract_zone(file_name)
-        file_path = os.path.join(FOLDER_PATH, file_name)
-        rows = process_file(file_path)
-        zone_data[zone] = rows
+    for file_path, record in load_tenders(paths, jobs):
+        print(f"Reading file: {os.path.basename(file_path)}")
+        zone = extract_zone(os.path.basename(file_path))
+        zone_data[zone] = process_file(record) if record else []
 
     sorted_zones = sorted(zone_data.keys())
     company_map = load_company_map() # 색상 정보 로드
+    company_index = CompanyIndex(company_map) # 정규화 이름 해시/부분 문자열 색인 (업체마다 한 번만 검색)
     
     # 2. 메인 데이터 구성
     upload_rows = []
@@ -197,15 +138,17 @@ def main():
     for zone in sorted_zones:
         max_len = max(max_len, len(zone_data[zone]))
         
+    company_cells = [] # (시트 행, 시트 열, 업체 ID) - 업체별 색상 적용용
     for i in range(max_len):
         row_data = []
-        for zone in sorted_zones:
+        for z_idx, zone in enumerate(sorted_zones):
             rows = zone_data[zone]
             if i < len(rows):
                 entry = rows[i]
+                company_cells.append((len(upload_rows) + 1, z_idx * 4 + 2, entry['company_id']))
                 row_data.extend([
                     entry['rank'],
-                    entry['company'],
+                    ("★ " if entry['rank'] == 1 else "") + entry['company'],
                     round(entry['amount'], 2),
                     round(entry['ratio'], 4)
                 ])
@@ -241,8 +184,7 @@ def main():
             rows = zone_data[zone]
             ratios = []
             for entry in rows:
-                clean_name = str(entry['company']).replace("★ ", "").strip()
-                info = find_company_info(clean_name, company_map)
+                info = find_company_info(entry['company_id'], company_index)
                 if info and info['group_key'] == group_key:
                     ratios.append(entry['ratio'])
             
@@ -284,21 +226,12 @@ def main():
             
         # [메인] 업체별 색상 적용 (부분 일치)
         if company_map:
-            for row_idx in range(2, total_rows): 
-                row_data = upload_rows[row_idx]
-                for i in range(len(sorted_zones)):
-                    sheet_col_idx = i * 4 + 2 
-                    list_col_idx = i * 4 + 1  
-                    if list_col_idx < len(row_data):
-                        original_val = str(row_data[list_col_idx])
-                        company_val = original_val.replace("★ ", "").strip()
-                        if not company_val: continue
-                        
-                        info = find_company_info(company_val, company_map)
-                        if info:
-                            cell_a1 = rowcol_to_a1(row_idx + 1, sheet_col_idx) 
-                            fmt_company = CellFormat(backgroundColor=info['color'])
-                            batch.append((cell_a1, fmt_company))
+            for sheet_row, sheet_col_idx, company_id in company_cells:
+                info = find_company_info(company_id, company_index)
+                if info:
+                    cell_a1 = rowcol_to_a1(sheet_row, sheet_col_idx) 
+                    fmt_company = CellFormat(backgroundColor=info['color'])
+                    batch.append((cell_a1, fmt_company))
 
         # [요약] 테이블 스타일링
         # sheet_summary_start_row 계산
@@ -336,4 +269,5 @@ def main():
         print("No data collected.")
 
 if __name__ == "__main__":
-    main()
+    jobs, _ = parse_jobs()
+    main(jobs)
@@ -1,6 +1,6 @@
 import os
 import pandas as pd
-import sys
+from bid_workbook import Workbook
 
 # BASE_DIR = r"V:\인프라수주팀\인프라자료실\01.입찰결과\입찰결과_09.불참공사"
 # For faster testing, only look at recent years
@@ -20,12 +20,9 @@ def check_blanks():
     for root, file in excel_files:
         fpath = os.path.join(root, file)
         try:
-            if file.endswith('.xlsb'):
-                df_all = pd.read_excel(fpath, sheet_name=None, engine='pyxlsb', header=None)
-                df = df_all[list(df_all.keys())[0]]
-            else:
-                df_all = pd.read_excel(fpath, sheet_name=None, header=None)
-                df = df_all[list(df_all.keys())[0]]
+            # 첫 시트만 디코딩
+            with Workbook(fpath) as wb:
+                df = wb.frame(wb.sheet_names[0])
                 
             for idx, row in df.iterrows():
                 row_strs = [str(x) for x in row if pd.notna(x)]
@@ -1,4 +1,4 @@
-import pandas as pd
+from bid_workbook import Workbook
 
 target_file = r"E:\인프라수주팀\트레이닝\24년이후 입찰결과\입찰결과 - 260113 (종심-고) 새만금항 신항 방파제(연장) 축조공사_Rev.N4.10.xlsb"
 
@@ -7,9 +7,9 @@ def test_extract():
     try:
         # I6 means row 5, col 8 (0-indexed)
         # We'll print a grid from row 3 to 10, col 5 to 10
-        xls = pd.ExcelFile(target_file, engine='pyxlsb')
-        main_sheet_name = [sn for sn in xls.sheet_names if "기초" not in sn][0]
-        df_main = pd.read_excel(target_file, engine='pyxlsb', sheet_name=main_sheet_name, header=None)
+        with Workbook(target_file) as wb:
+            main_sheet_name = [sn for sn in wb.sheet_names if "기초" not in sn][0]
+            df_main = wb.frame(main_sheet_name)
         
         print("Rows 3 to 10, Cols F(5) to K(10):")
         for r_idx in range(2, 11):
@@ -1,6 +1,8 @@
 import os
 import sys
 import pandas as pd
+from bid_workbook import Workbook
+from bid_mirror import fetch
 import re
 
 sys.stdout.reconfigure(encoding='utf-8')
@@ -26,35 +28,33 @@ for sample_file in test_files:
         continue
     print(f"\nScanning: {sample_file}")
     try:
-        if sample_file.endswith('.xlsb'):
-            df = pd.read_excel(sample_file, sheet_name=None, engine='pyxlsb', header=None)
-        else:
-            df = pd.read_excel(sample_file, sheet_name=None, header=None)
+        # 시트는 앞쪽 50행만, 날짜를 찾으면 나머지 시트는 읽지 않음 (네트워크 드라이브 파일은 로컬 미러 사본)
+        with Workbook(fetch(sample_file)) as wb:
+            for sheet_name in wb.sheet_names:
+                print(f"  Sheet: {sheet_name}")
+                sheet_df = wb.frame(sheet_name, stop=50)
+                found_date = None
             
-        for sheet_name, sheet_df in df.items():
-            print(f"  Sheet: {sheet_name}")
-            found_date = None
-            
-            # 1. Search for keywords "입찰일시", "개찰일시", "실제 개찰일시"
-            for idx, row in sheet_df.head(50).iterrows():
-                row_strs = [str(x) for x in row if pd.notna(x)]
-                if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
-                    for c_idx, val in enumerate(row):
-                        if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
-                            if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
-                                found_date = row[c_idx+1]
-                                print(f"    Found Date Label: '{val}' -> Value: {found_date}")
-                                break
-                    if found_date: break
+                # 1. Search for keywords "입찰일시", "개찰일시", "실제 개찰일시"
+                for idx, row in sheet_df.iterrows():
+                    row_strs = [str(x) for x in row if pd.notna(x)]
+                    if any("개찰일" in s or "입찰일" in s or "투찰일" in s for s in row_strs):
+                        for c_idx, val in enumerate(row):
+                            if isinstance(val, str) and ("개찰일" in val or "입찰일" in val or "투찰일" in val):
+                                if c_idx + 1 < len(row) and pd.notna(row[c_idx+1]):
+                                    found_date = row[c_idx+1]
+                                    print(f"    Found Date Label: '{val}' -> Value: {found_date}")
+                                    break
+                        if found_date: break
                     
-            if not found_date:
-                # 2. 6자리 파일명 형식 기반 Fallback 확인
-                match = re.search(r'(\d{2})(\d{2})(\d{2})', os.path.basename(sample_file))
-                if match:
-                    print(f"    Date not found in cells. Fallback from filename: {match.group(0)}")
+                if not found_date:
+                    # 2. 6자리 파일명 형식 기반 Fallback 확인
+                    match = re.search(r'(\d{2})(\d{2})(\d{2})', os.path.basename(sample_file))
+                    if match:
+                        print(f"    Date not found in cells. Fallback from filename: {match.group(0)}")
                     
-            if found_date:
-                break # Move to next file if date logic works out for any sheet
+                if found_date:
+                    break # Move to next file if date logic works out for any sheet
                 
     except Exception as e:
         print(f"  Error: {e}")
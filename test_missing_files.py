@@ -1,12 +1,13 @@
 import os
 import glob
 import pandas as pd
+from bid_store import read_table
 
 folder = r"E:\인프라수주팀\트레이닝\24년이후 입찰결과"
 all_files = glob.glob(os.path.join(folder, "**", "*.xlsb"), recursive=True) + glob.glob(os.path.join(folder, "**", "*.xlsx"), recursive=True)
 files = [f for f in all_files if not os.path.basename(f).startswith('~$')]
 
-processed = pd.read_csv("bidding_analysis.csv")['File'].unique()
+processed = set(read_table('analysis', columns=['File'])['File'].unique())
 missing = [f for f in files if os.path.basename(f) not in processed]
 
 for f in missing[:3]:
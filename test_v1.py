@@ -1,5 +1,5 @@
 import os
-import pandas as pd
+from bid_workbook import Workbook
 
 BASE_DIR = r"E:\인프라수주팀\트레이닝\24년이후 입찰결과"
 
@@ -9,21 +9,27 @@ for root, dirs, files in os.walk(BASE_DIR):
             sample_file = os.path.join(root, file)
             print(f"Testing {sample_file}")
             
-            xls = pd.ExcelFile(sample_file, engine='pyxlsb')
-            main_sheet = [sn for sn in xls.sheet_names if "기초" not in sn][0]
-            
-            df = pd.read_excel(sample_file, engine='pyxlsb', sheet_name=main_sheet, header=None)
-            
-            # V1 is row 0, col 21
-            v1_main = df.iloc[0, 21] if df.shape[1] > 21 else "No col V in main"
-            print(f"V1 in main sheet: {v1_main}")
-            
-            try:
-                df_info = pd.read_excel(sample_file, engine='pyxlsb', sheet_name='기초정보', header=None)
-                v1_info = df_info.iloc[0, 21] if df_info.shape[1] > 21 else "No col V in info"
-                print(f"V1 in 기초정보: {v1_info}")
-            except Exception as e:
-                print(f"Error info sheet: {e}")
+            with Workbook(sample_file) as wb:
+                main_sheet = [sn for sn in wb.sheet_names if "기초" not in sn][0]
+                
+                # V1 is row 0, col 21 (첫 행만 읽음)
+                df = wb.frame(main_sheet, stop=1)
+                # xlsb 는 값이 없는 행은 ROW 레코드가 없어서 첫 행이 비어 있으면 frame 도 비어 있음
+                if df.empty:
+                    v1_main = "Row 1 is empty in main"
+                else:
+                    v1_main = df.iloc[0, 21] if df.shape[1] > 21 else "No col V in main"
+                print(f"V1 in main sheet: {v1_main}")
+                
+                try:
+                    df_info = wb.frame('기초정보', stop=1)
+                    if df_info.empty:
+                        v1_info = "Row 1 is empty in info"
+                    else:
+                        v1_info = df_info.iloc[0, 21] if df_info.shape[1] > 21 else "No col V in info"
+                    print(f"V1 in 기초정보: {v1_info}")
+                except Exception as e:
+                    print(f"Error info sheet: {e}")
                 
             break
     break
@@ -0,0 +1,57 @@
+import openpyxl
+import pytest
+
+import bid_cache
+import bid_db
+import bid_quarantine
+import bid_schema
+from bid_company import COMPANIES
+
+# 테스트마다 캐시/리비전 레지스트리/입찰결과 DB(공용 업체 차원)를 임시 폴더로 돌리고, 입찰결과 양식(N4 배치)의 xlsx 픽스처를 만드는 도구
+
+HEADER = ['순위', '회사명', '입찰금액', '예가대비', '기초대비', None, None, None, '가격점수', None, None, '단가감점', None, '우선순위']
+BIDS = [
+    [1, '(주)한화', 154797802056.0, 88.1234, 91.2101, None, None, None, 49.9876, None, None, 0.0, None, 2],
+    [2, '대우건설 주식회사', 154800000000.0, 88.2, 91.3, None, None, None, 49.95, None, None, None, None, 1],
+    [3, '현대건설', 155000000000.0, 88.5, 91.5, None, None, None, 49.1, None, None, 0.001, None, 3],
+]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    cache = tmp_path / '.bid_cache'
+    monkeypatch.setattr(bid_cache, 'CACHE_DIR', str(cache))
+    monkeypatch.setattr(bid_schema, 'REGISTRY_FILE', str(cache / 'revisions.json'))
+    monkeypatch.setattr(bid_schema, '_learned', None)
+    monkeypatch.setattr(bid_quarantine, 'QUARANTINE_FILE', str(cache / 'quarantine.json'))
+    monkeypatch.setattr(bid_quarantine, '_entries', None)
+    monkeypatch.setattr(bid_db, 'DB_FILE', str(cache / 'bids.db'))
+    for attr, value in (('conn', None), ('loaded', False), ('alias_ids', {}), ('ids', {}), ('names', {})):
+        monkeypatch.setattr(COMPANIES, attr, value)
+    return cache
+
+
+def tender_rows(name='픽스처공사', client='한국도로공사', bid_date='2024-01-01', base=1000.0, balance=900.0, bids=BIDS):
+    """입찰결과 시트 행 목록 (헤더 영역 + 9행 순위표)"""
+    rows = [['입  찰  결  과'], [], [],
+            ['공사명', None, name, None, None, None, '기초금액', None, base],
+            ['발주처', None, client, None, None, None, '예정가격', None, 980.0],
+            ['낙찰자결정방법', None, '종합심사낙찰제', None, None, None, '균형가격', None, balance],
+            ['입찰일', None, bid_date], [], []]
+    return rows + [HEADER] + [list(bid) for bid in bids]
+
+
+@pytest.fixture
+def make_tender(tmp_path):
+    """make_tender(파일명, **tender_rows 인자) -> xlsx 경로 (하위 폴더는 '/' 로)"""
+    def make(file_name, rows=None, **kwargs):
+        path = tmp_path / file_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = '입찰결과'
+        for row in rows if rows is not None else tender_rows(**kwargs):
+            ws.append(row)
+        wb.save(path)
+        return str(path)
+    return make
@@ -0,0 +1,93 @@
+import struct
+import zipfile
+
+import numpy as np
+
+from bid_biff12 import extract_ranking
+from bid_cache import parse_tender
+from conftest import BIDS, HEADER
+
+# 순위표가 있는 최소 xlsb 픽스처를 BIFF12 레코드로 직접 만들어서
+# bid_biff12.extract_ranking (타입 배열) 과 bid_cache.parse_tender (레코드) 결과를 비교
+
+
+def _varint_id(rec_id):
+    out = bytearray()
+    while True:
+        b = rec_id & 0xFF
+        rec_id >>= 8
+        out.append(b | (0x80 if rec_id else 0))
+        if not rec_id:
+            return bytes(out)
+
+
+def _varint_size(size):
+    out = bytearray()
+    while True:
+        b = size & 0x7F
+        size >>= 7
+        out.append(b | (0x80 if size else 0))
+        if not size:
+            return bytes(out)
+
+
+def _record(rec_id, payload=b''):
+    return _varint_id(rec_id) + _varint_size(len(payload)) + payload
+
+
+def _wide(text):
+    return struct.pack('<I', len(text)) + text.encode('utf-16-le')
+
+
+def _cell(col, value):
+    head = struct.pack('<II', col, 0)
+    if isinstance(value, str):
+        return _record(0x0006, head + _wide(value))
+    return _record(0x0005, head + struct.pack('<d', float(value)))
+
+
+def _sheet_bin(rows):
+    data = _record(0x0191)
+    for r_idx, values in rows:
+        data += _record(0x0000, struct.pack('<I', r_idx) + b'\x00' * 21)
+        for c_idx, value in enumerate(values):
+            if value is not None:
+                data += _cell(c_idx, value)
+    return data + _record(0x0192)
+
+
+def write_xlsb(path, rows, sheet='입찰결과'):
+    workbook = _record(0x019C, struct.pack('<II', 0, 1) + _wide('rId1') + _wide(sheet))
+    rels = ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.bin"/></Relationships>')
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('xl/workbook.bin', workbook)
+        zf.writestr('xl/_rels/workbook.bin.rels', rels)
+        zf.writestr('xl/worksheets/sheet1.bin', _sheet_bin(rows))
+
+
+def test_extract_ranking_matches_parse_tender(tmp_path):
+    path = tmp_path / '입찰결과 - 240101 (종심) 픽스처공사.xlsb'
+    rows = [(0, ['입  찰  결  과']), (3, ['공사명', None, '픽스처공사'])]
+    rows += [(9, HEADER)] + [(10 + i, bid) for i, bid in enumerate(BIDS)] + [(14, ['비고'])]
+    write_xlsb(path, rows)
+
+    arrays = extract_ranking(str(path))
+    record = parse_tender(str(path))
+    bids = record['bids']
+    assert len(bids) == len(BIDS)
+    assert list(arrays['rank']) == [bid['rank'] for bid in bids]
+    assert arrays['company'] == [bid['company'] for bid in bids]
+    assert list(arrays['amount']) == [int(round(bid['amount'])) for bid in bids]
+    assert list(arrays['priority']) == [bid['priority'] for bid in bids]
+    for field in ('yega_ratio', 'base_ratio', 'price_score', 'deduct_score'):
+        expected = np.array([np.nan if bid[field] is None else bid[field] for bid in bids])
+        np.testing.assert_array_equal(arrays[field], expected)
+
+
+def test_extract_ranking_without_header(tmp_path):
+    path = tmp_path / '입찰결과 - 240102 순위표없음.xlsb'
+    write_xlsb(path, [(0, ['참여회사: 진흥기업 등']), (1, ['x', '진흥기업', 123.0])])
+    assert extract_ranking(str(path)) is None
+    assert extract_ranking(str(path), full=True) is None
@@ -0,0 +1,63 @@
+import os
+import pickle
+
+import bid_cache
+from bid_cache import cache_file, load_tender, read_cached
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    parse = bid_cache.parse_tender
+
+    def counting(path, read_from=None):
+        calls.append(path)
+        return parse(path, read_from)
+    monkeypatch.setattr(bid_cache, 'parse_tender', counting)
+    return calls
+
+
+def test_cache_hit_and_invalidation(make_tender, monkeypatch):
+    path = make_tender('입찰결과 - 240101 (종심) 픽스처공사.xlsx')
+    calls = _count_parses(monkeypatch)
+
+    record = load_tender(path)
+    assert [bid['rank'] for bid in record['bids']] == [1, 2, 3]
+    assert record['info']['발주처'] == '한국도로공사'
+    assert load_tender(path) == record
+    assert len(calls) == 1
+
+    # 수정시각만 바뀌어도 다시 파싱
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    load_tender(path)
+    assert len(calls) == 2
+
+    # 내용(크기)이 바뀌면 다시 파싱해서 새 값 반환
+    make_tender('입찰결과 - 240101 (종심) 픽스처공사.xlsx', client='한국토지주택공사 본사')
+    assert load_tender(path)['info']['발주처'] == '한국토지주택공사 본사'
+    assert len(calls) == 3
+
+    assert load_tender(path, use_cache=False) is not None
+    assert len(calls) == 4
+
+
+def test_stale_cache_version_is_ignored(make_tender, monkeypatch):
+    path = make_tender('입찰결과 - 240102 (종심) 픽스처공사.xlsx')
+    load_tender(path)
+    with open(cache_file(path), 'rb') as fh:
+        entry = pickle.load(fh)
+    assert read_cached(path) is not None
+
+    entry['version'] = bid_cache.CACHE_VERSION - 1
+    with open(cache_file(path), 'wb') as fh:
+        pickle.dump(entry, fh)
+    assert read_cached(path) is None
+
+    # 깨진 캐시 파일도 없는 것으로 취급
+    with open(cache_file(path), 'wb') as fh:
+        fh.write(b'not a pickle')
+    assert read_cached(path) is None
+    calls = _count_parses(monkeypatch)
+    load_tender(path)
+    assert len(calls) == 1
+    assert read_cached(path) is not None
@@ -0,0 +1,52 @@
+import bid_db
+from bid_company import CompanyDimension, canonical_name
+from bid_db import connect, db_token
+
+
+def test_canonical_name():
+    assert canonical_name('★ 동부건설 주식회사') == '동부건설'
+    assert canonical_name('대보건설(주)') == '대보건설'
+    assert canonical_name('HDC현대산업개발(주)') == '에이치디씨현대산업개발'
+    assert canonical_name('hdc 현대산업개발') == '에이치디씨현대산업개발'
+    assert canonical_name('DL이앤씨') == '디엘이앤씨'
+    assert canonical_name('한화건설부문') == '한화'
+    # 분할 전 법인은 별개 업체, 별칭은 정확히 같을 때만 (부분 일치 아님)
+    assert canonical_name('대림산업') == '대림산업'
+    assert canonical_name('GS건설산업') == 'GS건설산업'
+    assert canonical_name(None) == ''
+
+
+def test_aliases_share_one_id_across_connections(tmp_path):
+    db_file = str(tmp_path / 'bids.db')
+    companies = CompanyDimension(db_file=db_file)
+    hdc = companies.id_of('HDC현대산업개발')
+    assert companies.id_of('에이치디씨현대산업개발(주)') == hdc
+    assert companies.id_of('현대산업개발') == hdc
+    assert companies.id_of('현대건설') != hdc
+    assert companies.name_of(hdc) == '에이치디씨현대산업개발'
+    assert companies.aliases(hdc) == ['HDC현대산업개발', '에이치디씨현대산업개발(주)', '현대산업개발']
+
+    # 다른 프로세스(새 연결)에서도 원본 표기 -> 같은 ID, 조회는 등록하지 않음
+    other = CompanyDimension(db_file=db_file)
+    assert other.resolve('HDC') == hdc
+    assert other.resolve('처음보는건설') is None
+    assert len(other) == 2
+
+
+def test_alias_table_change_rebuilds_db(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'bids.db')
+    conn = connect(db_file)
+    CompanyDimension(conn).id_of('한화건설')
+    token = db_token(conn)
+    conn.close()
+
+    conn = connect(db_file)
+    assert db_token(conn) == token
+    conn.close()
+
+    # 별칭표가 바뀌면 업체 ID 가 달라지므로 DB 를 비우고 새 토큰 발급
+    monkeypatch.setattr(bid_db, 'ALIAS_SIGNATURE', 'changed')
+    conn = connect(db_file)
+    assert db_token(conn) != token
+    assert conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 0
+    conn.close()
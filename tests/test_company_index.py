@@ -0,0 +1,37 @@
+from bid_company import CompanyDimension, CompanyIndex
+
+
+def _linear_lookup(entries, companies, company_id):
+    """예전 find_company_info: 같은 업체, 없으면 사전 순서대로 이름 부분 일치 (1글자 키 제외)"""
+    if company_id in entries:
+        return entries[company_id]
+    target = companies.name_of(company_id)
+    for key_id, value in entries.items():
+        name = companies.name_of(key_id)
+        if len(name) > 1 and (name in target or target in name):
+            return value
+    return None
+
+
+def test_lookup_matches_linear_scan():
+    companies = CompanyDimension(memory=True)
+    groups = ['대우건설', '한양', '비에스한양', '동부건설', '한', 'HDC현대산업개발']
+    entries = {companies.id_of(name): f"그룹{i}" for i, name in enumerate(groups)}
+    index = CompanyIndex(entries, companies)
+
+    bidders = ['대우건설(주)', '한양산업개발', '비에스한양', '동부', '한라', '한', '에이치디씨현대산업개발',
+               '현대산업개발', '진흥기업', '대우', '비에스']
+    for name in bidders:
+        company_id = companies.id_of(name)
+        assert index.lookup(company_id) == _linear_lookup(entries, companies, company_id), name
+    assert index.lookup(None) is None
+
+
+def test_lookup_prefers_earlier_key():
+    companies = CompanyDimension(memory=True)
+    entries = {companies.id_of('한양'): 'A', companies.id_of('비에스한양'): 'B'}
+    index = CompanyIndex(entries, companies)
+    # '비에스한양주택' 에는 두 키가 다 들어 있음 -> 사전 순서가 앞선 '한양'
+    assert index.lookup(companies.id_of('비에스한양주택')) == 'A'
+    # 같은 업체(별칭 포함)는 이름 비교 없이 바로
+    assert index.lookup(companies.id_of('BS한양')) == 'B'
@@ -0,0 +1,41 @@
+import os
+import shutil
+
+import bid_pool
+from bid_dedup import dedup_paths, provenance, revision_key
+from conftest import BIDS
+
+
+def test_revision_key_orders_numerically():
+    revisions = ['N4.12', None, 'N4.9', 'N4.10', 'n4.11']
+    assert sorted(revisions, key=revision_key) == [None, 'N4.9', 'N4.10', 'n4.11', 'N4.12']
+    assert revision_key('N4.9') < revision_key('N4.10') < revision_key('N4.12')
+
+
+def test_dedup_keeps_newest_revision(make_tender, tmp_path, monkeypatch):
+    index_file = str(tmp_path / 'fingerprints.json')
+    old = make_tender('24년이후/입찰결과 - 240101 (종심) 가공사_Rev.N4.9.xlsx')
+    new = make_tender('종심제,종평제/입찰결과 - 240101 (종심) 가공사_Rev.N4.10.xlsx')
+    other = make_tender('24년이후/입찰결과 - 240102 (종심) 나공사.xlsx', bids=BIDS[:2])
+    empty = make_tender('24년이후/입찰결과 - 240103 (종심) 다공사.xlsx', bids=[])
+    paths = [old, new, other, empty]
+
+    parsed = []
+    load_tenders = bid_pool.load_tenders
+    monkeypatch.setattr(bid_pool, 'load_tenders', lambda paths, jobs=1: parsed.extend(paths) or load_tenders(paths, jobs))
+
+    kept, duplicates = dedup_paths(paths, index_file=index_file)
+    assert kept == [new, other, empty]
+    assert duplicates == {old: new}
+    assert provenance(old, index_file) == {'kept': os.path.abspath(new), 'duplicates': [os.path.abspath(old)]}
+    assert provenance(other, index_file) is None
+
+    # 두 번째 실행은 지문 캐시만 사용, 다른 폴더에 복사된 같은 파일은 해시로 지문 재사용 (파싱 안 함)
+    parsed.clear()
+    copy = str(tmp_path / '불참공사' / os.path.basename(old))
+    os.makedirs(os.path.dirname(copy))
+    shutil.copy2(old, copy)
+    kept, duplicates = dedup_paths(paths + [copy], index_file=index_file)
+    assert parsed == []
+    assert kept == [new, other, empty]
+    assert duplicates == {old: new, copy: new}
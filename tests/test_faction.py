@@ -0,0 +1,38 @@
+import random
+
+from bid_faction import FACTIONS, MATCHER, match_faction, tag_bids
+
+
+def substring_faction(company):
+    """예전 analyze_factions 의 세력 판별 (사전 순서대로 부분 문자열 비교)"""
+    name = company.replace(' ', '')
+    for key, faction in FACTIONS.items():
+        if key in name:
+            return key, faction
+    return None, None
+
+
+def test_matcher_agrees_with_substring_loop():
+    rng = random.Random(0)
+    keys = list(FACTIONS)
+    pieces = keys + ['(주)', '주식회사', '㈜', '컨소시엄', '건설', '한', '양', ' ', '에이치', '산업']
+    names = ['비에스한양', '한양', '디엘건설', '디엘이앤씨', '한화', '현대건설', '대림산업', '', '진흥기업']
+    for _ in range(2000):
+        names.append(''.join(rng.choice(pieces) for _ in range(rng.randint(1, 4))))
+    for name in names:
+        assert match_faction(name) == substring_faction(name), name
+    # 여러 업체명을 한 번에 훑어도 업체별 결과가 같아야 함
+    assert MATCHER.match_many(names) == [substring_faction(name) for name in names]
+
+
+def test_prefers_earlier_key():
+    assert match_faction('비에스한양') == ('비에스한양', '원숭이(하늘)')
+    assert match_faction('(주)한양') == ('한양', '원숭이(하늘)')
+    assert match_faction('진흥기업') == (None, None)
+
+
+def test_tag_bids_uses_canonical_names():
+    bids = [{'company': '★ 비에스한양(주)'}, {'company': 'BS한양'}, {'company': '진흥기업 주식회사'}]
+    assert tag_bids(bids) == [('비에스한양', '비에스한양', '원숭이(하늘)'),
+                              ('비에스한양', '비에스한양', '원숭이(하늘)'),
+                              ('진흥기업', None, None)]
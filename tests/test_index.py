@@ -0,0 +1,50 @@
+import os
+
+from bid_cache import load_tender
+from bid_index import filename_date, folder_years, index_entry, matches, parse_filters, period_end, prune
+
+
+def test_period_end():
+    assert period_end('2024') == '2024-12-31'
+    assert period_end('2024-06') == '2024-06-31'
+    assert period_end('2024-06-15') == '2024-06-15'
+    assert period_end(None) is None
+    filters, rest = parse_filters(['--until', '2024', '--method', '종심', 'x'])
+    assert filters['until'] == '2024-12-31' and filters['methods'] == ['종심'] and rest == ['x']
+
+
+def test_until_year_keeps_whole_year():
+    entry = {'date': '2024-12-15', 'years': None, 'method': None, 'client': None}
+    assert matches(entry, until='2024')
+    assert matches(entry, until='2024-12')
+    assert not matches(entry, until='2024-11')
+    assert not matches(entry, since='2025-01-01')
+
+
+def test_filename_and_folder_dates():
+    assert filename_date('입찰결과 - 260113 (종심) 공사.xlsb') == '2026-01-13'
+    assert filename_date('입찰결과 - 261313 (종심) 공사.xlsb') is None
+    assert folder_years(os.path.join('x', '2023', 'a.xlsb')) == (2023, 2023)
+    assert folder_years(os.path.join('x', '2020전', 'a.xlsb')) == (None, 2019)
+    # 파일명에 날짜가 없으면 폴더 연도로만 판단
+    entry = {'date': None, 'years': (None, 2019), 'method': None, 'client': None}
+    assert not matches(entry, since='2020-01-01')
+    assert matches(entry, until='2019')
+
+
+def test_prune_keeps_unknowns_and_uses_cached_client(make_tender, tmp_path):
+    old = make_tender('2023/입찰결과 - 230105 (종평) 가공사.xlsx')
+    new = make_tender('2024/입찰결과 - 240105 (종심-고) 나공사.xlsx')
+    undated = make_tender('기타/입찰결과 (간이종심) 다공사.xlsx', client='한국토지주택공사')
+    paths = [old, new, undated]
+
+    assert prune(paths, since='2024') == [new, undated]
+    assert prune(paths, until='2023') == [old, undated]
+    assert prune(paths, methods=['종심']) == [new]
+
+    # 발주처는 캐시된 헤더에서만 알 수 있음 (캐시 전에는 통과)
+    assert prune(paths, clients=['한국도로공사']) == paths
+    for path in paths:
+        load_tender(path)
+    assert index_entry(undated)['client'] == '한국토지주택공사'
+    assert prune(paths, clients=['한국도로공사']) == [old, new]
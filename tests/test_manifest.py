@@ -0,0 +1,44 @@
+import os
+
+from bid_manifest import scan_changes, stale_files, update_manifest
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_scan_changes_add_modify_remove(tmp_path):
+    sub = tmp_path / '2025'
+    sub.mkdir()
+    same = _write(tmp_path / 'a.xlsb', b'aaaa')
+    touched = _write(tmp_path / 'b.xlsb', b'bbbb')
+    modified = _write(sub / 'a.xlsb', b'cccc')
+    removed = _write(tmp_path / 'd.xlsb', b'dddd')
+    manifest = update_manifest({}, [(p, {'revision': None}) for p in (same, touched, modified, removed)])
+
+    st = os.stat(touched)
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))  # 내용은 그대로, 수정시각만 바뀜
+    _write(sub / 'a.xlsb', b'cccc-changed')
+    os.remove(removed)
+    added = _write(tmp_path / 'e.xlsb', b'eeee')
+
+    changes = scan_changes([same, touched, modified, added], manifest, str(tmp_path))
+    assert changes['added'] == [added]
+    assert changes['modified'] == [modified]
+    assert sorted(changes['unchanged']) == sorted([same, touched])
+    assert changes['removed'] == [os.path.abspath(removed)]
+    # 하위 폴더의 같은 파일명(a.xlsb)은 경로로 구분
+    assert stale_files(changes) == {os.path.abspath(p) for p in (added, modified, removed)}
+
+
+def test_scan_changes_ignores_removed_outside_base_dir(tmp_path):
+    inside, outside = tmp_path / 'in', tmp_path / 'out'
+    inside.mkdir()
+    outside.mkdir()
+    kept = _write(inside / 'a.xlsb', b'a')
+    gone = _write(outside / 'b.xlsb', b'b')
+    manifest = update_manifest({}, [(kept, {'revision': None}), (gone, {'revision': None})])
+    os.remove(gone)
+    changes = scan_changes([kept], manifest, str(inside))
+    assert changes['removed'] == []
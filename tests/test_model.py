@@ -0,0 +1,33 @@
+from bid_cache import load_tender
+from bid_company import CompanyDimension
+from bid_db import register_companies
+from bid_model import Tender, price_limit, tender_facts
+
+
+def test_from_record_does_not_register_companies(make_tender):
+    record = load_tender(make_tender('입찰결과 - 240101 (종심) 픽스처공사.xlsx'))
+    companies = CompanyDimension(memory=True)
+
+    # 조회/분석 경로: 처음 보는 업체는 ID 없이(-1) 원본 표기로
+    tender = Tender.from_record(record, companies)
+    assert list(tender.company_id) == [-1, -1, -1]
+    assert [tender.company(i) for i in range(len(tender))] == ['한화', '대우건설', '현대건설']
+    assert len(companies) == 0
+
+    # 적재 경로에서 등록한 뒤에는 같은 업체 ID
+    ids = register_companies(record, companies)
+    tender = Tender.from_record(record, companies)
+    assert list(tender.company_id) == ids
+    assert [tender.company(i) for i in range(len(tender))] == ['한화', '대우건설', '현대건설']
+
+
+def test_price_limit_and_facts(make_tender):
+    record = load_tender(make_tender('입찰결과 - 240101 (종심) 픽스처공사.xlsx'))
+    companies = CompanyDimension(memory=True)
+    register_companies(record, companies)
+    tender = Tender.from_record(record, companies)
+    row, limit_yega = price_limit(tender)
+    assert row == 0 and abs(limit_yega - 88.1234) < 1e-9
+    facts = tender_facts(tender)
+    assert facts['bidder_count'] == 3
+    assert companies.name_of(facts['winner_company_id']) == '대우건설'
@@ -0,0 +1,30 @@
+import os
+
+from bid_pool import load_tenders
+from bid_quarantine import quarantined
+
+
+def test_results_keep_input_order(make_tender):
+    paths = [make_tender(f'입찰결과 - 2401{d:02d} (종심) 공사{d}.xlsx', name=f'공사{d}') for d in (3, 1, 2)]
+    results = load_tenders(paths, jobs=2, use_mirror=False)
+    assert [path for path, _ in results] == paths
+    assert [record['info']['공사명'] for _, record in results] == ['공사3', '공사1', '공사2']
+    # 두 번째는 캐시에서 바로 (워커 없이)
+    assert load_tenders(paths, jobs=2, timeout=0.001, use_mirror=False) == results
+
+
+def test_timeout_applies_to_single_file_and_quarantines(make_tender):
+    path = make_tender('입찰결과 - 240104 (종심) 느린공사.xlsx')
+    # 워커 시작만으로도 넘는 시간 상한 -> 파일 하나여도 워커에서 돌려서 시간초과
+    [(_, record)] = load_tenders([path], jobs=1, timeout=0.001, use_mirror=False)
+    assert record is None
+    assert quarantined(path)['stage'] == 'timeout'
+
+    # 격리된 파일은 바뀌기 전까지 열지 않음
+    assert load_tenders([path], jobs=1, use_mirror=False) == [(path, None)]
+
+    make_tender('입찰결과 - 240104 (종심) 느린공사.xlsx', name='느린공사 수정')
+    [(_, record)] = load_tenders([path], jobs=1, use_mirror=False)
+    assert record['info']['공사명'] == '느린공사 수정'
+    assert quarantined(path) is None
+    assert os.path.exists(path)
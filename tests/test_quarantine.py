@@ -0,0 +1,43 @@
+import os
+
+import bid_cache
+from bid_cache import iter_tenders
+from bid_quarantine import entries, quarantine, quarantined, release
+
+
+def test_broken_workbook_is_skipped_until_it_changes(make_tender, tmp_path, monkeypatch):
+    good = make_tender('입찰결과 - 240101 (종심) 가공사.xlsx')
+    broken = str(tmp_path / '입찰결과 - 240102 (종심) 나공사_Rev.N4.12.xlsx')
+    with open(broken, 'wb') as fh:
+        fh.write(b'not a workbook')
+
+    assert [p for p, _ in iter_tenders([good, broken])] == [good]
+    entry = quarantined(broken)
+    assert entry['stage'] == 'decode' and entry['revision'] == 'N4.12'
+
+    # 다음 실행부터는 열지 않음 (수정시각만 바뀐 경우도 내용 해시가 같으면 격리 유지)
+    opened = []
+    load = bid_cache.load_tender
+    monkeypatch.setattr(bid_cache, 'load_tender', lambda path, use_cache=True: opened.append(path) or load(path, use_cache))
+    st = os.stat(broken)
+    os.utime(broken, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert [p for p, _ in iter_tenders([good, broken])] == [good]
+    assert opened == [good]
+    assert entries()[os.path.abspath(broken)]['mtime_ns'] == st.st_mtime_ns + 10 ** 9
+
+    # 고쳐진 파일은 격리 해제 후 정상 파싱
+    make_tender('입찰결과 - 240102 (종심) 나공사_Rev.N4.12.xlsx')
+    assert [p for p, _ in iter_tenders([good, broken])] == [good, broken]
+    assert quarantined(broken) is None and os.path.abspath(broken) not in entries()
+
+
+def test_script_stage_only_blocks_that_script(make_tender):
+    path = make_tender('입찰결과 - 240101 (종심) 가공사.xlsx')
+    quarantine(path, 'analyze_dorogongsa_limits', ValueError('bad limit'))
+    assert quarantined(path) is None
+    assert quarantined(path, ('analyze_dorogongsa_limits',))['error'] == 'bad limit'
+    # 파싱 성공은 파싱 단계 격리만 해제
+    assert [p for p, _ in iter_tenders([path])] == [path]
+    assert quarantined(path, ('analyze_dorogongsa_limits',)) is not None
+    release(path, ('analyze_dorogongsa_limits',))
+    assert quarantined(path, ('analyze_dorogongsa_limits',)) is None
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import upload_hanwha_bids_v5
+from bid_company import CompanyDimension
+from bid_db import connect, sync
+from bid_query import by_tender, company_bids, company_ids, facts, tenders, winners
+from conftest import BIDS
+
+
+@pytest.fixture
+def conn(make_tender, tmp_path):
+    paths = [make_tender('archive/입찰결과 - 240105 (종심) 가공사.xlsx', name='가공사', bid_date='2024-01-05'),
+             make_tender('archive/입찰결과 - 250105 (종평) 나공사.xlsx', name='나공사', bid_date='2025-01-05',
+                         client='한국토지주택공사', bids=BIDS[1:])]
+    conn = connect(str(tmp_path / 'bids.db'))
+    sync(conn, paths, base_dir=str(tmp_path / 'archive'))
+    yield conn
+    conn.close()
+
+
+def test_tenders_and_company_bids(conn, tmp_path):
+    base_dir = str(tmp_path / 'archive')
+    assert [t['title'] for t in tenders(conn, base_dir=base_dir)] == ['가공사', '나공사']
+    assert [t['title'] for t in tenders(conn, since='2025')] == ['나공사']
+    assert [t['title'] for t in tenders(conn, until='2024')] == ['가공사']
+    assert [t['title'] for t in tenders(conn, clients=['토지주택'])] == ['나공사']
+
+    companies = CompanyDimension(conn)
+    hanwha = companies.resolve('한화건설(주)')
+    assert hanwha is not None and company_ids(conn, ['한화']) == [hanwha]
+    rows = company_bids(conn, [hanwha], base_dir=base_dir)
+    assert [(row['title'], row['company'], row['priority']) for row in rows] == [('가공사', '한화', 2)]
+    assert list(by_tender(rows)) == [rows[0]['id']]
+
+    # 우선순위 1 과 입찰 건 요약
+    assert sorted(w['company'] for w in winners(conn).values()) == ['대우건설', '대우건설']
+    assert [f['bidder_count'] for f in facts(conn, base_dir=base_dir)] == [3, 2]
+
+
+def test_unknown_company_is_not_an_error(conn, monkeypatch):
+    companies = CompanyDimension(conn)
+    assert companies.resolve('처음보는건설') is None
+    monkeypatch.setattr(upload_hanwha_bids_v5, 'COMPANIES', companies)
+    assert upload_hanwha_bids_v5.bids_by_tender(conn, '처음보는건설', {}) == {}
+    assert len(upload_hanwha_bids_v5.bids_by_tender(conn, '한화', {})) == 1
+    # 조회는 업체를 등록하지 않음
+    assert companies.resolve('처음보는건설') is None
+    assert conn.execute("SELECT COUNT(*) FROM companies WHERE name = '처음보는건설'").fetchone()[0] == 0
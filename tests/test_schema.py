@@ -0,0 +1,31 @@
+import bid_schema
+from bid_cache import parse_tender
+
+
+def test_fields_missing_from_learned_schema_are_still_read(make_tender):
+    # 같은 리비전에서 균형가격이 빈칸인 파일 A 가 먼저 파싱되어 좌표를 학습해도 파일 B 의 균형가격은 읽어야 함
+    a = make_tender('입찰결과 - 240101 (종심) 공사A_Rev.N2.14.xlsx', balance=None)
+    b = make_tender('입찰결과 - 240102 (종심) 공사B_Rev.N2.14.xlsx', balance=950.0)
+
+    assert parse_tender(a)['info']['균형가격'] is None
+    assert '균형가격' not in bid_schema.get_schema('N2.14')['fields']
+
+    record = parse_tender(b)
+    assert record['info']['균형가격'] == 950.0
+    assert record['info']['기초금액'] == 1000.0
+    assert [bid['rank'] for bid in record['bids']] == [1, 2, 3]
+    # B 에서 찾은 좌표를 배워서 다음부터는 고정 좌표로 바로 읽음
+    assert bid_schema.get_schema('N2.14')['fields']['균형가격'] == [5, 6, 8]
+    assert parse_tender(a)['info']['균형가격'] is None
+
+
+def test_learned_schema_matches_keyword_scan(make_tender, monkeypatch):
+    first = make_tender('입찰결과 - 240103 (종심) 공사C_Rev.N2.15.xlsx')
+    second = make_tender('입찰결과 - 240104 (종심) 공사D_Rev.N2.15.xlsx', name='공사D', client='한국토지주택공사', base=2000.0)
+    parse_tender(first)
+    fixed = parse_tender(second)
+    # 레지스트리를 비우고 같은 파일을 키워드 검색으로 파싱한 결과와 같아야 함
+    monkeypatch.setattr(bid_schema, '_learned', None)
+    monkeypatch.setattr(bid_schema, 'REGISTRY_FILE', bid_schema.REGISTRY_FILE + '.empty')
+    assert parse_tender(second) == fixed
+    assert fixed['info']['공사명'] == '공사D' and fixed['info']['기초금액'] == 2000.0
@@ -0,0 +1,78 @@
+import re
+
+from bid_sheet import upsert_rows
+
+
+class FakeWorksheet:
+    """gspread 워크시트에서 upsert_rows 가 쓰는 부분만 흉내 (값은 문자열로 저장)"""
+
+    def __init__(self, rows):
+        self.rows = [[str(v) for v in row] for row in rows]
+        self.calls = []
+
+    def get_all_values(self):
+        return [list(row) for row in self.rows]
+
+    def delete_rows(self, start, end):
+        self.calls.append('delete')
+        del self.rows[start - 1:end]
+
+    def batch_update(self, data):
+        self.calls.append('update')
+        for item in data:
+            r = int(re.match(r'A(\d+):', item['range']).group(1))
+            self.rows[r - 1] = [str(v) for v in item['values'][0]]
+
+    def insert_rows(self, values, row=1, inherit_from_before=False):
+        self.calls.append('insert')
+        self.rows[row - 1:row - 1] = [[str(v) for v in r] for r in values]
+
+
+def _sheet():
+    return FakeWorksheet([['일자', '공고명', '값'],
+                          ['240101', 'A공사', 1],
+                          ['240105', 'B공사', 2],
+                          ['240110', 'C공사', 3],
+                          ['240120', 'D공사', 4]])
+
+
+def _key(row):
+    return row[1]
+
+
+def _order(row):
+    return str(row[0])
+
+
+def test_upsert_updates_inserts_and_deletes():
+    ws = _sheet()
+    rows = [['240105', 'B공사', 20],   # 그 자리에서 수정
+            ['240103', 'E공사', 5],    # A 와 B 사이에 추가
+            ['240104', 'F공사', 6],    # 같은 위치에 한 번에 추가
+            ['240130', 'G공사', 7]]    # 맨 뒤에 추가
+    touched = upsert_rows(ws, rows, _key, stale={'C공사', 'B공사'}, order=_order)
+
+    assert [row[1] for row in ws.rows[1:]] == ['A공사', 'E공사', 'F공사', 'B공사', 'D공사', 'G공사']
+    assert ws.rows[4] == ['240105', 'B공사', '20']
+    assert ws.calls.count('delete') == 1 and ws.calls.count('insert') == 2
+    # 반환된 행 번호는 최종 시트 기준
+    assert touched == {'E공사': 3, 'F공사': 4, 'B공사': 5, 'G공사': 7}
+    for name, r in touched.items():
+        assert ws.rows[r - 1][1] == name
+
+
+def test_upsert_matches_full_rebuild():
+    # 증분 반영 결과가 전체 정렬 결과와 같음
+    ws = _sheet()
+    rows = [['240102', 'H공사', 8], ['240120', 'D공사', 40], ['240131', 'I공사', 9]]
+    upsert_rows(ws, rows, _key, stale={'A공사'}, order=_order)
+    expected = sorted([['240105', 'B공사', '2'], ['240110', 'C공사', '3'],
+                       ['240102', 'H공사', '8'], ['240120', 'D공사', '40'], ['240131', 'I공사', '9']])
+    assert ws.rows[1:] == expected
+
+
+def test_upsert_without_order_appends():
+    ws = _sheet()
+    upsert_rows(ws, [['240101', 'Z공사', 0]], _key)
+    assert ws.rows[-1] == ['240101', 'Z공사', '0']
+    assert ws.calls == ['insert']
@@ -0,0 +1,77 @@
+import numpy as np
+
+from bid_cache import load_tender
+from bid_company import COMPANIES
+from bid_sketch import Moments, SketchStore, TDigest
+from conftest import BIDS
+
+
+def test_moments_merge_matches_numpy():
+    rng = np.random.default_rng(0)
+    data = rng.normal(91.5, 0.8, 5000)
+    merged = Moments()
+    for chunk in np.array_split(data, 7):
+        part = Moments()
+        for x in chunk:
+            part.add(float(x))
+        merged.merge(part)
+    assert merged.count == len(data)
+    assert np.isclose(merged.mean(), data.mean())
+    assert np.isclose(merged.std(), data.std(ddof=1))
+    assert merged.min == data.min() and merged.max == data.max()
+
+
+def test_moments_std_keeps_precision_for_large_mean():
+    # 평균에 비해 편차가 아주 작으면 제곱합 공식은 자릿수 상쇄로 분산을 잃음
+    rng = np.random.default_rng(2)
+    data = 1e9 + rng.normal(0.0, 0.01, 2000)
+    merged = Moments()
+    for chunk in np.array_split(data, 3):
+        part = Moments()
+        for x in chunk:
+            part.add(float(x))
+        merged.merge(part)
+    merged.merge(Moments())
+    assert np.isclose(merged.std(), data.std(ddof=1), rtol=1e-6)
+    assert np.isnan(Moments().std()) and np.isnan(Moments().mean())
+
+
+def test_tdigest_quantile_close_to_numpy():
+    rng = np.random.default_rng(1)
+    data = np.concatenate([rng.normal(88.0, 0.5, 8000), rng.uniform(80.0, 95.0, 2000)])
+    whole = TDigest()
+    merged = TDigest()
+    for chunk in np.array_split(data, 5):
+        part = TDigest()
+        for x in chunk:
+            part.add(float(x))
+            whole.add(float(x))
+        merged.merge(part)
+    spread = data.max() - data.min()
+    for q in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+        expected = np.quantile(data, q)
+        assert abs(whole.quantile(q) - expected) < 0.01 * spread, q
+        assert abs(merged.quantile(q) - expected) < 0.01 * spread, q
+    assert whole.quantile(0.0) == data.min() and whole.quantile(1.0) == data.max()
+
+
+def test_sketch_store_update_and_rebuild(make_tender):
+    paths = [make_tender('입찰결과 - 240101 (종심) 가공사.xlsx', bid_date='2024-01-01'),
+             make_tender('입찰결과 - 240201 (종심) 나공사.xlsx', bid_date='2024-02-01', bids=BIDS[:2])]
+    store = SketchStore()
+    assert store.update([(p, load_tender(p)) for p in paths]) == 2
+    assert store.update([(p, load_tender(p)) for p in paths]) == 0  # 이미 반영된 파일
+
+    frame = store.frame(lambda cid, client, year: COMPANIES.name_of(cid), 'ratio').set_index('Key')
+    assert frame.loc['한화', 'count'] == 2
+    assert np.isclose(frame.loc['한화', 'mean'], 0.912101)
+    assert frame.loc['현대건설', 'count'] == 1
+
+    # 바뀐 입찰이 있는 연도는 다시 합산, 지워진 파일은 빠짐
+    make_tender('입찰결과 - 240201 (종심) 나공사.xlsx', bid_date='2024-02-01', bids=BIDS[:1])
+    store.update([(paths[1], load_tender(paths[1]))])
+    frame = store.frame(lambda cid, client, year: COMPANIES.name_of(cid), 'ratio').set_index('Key')
+    assert frame.loc['한화', 'count'] == 2 and frame.loc['대우건설', 'count'] == 1
+    store.update([], removed=[paths[0]])
+    frame = store.frame(lambda cid, client, year: COMPANIES.name_of(cid), 'ratio').set_index('Key')
+    assert frame['count'].to_dict() == {'한화': 1}
@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+
+from bid_store import date_partition, read_table, table_exists, write_table
+
+
+def _frame():
+    return pd.DataFrame({
+        'File': ['a.xlsb', 'a.xlsb', 'b.xlsb', 'c.xlsb'],
+        'Company': ['한화', '대우건설', '한화', '현대건설'],
+        'Ratio': [0.871, 0.872, 0.869, 0.88],
+        'Year': [2024, 2024, 2025, 0],
+        'Month': [1, 1, 3, 0],
+    })
+
+
+def test_partitioned_roundtrip(tmp_path):
+    store = str(tmp_path)
+    assert not table_exists('analysis', store)
+    write_table('analysis', _frame(), store)
+    assert table_exists('analysis', store)
+    assert sorted(os.listdir(os.path.join(store, 'analysis'))) == ['Year=0', 'Year=2024', 'Year=2025']
+
+    df = read_table('analysis', store_dir=store, categorical=False)
+    df = df.sort_values(['File', 'Company']).reset_index(drop=True)
+    expected = _frame().sort_values(['File', 'Company']).reset_index(drop=True)
+    assert df['File'].tolist() == expected['File'].tolist()
+    assert df['Company'].tolist() == expected['Company'].tolist()
+    assert df['Ratio'].tolist() == expected['Ratio'].tolist()
+    assert df['Year'].astype(int).tolist() == expected['Year'].tolist()
+
+    # 필요한 열/연도 파티션만 읽기, 반복 문자열은 사전 인코딩(categorical)
+    df = read_table('analysis', columns=['File', 'Year'], years=[2025], store_dir=store)
+    assert list(df.columns) == ['File', 'Year']
+    assert df['File'].astype(str).tolist() == ['b.xlsb']
+    assert isinstance(df['File'].dtype, pd.CategoricalDtype)
+
+
+def test_write_replaces_table(tmp_path):
+    store = str(tmp_path)
+    write_table('analysis', _frame(), store)
+    write_table('analysis', _frame().iloc[:1], store)
+    assert len(read_table('analysis', store_dir=store)) == 1
+    assert sorted(os.listdir(store)) == ['analysis']
+
+    # 연/월 열이 없으면 파티션 없이 저장
+    write_table('summary', pd.DataFrame({'Faction': ['개', '원숭이'], 'Count': [3, 5]}), store)
+    assert read_table('summary', store_dir=store, categorical=False)['Count'].tolist() == [3, 5]
+
+
+def test_date_partition():
+    assert date_partition('2025-03-07') == (2025, 3)
+    assert date_partition(None) == (0, 0)
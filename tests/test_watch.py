@@ -0,0 +1,31 @@
+import os
+
+import bid_manifest
+from bid_watch import FolderWatcher
+
+
+def test_watcher_picks_up_changes_made_while_stopped(make_tender, tmp_path, monkeypatch):
+    monkeypatch.setattr(bid_manifest, 'MANIFEST_DIR', str(tmp_path / 'manifest'))
+    first = make_tender('archive/입찰결과 - 240101 (종심) 가공사.xlsx')
+    base_dir = os.path.dirname(first)
+
+    # 매니페스트가 없으면 기존 파일도 처리 대상
+    watcher = FolderWatcher(base_dir, settle=0)
+    assert watcher.settled() == [first]
+    watcher.commit([(first, {'revision': None})])
+    assert FolderWatcher(base_dir, settle=0).settled() == []
+
+    # 감시가 꺼져 있는 동안 추가/수정/삭제
+    second = make_tender('archive/sub/입찰결과 - 240102 (종심) 나공사.xlsx')
+    watcher = FolderWatcher(base_dir, settle=0)
+    assert watcher.settled() == [second]
+    watcher.commit([(second, {'revision': None})])
+
+    make_tender('archive/입찰결과 - 240101 (종심) 가공사.xlsx', client='한국토지주택공사')
+    os.remove(second)
+    watcher = FolderWatcher(base_dir, settle=0)
+    assert watcher.removed == [second]
+    assert watcher.settled() == [first]
+    watcher.commit([(first, {'revision': None})])
+    restarted = FolderWatcher(base_dir, settle=0)
+    assert restarted.settled() == [] and restarted.removed == []
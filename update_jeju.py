@@ -1,6 +1,7 @@
 import pandas as pd
+from bid_store import read_table, write_table
 
-df = pd.read_csv('bidding_winners.csv')
+df = read_table('winners', categorical=False)
 file_name = '입찰결과 - 251113 (종평) 제주외항 2단계(잡화부두) 개발공사_Rev.N4.05.xlsb'
 company = '동부건설'
 faction = '원숭이(하늘)'
@@ -10,7 +11,7 @@ if mask.any():
     df.loc[mask, 'WinnerCompany'] = company
     df.loc[mask, 'WinnerFaction'] = faction
 else:
-    new_row = pd.DataFrame([{'File': file_name, 'WinnerCompany': company, 'WinnerFaction': faction}])
+    new_row = pd.DataFrame([{'File': file_name, 'Year': 2025, 'Month': 11, 'WinnerCompany': company, 'WinnerFaction': faction}])
     df = pd.concat([df, new_row], ignore_index=True)
 
-df.to_csv('bidding_winners.csv', index=False)
+write_table('winners', df)
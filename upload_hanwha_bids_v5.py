@@ -1,6 +1,12 @@
 import os
 import sys
-import pandas as pd
+from bid_pool import parse_jobs
+from bid_db import sync_folder
+from bid_cache import list_workbooks
+from bid_manifest import parse_incremental, select_targets, update_manifest, save_manifest
+from bid_sheet import upsert_rows
+from bid_query import tenders, facts, company_bids, by_tender
+from bid_company import COMPANIES
 import gspread
 from google.oauth2.service_account import Credentials
 import re
@@ -31,115 +37,144 @@ def extract_date(filename):
         return match.group(1)
     return "999999"
 
-def extract_all_bids_data(base_dir):
+def ratio_and_priority(bids, columns):
+    # 업체의 기초대비/우선순위 (우선순위 열이 없으면 순위 사용, 같은 업체가 여러 행이면 마지막 값)
+    base_ratio, priority = "", ""
+    for bid in bids:
+        br = bid['base_ratio'] if bid['base_ratio'] is not None else ""
+        pr = bid['priority'] if columns['priority'] != -1 else bid['rank']
+        if pr is None: pr = ""
+        if br != "": base_ratio = br
+        if pr != "": priority = pr
+    return base_ratio, priority
+
+def bids_by_tender(conn, name, filters):
+    company_id = COMPANIES.resolve(name)
+    if company_id is None:
+        print(f"입찰결과 DB 에 '{name}' 투찰 기록이 없습니다.")
+        return {}
+    return by_tender(company_bids(conn, [company_id], **filters))
+
+def extract_all_bids_data(base_dir, jobs=1, paths=None):
+    """시트 행 목록 (paths 를 주면 그 파일들의 행만, 반환: (행 목록, {경로: DB 입찰 행}))"""
     result = []
+    found = {}
+    
+    # 새로 들어오거나 바뀐 파일만 DB 에 반영하고, 나머지는 DB 에서 바로 조회
+    conn = sync_folder(base_dir, ('.xlsb',), jobs)
+    filters = {'base_dir': base_dir, 'exts': ('.xlsb',)}
+    
+    # 한화건설 / 에이치디씨현대산업개발 (현대산업개발, HDC현대산업개발 등 표기는 적재할 때 같은 업체 ID 로 묶임)
+    # 순위표에 한 번도 나오지 않은 업체는 ID 가 없으므로 투찰 없음 (입찰유무 "X")
+    hanwha_bids = bids_by_tender(conn, '한화', filters)
+    hdc_bids = bids_by_tender(conn, '에이치디씨현대산업개발', filters)
     
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith('.xlsb') and not file.startswith('~'):
-                file_path = os.path.join(root, file)
-                print(f"엑셀 읽는 중: {file}")
+    # 1위 낙찰율 (우선순위가 1인 업체의 기초대비) 은 입찰 건 요약에 미리 계산되어 있음
+    tender_facts = {fact['tender_id']: fact for fact in facts(conn, **filters)}
+    
+    for tender in tenders(conn, **filters):
+        file = tender['file']
+        if paths is not None and tender['path'] not in paths:
+            continue
+        found[tender['path']] = tender
+        
+        if not tender['has_ranking']:
+            print(f"{file}  -> 헤더 행을 찾을 수 없습니다.")
+            continue
+            
+        columns = tender['columns']
+        if columns['company'] == -1:
+            print(f"{file}  -> 필수 컬럼이 헤더에 없습니다: 회사명")
+            continue
+        
+        # 한화건설 데이터
+        hanwha_participated = "X"
+        hanwha_base_ratio = ""
+        hanwha_priority = ""
+        
+        # HDC 데이터
+        hdc_base_ratio = ""
+        hdc_priority = ""
+        
+        est_winning_ratio_val = ""
+        fact = tender_facts.get(tender['id'])
+        if fact is not None and fact['winner_base_ratio'] is not None:
+            est_winning_ratio_val = fact['winner_base_ratio']
+        
+        if tender['id'] in hanwha_bids:
+            hanwha_participated = "O"
+            hanwha_base_ratio, hanwha_priority = ratio_and_priority(hanwha_bids[tender['id']], columns)
+        if tender['id'] in hdc_bids:
+            hdc_base_ratio, hdc_priority = ratio_and_priority(hdc_bids[tender['id']], columns)
                 
-                try:
-                    df = pd.read_excel(file_path, engine='pyxlsb', header=None)
-                    
-                    header_row_idx = -1
-                    for idx, row in df.iterrows():
-                        if str(row[0]).replace(" ", "") == "순위" and str(row[1]).replace(" ", "") == "회사명":
-                            header_row_idx = idx
-                            break
+        result.append([
+            file, 
+            hanwha_participated, 
+            hanwha_base_ratio, 
+            est_winning_ratio_val, 
+            hanwha_priority,
+            hdc_base_ratio,
+            hdc_priority
+        ])
                     
-                    if header_row_idx == -1:
-                        print(f"  -> 헤더 행을 찾을 수 없습니다.")
-                        continue
-                        
-                    header_row = [str(x).replace("\n", "").replace(" ", "") for x in df.iloc[header_row_idx].values]
-                    
-                    try:
-                        idx_company = header_row.index('회사명')
-                        
-                        idx_base_ratio = -1
-                        if '기초대비' in header_row:
-                            idx_base_ratio = header_row.index('기초대비')
-                        elif '투찰율' in header_row:
-                            idx_base_ratio = header_row.index('투찰율')
+    conn.close()
+    return result, found
 
-                        idx_priority = -1
-                        if '낙찰우선순위' in header_row:
-                            idx_priority = header_row.index('낙찰우선순위')
-                        elif '우선순위' in header_row:
-                            idx_priority = header_row.index('우선순위')
-                        elif '순위' in header_row:
-                            idx_priority = header_row.index('순위')
-                            
-                    except ValueError as e:
-                        print(f"  -> 필수 컬럼이 헤더에 없습니다: {e}")
-                        continue
+def row_formats(rows, row_numbers):
+    """퍼센트 포맷 + 한화 낙찰우선순위(E열)가 10 미만인 행 배경색 (row_numbers: 각 행의 시트 행 번호)"""
+    batch = []
+    fmt_percent = CellFormat(numberFormat=NumberFormat(type='PERCENT', pattern='0.000%'))
+    light_green = Color(0.85, 0.95, 0.85)
+    # 이전 단계 파생: 폰트는 볼드 해제
+    fmt_highlight = CellFormat(backgroundColor=light_green, textFormat=TextFormat(bold=False))
+    # 증분 반영 시 끼워 넣은 행은 윗행 서식을 물려받으므로 하이라이트 대상이 아니면 배경을 되돌림
+    fmt_plain = CellFormat(backgroundColor=Color(1, 1, 1))
+    for row_num, row_data in zip(row_numbers, rows):
+        batch.append((f'C{row_num}:D{row_num}', fmt_percent))
+        batch.append((f'F{row_num}', fmt_percent))
+        highlight = False
+        hanwha_priority_val = row_data[4] # E열 (한화 낙찰우선순위)
+        if hanwha_priority_val != "":
+            try:
+                highlight = int(float(hanwha_priority_val)) < 10
+            except ValueError:
+                pass
+        batch.append((f'A{row_num}:G{row_num}', fmt_highlight if highlight else fmt_plain))
+    return batch
 
-                    data_df = df.iloc[header_row_idx+1:]
-                    
-                    # 한화건설 데이터
-                    hanwha_participated = "X"
-                    hanwha_base_ratio = ""
-                    hanwha_priority = ""
-                    
-                    # HDC 데이터
-                    hdc_base_ratio = ""
-                    hdc_priority = ""
-                    
-                    est_winning_ratio_val = ""
-                    
-                    # 1위 낙찰율 (N열(13)이 1인 E열(4))
-                    for _, row in data_df.iterrows():
-                        try:
-                            if len(row) > 13:
-                                n_val = str(row[13]).strip()
-                                if n_val == '1' and len(row) > 4:
-                                    e_val = row[4]
-                                    if not pd.isna(e_val):
-                                        est_winning_ratio_val = e_val
-                                        break
-                        except Exception:
-                            pass
-                            
-                    # 회사 데이터 추출 루프
-                    for _, row in data_df.iterrows():
-                        company = str(row[idx_company]).strip()
-                        
-                        # 한화건설 확인
-                        if "한화" in company:
-                            hanwha_participated = "O"
-                            br = row[idx_base_ratio] if idx_base_ratio != -1 and not pd.isna(row[idx_base_ratio]) else ""
-                            if br != "": hanwha_base_ratio = br
-                            pr = row[idx_priority] if idx_priority != -1 and not pd.isna(row[idx_priority]) else ""
-                            if pr != "": hanwha_priority = pr
-                            
-                        # 에이치디씨현대산업개발 확인
-                        # 현대산업개발, HDC현대산업개발 등 다양하게 표기될 수 있음
-                        if "현대산업개발" in company or "에이치디씨" in company.upper() or "HDC" in company.upper():
-                            br = row[idx_base_ratio] if idx_base_ratio != -1 and not pd.isna(row[idx_base_ratio]) else ""
-                            if br != "": hdc_base_ratio = br
-                            pr = row[idx_priority] if idx_priority != -1 and not pd.isna(row[idx_priority]) else ""
-                            if pr != "": hdc_priority = pr
-                            
-                    result.append([
-                        file, 
-                        hanwha_participated, 
-                        hanwha_base_ratio, 
-                        est_winning_ratio_val, 
-                        hanwha_priority,
-                        hdc_base_ratio,
-                        hdc_priority
-                    ])
-                    
-                except Exception as e:
-                    print(f"  -> 파일 처리 중 에러: {e}")
-                    
-    return result
+def update_incremental(jobs=1):
+    """--incremental: 추가/수정된 파일의 행만 시트에 고치거나 끼워 넣고, 지워진 파일의 행은 삭제"""
+    paths = list_workbooks(BASE_DIR, ('.xlsb',))
+    targets, manifest, changes = select_targets('upload_hanwha_bids_v5', paths, True, BASE_DIR)
+    extracted_data, found = extract_all_bids_data(BASE_DIR, jobs, {os.path.abspath(p) for p in targets})
+    # 시트 A열은 파일명이므로 수정/삭제된 파일의 예전 행도 파일명으로 찾음
+    stale = {os.path.basename(p) for p in changes['modified'] + changes['removed']}
+    
+    print("\n구글 시트 연동 중...")
+    try:
+        worksheet = get_google_sheet_client().open_by_key(SHEET_ID).get_worksheet_by_id(WORKSHEET_ID)
+        touched = upsert_rows(worksheet, extracted_data, lambda row: row[0], stale, lambda row: extract_date(row[0]))
+    except Exception as e:
+        print(f"시트 반영 에러: {e}")
+        return
+    
+    if touched:
+        try:
+            format_cell_ranges(worksheet, row_formats(extracted_data, [touched[row[0]] for row in extracted_data]))
+        except Exception as e:
+            print(f"서식 적용 에러: {e}")
+    
+    # DB 에 없는 파일 (헤더를 못 읽은 파일 등) 은 실패로 기록
+    save_manifest('upload_hanwha_bids_v5', update_manifest(
+        manifest, [(p, found.get(os.path.abspath(p))) for p in targets], changes))
+    print("\n증분 반영이 완료되었습니다!")
 
-def main():
-    print("로컬 엑셀 파일 스캔 시작...")
-    extracted_data = extract_all_bids_data(BASE_DIR)
+def main(jobs=1, incremental=False):
+    if incremental:
+        update_incremental(jobs)
+        return
+    print("입찰결과 DB 조회 시작...")
+    extracted_data, _ = extract_all_bids_data(BASE_DIR, jobs)
     
     print("입찰날짜 기준으로 오름차순 정렬 중...")
     extracted_data.sort(key=lambda x: extract_date(x[0]))
@@ -174,30 +209,8 @@ def main():
     
     print("서식 적용 시작...")
     try:
-        batch = []
-        
-        # 1. 퍼센트 포맷 (C, D 열 그리고 새롭게 추가된 F열)
-        fmt_percent = CellFormat(numberFormat=NumberFormat(type='PERCENT', pattern='0.000%'))
-        batch.append(('C2:D1000', fmt_percent))
-        batch.append(('F2:F1000', fmt_percent))
-        
-        # 2. 한화 낙찰우선순위(E열)가 10 미만인 행 배경색 적용
-        light_green = Color(0.85, 0.95, 0.85)
-        # 이전 단계 파생: 폰트는 볼드 해제
-        fmt_highlight = CellFormat(backgroundColor=light_green, textFormat=TextFormat(bold=False))
-        
-        for data_idx, row_data in enumerate(extracted_data):
-            row_num = data_idx + 2
-            hanwha_priority_val = row_data[4] # E열 (한화 낙찰우선순위)
-            
-            if hanwha_priority_val != "":
-                try:
-                    priority_int = int(float(hanwha_priority_val))
-                    if priority_int < 10:
-                        cell_range = f'A{row_num}:G{row_num}'
-                        batch.append((cell_range, fmt_highlight))
-                except ValueError:
-                    pass
+        # 퍼센트 포맷 (C, D, F열) + 한화 낙찰우선순위(E열)가 10 미만인 행 배경색
+        batch = row_formats(extracted_data, range(2, len(extracted_data) + 2))
         
         print(f"{len(batch)}건의 포맷 변경을 적용합니다...")
         format_cell_ranges(worksheet, batch)
@@ -209,4 +222,6 @@ def main():
     print("\n모든 작업이 완료되었습니다!")
 
 if __name__ == "__main__":
-    main()
+    jobs, rest = parse_jobs()
+    incremental, _ = parse_incremental(rest)
+    main(jobs, incremental)